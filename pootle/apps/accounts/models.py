@@ -17,7 +17,9 @@ from django.core.exceptions import ValidationError
 from django.core.mail import send_mail
 from django.core.validators import RegexValidator
 from django.db import models
-from django.db.models import Case, ProtectedError, Q, Sum, When
+from django.db.models import ProtectedError, Q, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.forms.models import model_to_dict
 from django.urls import reverse
 from django.utils import timezone
@@ -28,10 +30,12 @@ from django.utils.translation import ugettext_lazy as _
 from allauth.account.models import EmailAddress
 from allauth.account.utils import sync_user_email_addresses
 
-from pootle.core.cache import make_method_key
+from pootle.core.cache import invalidate_collection_counts, make_method_key
 from pootle_language.models import Language
-from pootle_statistics.models import (ScoreLog, Submission,
-                                      TranslationActionCodes)
+from pootle_project.models import Project
+from pootle_statistics.leaderboard import Leaderboard
+from pootle_statistics.models import (DailyContribution, Submission,
+                                      get_local_date)
 from pootle_store.models import Unit
 
 from .managers import UserManager
@@ -173,71 +177,44 @@ class User(AbstractBaseUser):
         if top_scorers is not None:
             return top_scorers
 
-        now = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        past = now + datetime.timedelta(-days)
+        today = get_local_date(timezone.now())
+        past = today + datetime.timedelta(-days)
 
         lookup_kwargs = {
-            'creation_time__range': [past, now],
+            'date__gte': past,
+            'date__lt': today,
         }
 
         if language is not None:
             lookup_kwargs.update({
-                'submission__translation_project__language__code':
-                    language,
+                'translation_project__language__code': language,
             })
 
         if project is not None:
             lookup_kwargs.update({
-                'submission__translation_project__project__code':
-                    project,
+                'translation_project__project__code': project,
             })
 
         meta_user_ids = cls.objects.meta_users().values_list('id', flat=True)
-        top_scores = ScoreLog.objects.values("user").filter(
-            **lookup_kwargs
-        ).exclude(
-            user__pk__in=meta_user_ids,
-        ).annotate(
-            total_score=Sum('score_delta'),
-            suggested=Sum(
-                Case(
-                    When(
-                        action_code=TranslationActionCodes.SUGG_ADDED,
-                        then='wordcount'
-                    ),
-                    default=0,
-                    output_field=models.IntegerField()
-                )
-            ),
-            translated=Sum(
-                Case(
-                    When(
-                        translated_wordcount__isnull=False,
-                        then='translated_wordcount'
-                    ),
-                    default=0,
-                    output_field=models.IntegerField()
-                )
-            ),
-            reviewed=Sum(
-                Case(
-                    When(
-                        action_code__in=[
-                            TranslationActionCodes.SUGG_REVIEWED_ACCEPTED,
-                            TranslationActionCodes.REVIEWED,
-                            TranslationActionCodes.EDITED,
-                        ],
-                        translated_wordcount__isnull=True,
-                        then='wordcount',
-                    ),
-                    default=0,
-                    output_field=models.IntegerField()
-                )
-            ),
-        ).order_by('-total_score')[offset:]
-
-        if isinstance(limit, (int, long)) and limit > 0:
-            top_scores = top_scores[:limit]
+        if days <= Leaderboard.RETENTION_DAYS and Leaderboard.is_ready():
+            top_scores = cls._get_leaderboard_scores(
+                past, today, language, project, limit, offset, meta_user_ids,
+                lookup_kwargs,
+            )
+        else:
+            top_scores = DailyContribution.objects.values("user").filter(
+                **lookup_kwargs
+            ).exclude(
+                user__pk__in=meta_user_ids,
+            ).annotate(
+                total_score=Sum('score_delta'),
+                suggested=Sum('suggested_wordcount'),
+                translated=Sum('translated_wordcount'),
+                reviewed=Sum('reviewed_wordcount'),
+            ).order_by('-total_score')[offset:]
+
+            if isinstance(limit, (int, long)) and limit > 0:
+                top_scores = top_scores[:limit]
 
         users = dict(
             (user.id, user)
@@ -250,11 +227,74 @@ class User(AbstractBaseUser):
         for item in top_scores:
             item['user'] = users[item['user']]
             item['public_total_score'] = _humanize_score(item['total_score'])
+            item['translated'] = int(round(item['translated']))
             top_scorers.append(item)
 
         cache.set(cache_key, top_scorers, 60)
         return top_scorers
 
+    @classmethod
+    def _get_leaderboard_scores(cls, start, end, language, project, limit,
+                                offset, exclude_ids, lookup_kwargs):
+        """Returns the top scores in the [`start`, `end`) date range as
+        ranked by the leaderboard, along with the users' wordcounts.
+        """
+        language_id = project_id = None
+        if language is not None:
+            language_id = Language.objects.filter(
+                code=language,
+            ).values_list('id', flat=True).first()
+            if language_id is None:
+                return []
+
+        if project is not None:
+            project_id = Project.objects.filter(
+                code=project,
+            ).values_list('id', flat=True).first()
+            if project_id is None:
+                return []
+
+        exclude_ids = set(exclude_ids)
+        has_limit = isinstance(limit, (int, long)) and limit > 0
+        count = offset + limit + len(exclude_ids) if has_limit else None
+        ranking = [
+            (user_id, score)
+            for user_id, score in Leaderboard.get_top(
+                start, end, language_id=language_id, project_id=project_id,
+                count=count,
+            )
+            if user_id not in exclude_ids
+        ][offset:]
+        if has_limit:
+            ranking = ranking[:limit]
+
+        wordcounts = dict(
+            (item['user'], item)
+            for item in DailyContribution.objects.filter(
+                user__in=[user_id for user_id, score in ranking],
+                **lookup_kwargs
+            ).values('user').annotate(
+                suggested=Sum('suggested_wordcount'),
+                translated=Sum('translated_wordcount'),
+                reviewed=Sum('reviewed_wordcount'),
+            ).order_by()
+        )
+
+        top_scores = []
+        for user_id, score in ranking:
+            item = wordcounts.get(user_id, {
+                'suggested': 0,
+                'translated': 0,
+                'reviewed': 0,
+            })
+            item.update({
+                'user': user_id,
+                'total_score': score,
+            })
+            top_scores.append(item)
+
+        return top_scores
+
     def __unicode__(self):
         return self.username
 
@@ -407,11 +447,11 @@ class User(AbstractBaseUser):
         now = timezone.now()
         past = now + datetime.timedelta(-days)
 
-        sum_field = 'translationproject__submission__scorelog__score_delta'
+        sum_field = 'translationproject__dailycontribution__score_delta'
         lookup_kwargs = {
-            'translationproject__submission__scorelog__user': self,
-            'translationproject__submission__scorelog__creation_time__range':
-                [past, now]
+            'translationproject__dailycontribution__user': self,
+            'translationproject__dailycontribution__date__range':
+                [get_local_date(past), get_local_date(now)],
         }
 
         try:
@@ -437,3 +477,8 @@ class User(AbstractBaseUser):
         no activity, `None` is returned instead.
         """
         return Submission.objects.filter(submitter=self).latest()
+
+
+@receiver([post_delete, post_save], sender=User)
+def invalidate_user_counts_cache(**kwargs):
+    invalidate_collection_counts(kwargs['instance'])
@@ -13,11 +13,21 @@ import sys
 
 from django.contrib.auth import get_user_model
 from django.core.validators import ValidationError
+from django.db.models import Max, Min, Q
 
 from allauth.account.models import EmailAddress
 from allauth.account.utils import sync_user_email_addresses
 
+from pootle.core.log import UNIT_DELETED, action_log_many
+from pootle.core.mixins import CachedMethods
+from pootle.core.mixins.treeitem import content_revisions_batch
+from pootle.core.models import Revision
+from pootle.core.utils.db import bulk_update
+from pootle_statistics.models import (DailyContribution, ScoreLog, Submission,
+                                      get_local_date)
 from pootle_store.constants import FUZZY, UNTRANSLATED
+from pootle_store.models import (QualityCheck, Store, StoreCheckCounts,
+                                 Suggestion, Unit, get_tm_broker)
 from pootle_store.util import SuggestionStates
 
 
@@ -62,6 +72,37 @@ def write_stdout(start_msg, end_msg="DONE\n", fail_msg="FAILED\n"):
     return class_wrapper
 
 
+CHUNK_SIZE = 500
+
+
+def iter_pk_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """Yields the primary keys of `queryset` in lists of `chunk_size`
+    items.
+
+    The primary keys are retrieved beforehand, so the rows can be changed
+    in a way that they no longer match the queryset while iterating.
+    """
+    pks = list(queryset.order_by('pk').values_list('pk', flat=True))
+    for i in xrange(0, len(pks), chunk_size):
+        yield pks[i:i + chunk_size]
+
+
+def update_in_chunks(queryset, chunk_size=CHUNK_SIZE, **values):
+    """Updates `queryset` rows with `values`, using one UPDATE statement per
+    `chunk_size` rows.
+    """
+    model = queryset.model
+    for pks in iter_pk_chunks(queryset, chunk_size):
+        model._base_manager.filter(pk__in=pks).update(**values)
+
+
+def delete_in_chunks(queryset, chunk_size=CHUNK_SIZE):
+    """Deletes `queryset` rows, `chunk_size` rows at a time."""
+    model = queryset.model
+    for pks in iter_pk_chunks(queryset, chunk_size):
+        model._base_manager.filter(pk__in=pks).delete()
+
+
 class UserMerger(object):
 
     def __init__(self, src_user, target_user):
@@ -96,21 +137,24 @@ class UserMerger(object):
     def merge_commented(self):
         """Merge commented_by attribute on units
         """
-        self.src_user.commented.update(commented_by=self.target_user)
+        update_in_chunks(self.src_user.commented.all(),
+                         commented_by=self.target_user)
 
     @write_stdout(" * Merging units reviewed: "
                   "%(src_user)s --> %(target_user)s... ")
     def merge_reviewed(self):
         """Merge reviewed_by attribute on units
         """
-        self.src_user.reviewed.update(reviewed_by=self.target_user)
+        update_in_chunks(self.src_user.reviewed.all(),
+                         reviewed_by=self.target_user)
 
     @write_stdout(" * Merging suggestion reviews: "
                   "%(src_user)s --> %(target_user)s... ")
     def merge_reviews(self):
         """Merge reviewer attribute on suggestions
         """
-        self.src_user.reviews.update(reviewer=self.target_user)
+        update_in_chunks(self.src_user.reviews.all(),
+                         reviewer=self.target_user)
 
     @write_stdout(" * Merging remaining submissions: "
                   "%(src_user)s --> %(target_user)s... ")
@@ -118,21 +162,27 @@ class UserMerger(object):
         """Merge submitter attribute on submissions
         """
         # Delete orphaned submissions.
-        self.src_user.submission_set.filter(unit__isnull=True).delete()
+        delete_in_chunks(
+            self.src_user.submission_set.filter(unit__isnull=True),
+        )
 
         # Before we can save we first have to remove existing score_logs for
         # src_user - they will be recreated on save for target_user
-        self.src_user.scorelog_set.all().delete()
+        delete_in_chunks(self.src_user.scorelog_set.all())
+        DailyContribution.objects.filter(user=self.src_user).delete()
+        DailyContribution.objects.refresh_leaderboard(users=[self.src_user.pk])
 
         # Update submitter on submissions
-        self.src_user.submission_set.update(submitter=self.target_user)
+        update_in_chunks(self.src_user.submission_set.all(),
+                         submitter=self.target_user)
 
     @write_stdout(" * Merging units submitted_by: "
                   "%(src_user)s --> %(target_user)s... ")
     def merge_submitted(self):
         """Merge submitted_by attribute on units
         """
-        self.src_user.submitted.update(submitted_by=self.target_user)
+        update_in_chunks(self.src_user.submitted.all(),
+                         submitted_by=self.target_user)
 
     @write_stdout(" * Merging suggestions: "
                   "%(src_user)s --> %(target_user)s... ")
@@ -140,17 +190,32 @@ class UserMerger(object):
         """Merge user attribute on suggestions
         """
         # Update user and reviewer on suggestions
-        self.src_user.suggestions.update(user=self.target_user)
+        update_in_chunks(self.src_user.suggestions.all(),
+                         user=self.target_user)
 
 
 class UserPurger(object):
 
+    #: Unit fields written back when reverting units
+    UNIT_FIELDS = [
+        'target_f', 'target_wordcount', 'target_length', 'state', 'revision',
+        'submitted_by', 'submitted_on', 'reviewed_by', 'reviewed_on',
+        'translator_comment', 'commented_by', 'commented_on', 'mtime',
+    ]
+
     def __init__(self, user):
         """Purges user from site reverting any changes that they have made.
 
         :param user: `User` to purge.
         """
         self.user = user
+        self.system_user = get_user_model().objects.get_system_user()
+
+        # Stores are shared by all the units they contain, so that their
+        # dirty stats are aggregated and refreshed once at the end
+        self.stores = {}
+        # Translated units to be reindexed in the TM, by ID
+        self.tm_units = {}
 
     @write_stdout("Purging user: %(user)s... \n", "User purged: %(user)s \n")
     def purge(self):
@@ -163,7 +228,24 @@ class UserPurger(object):
         - Revert unit comments by user.
         - Revert unit state changes by user.
         - Delete any remaining submissions and suggestions.
+        - Recalculate suggestion counts of units the user suggested to or
+          reviewed.
+        - Rebuild the contribution rollups affected by the removed score logs.
         """
+        suggested_units = sorted(set(
+            Suggestion.objects.filter(Q(user=self.user) |
+                                      Q(reviewer=self.user))
+                              .values_list('unit', flat=True)
+        ))
+        affected_scorelogs = ScoreLog.objects.filter(
+            Q(user=self.user) | Q(submission__submitter=self.user)
+        )
+        affected_users = set(
+            affected_scorelogs.values_list('user', flat=True).distinct()
+        )
+        affected_range = affected_scorelogs.aggregate(
+            start=Min('creation_time'), end=Max('creation_time'),
+        )
 
         self.remove_units_created()
         self.revert_units_edited()
@@ -173,26 +255,180 @@ class UserPurger(object):
 
         # Delete remaining submissions.
         logger.debug("Deleting remaining submissions for: %s", self.user)
-        self.user.submission_set.all().delete()
+        delete_in_chunks(self.user.submission_set.all())
 
         # Delete remaining suggestions.
         logger.debug("Deleting remaining suggestions for: %s", self.user)
-        self.user.suggestions.all().delete()
+        delete_in_chunks(self.user.suggestions.all())
+
+        for i in xrange(0, len(suggested_units), CHUNK_SIZE):
+            Unit.objects.refresh_suggestion_counts(
+                units=suggested_units[i:i + CHUNK_SIZE],
+            )
+
+        self.update_stores()
+
+        if affected_users:
+            DailyContribution.objects.rebuild(
+                users=affected_users,
+                start=get_local_date(affected_range['start']),
+                end=get_local_date(affected_range['end']),
+            )
+
+    def get_store(self, store_id):
+        if store_id not in self.stores:
+            self.stores[store_id] = (
+                Store.objects.select_related('translation_project__language')
+                             .get(pk=store_id)
+            )
+        return self.stores[store_id]
+
+    def iter_units(self, queryset):
+        """Yields the units of `queryset` in chunks, with their stores
+        shared among them.
+        """
+        for pks in iter_pk_chunks(queryset):
+            units = list(
+                Unit.objects.filter(pk__in=pks)
+                            .select_related('store__translation_project'
+                                            '__language')
+                            .order_by('pk')
+            )
+            for unit in units:
+                unit.store = self.stores.setdefault(unit.store_id, unit.store)
+            yield units
+
+    def get_latest_submissions(self, submissions, units):
+        """Returns the latest of `submissions` made by other users on each
+        of `units`.
+
+        :return: dictionary mapping unit IDs to their latest submission.
+        """
+        latest_pks = (
+            submissions.filter(unit__in=[unit.id for unit in units])
+                       .exclude(submitter=self.user)
+                       .order_by()
+                       .values('unit')
+                       .annotate(latest=Max('pk'))
+                       .values_list('latest', flat=True)
+        )
+        submissions = Submission.objects.filter(pk__in=list(latest_pks))
+        return {submission.unit_id: submission for submission in submissions}
+
+    def save_units(self, units):
+        """Saves the changes made to `units` using bulk updates.
+
+        This has the same effects as calling `Unit.save()` on every unit,
+        except for the stats of their stores and the TM, which are updated
+        once all units are processed.
+        """
+        if not units:
+            return
+
+        actions = {}
+        # Every unit in the chunk takes at most one new revision number:
+        # reserve them right before they are saved
+        with Revision.block(len(units)):
+            for unit in units:
+                unit._log_user = self.system_user
+                unit.prepare_save()
+                if hasattr(unit, '_save_action'):
+                    actions.setdefault(unit.store, []).append({
+                        'action': unit._save_action,
+                        'unit': unit.id,
+                        'translation': unit.target_f,
+                    })
+
+        bulk_update(units, self.UNIT_FIELDS)
+
+        for store, store_actions in actions.iteritems():
+            action_log_many(store_actions, user=self.system_user,
+                            lang=store.translation_project.language.code,
+                            path=store.pootle_path)
+
+        for unit in units:
+            if unit._source_updated or unit._target_updated:
+                unit.update_qualitychecks()
+                if unit.istranslated():
+                    self.tm_units[unit.id] = unit
+
+            unit._source_updated = False
+            unit._target_updated = False
+            unit._state_updated = False
+            unit._comment_updated = False
+            unit.store.mark_dirty(CachedMethods.MTIME)
+
+    def update_stores(self):
+        """Rebuilds the check counts and refreshes the dirty stats of all
+        affected stores, and reindexes reverted translations in the TM.
+        """
+        # Units are deleted and reverted in bulk, bypassing the check count
+        # updates of `Unit.save()`
+        if self.stores:
+            StoreCheckCounts.objects.rebuild(stores=self.stores.keys())
+        with content_revisions_batch():
+            for store in self.stores.itervalues():
+                store.update_dirty_cache()
+
+        get_tm_broker().update_many([
+            (unit.store.translation_project.language.code,
+             unit.get_tmserver_data())
+            for unit in self.tm_units.itervalues()
+        ])
 
     @write_stdout(" * Removing units created by: %(user)s... ")
     def remove_units_created(self):
         """Remove units created by user that have not had further
         activity.
         """
-
-        # Delete units created by user without submissions by others.
-        for unit in self.user.get_units_created().iterator():
-
-            # Find submissions by other users on this unit.
-            other_subs = unit.submission_set.exclude(submitter=self.user)
-
-            if not other_subs.exists():
-                unit.delete()
+        created = self.user.submission_set.get_unit_creates().values('unit')
+        other_subs = (
+            Submission.objects.filter(unit__in=created)
+                              .exclude(submitter=self.user)
+                              .values('unit')
+        )
+        units = Unit.objects.filter(pk__in=created).exclude(pk__in=other_subs)
+
+        for chunk in self.iter_units(units):
+            unit_ids = [unit.id for unit in chunk]
+            with_checks = set(
+                QualityCheck.objects.filter(unit__in=unit_ids,
+                                            false_positive=False)
+                                    .values_list('unit', flat=True)
+            )
+
+            actions = {}
+            for unit in chunk:
+                store = unit.store
+                if store not in actions:
+                    actions[store] = []
+                    # Check if units being deleted are the ones referenced
+                    # in the cached last_action and last_updated
+                    store._last_action = store.get_cached_value(
+                        CachedMethods.LAST_ACTION
+                    )
+                    if not store.get_cached_value(CachedMethods.LAST_UPDATED):
+                        store.mark_dirty(CachedMethods.LAST_UPDATED)
+
+                store.mark_dirty(CachedMethods.WORDCOUNT_STATS)
+                if unit.suggestion_count > 0:
+                    store.mark_dirty(CachedMethods.SUGGESTIONS)
+                if unit.id in with_checks:
+                    store.mark_dirty(CachedMethods.CHECKS)
+                la = store._last_action
+                if not la or 'id' not in la or la['id'] == unit.id:
+                    store.mark_dirty(CachedMethods.LAST_ACTION)
+
+                actions[store].append({'unit': unit.id})
+
+            for store, store_actions in actions.iteritems():
+                action_log_many(store_actions, user='system',
+                                action=UNIT_DELETED, translation='',
+                                lang=store.translation_project.language.code,
+                                path=store.pootle_path)
+
+            Unit.objects.filter(pk__in=unit_ids).delete()
+            for unit in chunk:
                 logger.debug("Unit deleted: %s", repr(unit))
 
     @write_stdout(" * Reverting unit comments by: %(user)s... ")
@@ -202,100 +438,112 @@ class UserPurger(object):
         """
 
         # Revert unit comments where self.user is latest commenter.
-        for unit in self.user.commented.iterator():
-
-            # Find comments by other self.users
-            comments = unit.get_comments().exclude(submitter=self.user)
-
-            if comments.exists():
-                # If there are previous comments by others update the
-                # translator_comment, commented_by, and commented_on
-                last_comment = comments.latest('pk')
-                unit.translator_comment = last_comment.new_value
-                unit.commented_by_id = last_comment.submitter_id
-                unit.commented_on = last_comment.creation_time
-                logger.debug("Unit comment reverted: %s", repr(unit))
-            else:
-                unit.translator_comment = ""
-                unit.commented_by = None
-                unit.commented_on = None
-                logger.debug("Unit comment removed: %s", repr(unit))
-
-            # Increment revision
-            unit._comment_updated = True
-            unit.save()
+        for units in self.iter_units(self.user.commented.all()):
+            # Find comments by other users
+            comments = self.get_latest_submissions(
+                Submission.objects.get_unit_comments(), units,
+            )
+
+            for unit in units:
+                if unit.id in comments:
+                    # If there are previous comments by others update the
+                    # translator_comment, commented_by, and commented_on
+                    last_comment = comments[unit.id]
+                    unit.translator_comment = last_comment.new_value
+                    unit.commented_by_id = last_comment.submitter_id
+                    unit.commented_on = last_comment.creation_time
+                    logger.debug("Unit comment reverted: %s", repr(unit))
+                else:
+                    unit.translator_comment = ""
+                    unit.commented_by = None
+                    unit.commented_on = None
+                    logger.debug("Unit comment removed: %s", repr(unit))
+
+                # Increment revision
+                unit._comment_updated = True
+
+            self.save_units(units)
 
     @write_stdout(" * Reverting units edited by: %(user)s... ")
     def revert_units_edited(self):
         """Revert unit edits made by a user to previous edit.
         """
         # Revert unit target where user is the last submitter.
-        for unit in self.user.submitted.iterator():
-
+        for units in self.iter_units(self.user.submitted.all()):
             # Find the last submission by different user that updated the
             # unit.target.
-            edits = unit.get_edits().exclude(submitter=self.user)
-
-            if edits.exists():
-                last_edit = edits.latest("pk")
-                unit.target_f = last_edit.new_value
-                unit.submitted_by_id = last_edit.submitter_id
-                unit.submitted_on = last_edit.creation_time
-                logger.debug("Unit edit reverted: %s", repr(unit))
-            else:
-                # if there is no previous submissions set the target to "" and
-                # set the unit.submitted_by to None
-                unit.target_f = ""
-                unit.submitted_by = None
-                unit.submitted_on = unit.creation_time
-                logger.debug("Unit edit removed: %s", repr(unit))
-
-            # Increment revision
-            unit._target_updated = True
-            unit.save()
+            edits = self.get_latest_submissions(
+                Submission.objects.get_unit_edits(), units,
+            )
+
+            for unit in units:
+                if unit.id in edits:
+                    last_edit = edits[unit.id]
+                    unit.target_f = last_edit.new_value
+                    unit.submitted_by_id = last_edit.submitter_id
+                    unit.submitted_on = last_edit.creation_time
+                    logger.debug("Unit edit reverted: %s", repr(unit))
+                else:
+                    # if there is no previous submissions set the target to
+                    # "" and set the unit.submitted_by to None
+                    unit.target_f = ""
+                    unit.submitted_by = None
+                    unit.submitted_on = unit.creation_time
+                    logger.debug("Unit edit removed: %s", repr(unit))
+
+                # Increment revision
+                unit._target_updated = True
+
+            self.save_units(units)
 
     @write_stdout(" * Reverting units reviewed by: %(user)s... ")
     def revert_units_reviewed(self):
         """Revert reviews made by user on suggestions to previous state.
         """
-
-        # Revert reviews by this user.
-        for review in self.user.get_suggestion_reviews().iterator():
-            suggestion = review.suggestion
-            if suggestion.user_id == self.user.id:
-                # If the suggestion was also created by this user then remove
-                # both review and suggestion.
-                suggestion.delete()
-                logger.debug("Suggestion removed: %s", (suggestion))
-            elif suggestion.reviewer_id == self.user.id:
-                # If the suggestion is showing as reviewed by the user, then
-                # set the suggestion back to pending and update
-                # reviewer/review_time.
-                suggestion.state = SuggestionStates.PENDING
-                suggestion.reviewer = None
-                suggestion.review_time = None
-                suggestion.save()
-                logger.debug("Suggestion reverted: %s", (suggestion))
-
-            # Remove the review.
-            review.delete()
-
-        for unit in self.user.reviewed.iterator():
-            reviews = unit.get_suggestion_reviews().exclude(
-                submitter=self.user)
-            if reviews.exists():
-                previous_review = reviews.latest('pk')
-                unit.reviewed_by_id = previous_review.submitter_id
-                unit.reviewed_on = previous_review.creation_time
-                logger.debug("Unit reviewed_by reverted: %s", repr(unit))
-            else:
-                unit.reviewed_by = None
-                unit.reviewed_on = None
-
-                # Increment revision
-                unit._target_updated = True
-                logger.debug("Unit reviewed_by removed: %s", repr(unit))
-            unit.save()
+        reviews = self.user.get_suggestion_reviews()
+        suggestions = Suggestion.objects.filter(
+            pk__in=reviews.values('suggestion'),
+        )
+        for store_id in set(suggestions.values_list('unit__store',
+                                                    flat=True)):
+            self.get_store(store_id).mark_dirty(CachedMethods.SUGGESTIONS)
+
+        # If the suggestion was also created by this user then remove both
+        # review and suggestion.
+        delete_in_chunks(suggestions.filter(user=self.user))
+        logger.debug("Suggestions removed for: %s", self.user)
+
+        # If the suggestion is showing as reviewed by the user, then set the
+        # suggestion back to pending and update reviewer/review_time.
+        update_in_chunks(
+            suggestions.filter(reviewer=self.user).exclude(user=self.user),
+            state=SuggestionStates.PENDING, reviewer=None, review_time=None,
+        )
+        logger.debug("Suggestions reverted for: %s", self.user)
+
+        # Remove the reviews.
+        delete_in_chunks(reviews)
+
+        for units in self.iter_units(self.user.reviewed.all()):
+            reviews = self.get_latest_submissions(
+                Submission.objects.get_unit_suggestion_reviews(), units,
+            )
+
+            for unit in units:
+                if unit.id in reviews:
+                    previous_review = reviews[unit.id]
+                    unit.reviewed_by_id = previous_review.submitter_id
+                    unit.reviewed_on = previous_review.creation_time
+                    logger.debug("Unit reviewed_by reverted: %s", repr(unit))
+                else:
+                    unit.reviewed_by = None
+                    unit.reviewed_on = None
+
+                    # Increment revision
+                    unit._target_updated = True
+                    logger.debug("Unit reviewed_by removed: %s", repr(unit))
+
+            self.save_units(units)
 
     @write_stdout(" * Reverting unit state changes by: %(user)s... ")
     def revert_units_state_changed(self):
@@ -303,36 +551,58 @@ class UserPurger(object):
         """
 
         # Delete orphaned submissions.
-        self.user.submission_set.filter(unit__isnull=True).delete()
-
-        for submission in self.user.get_unit_states_changed().iterator():
-            unit = submission.unit
-
-            # We have to get latest by pk as on mysql precision is not to
-            # microseconds - so creation_time can be ambiguous
-            if submission != unit.get_state_changes().latest('pk'):
-                # If the unit has been changed more recently we don't need to
-                # revert the unit state.
-                submission.delete()
-                return
-            submission.delete()
-            other_submissions = (unit.get_state_changes()
-                                     .exclude(submitter=self.user))
-            if other_submissions.exists():
-                new_state = other_submissions.latest('pk').new_value
-            else:
-                new_state = UNTRANSLATED
-            if new_state != unit.state:
-                if unit.state == FUZZY:
-                    unit.markfuzzy(False)
-                elif new_state == FUZZY:
-                    unit.markfuzzy(True)
-                unit.state = new_state
-
-                # Increment revision
-                unit._state_updated = True
-                unit.save()
-                logger.debug("Unit state reverted: %s", repr(unit))
+        delete_in_chunks(self.user.submission_set.filter(unit__isnull=True))
+
+        state_changes = self.user.get_unit_states_changed()
+
+        # Only units where the user made the latest state change need to be
+        # reverted. We have to get latest by pk as on mysql precision is not
+        # to microseconds - so creation_time can be ambiguous
+        reverted_unit_ids = []
+        user_changes = list(
+            state_changes.order_by('pk').values_list('pk', 'unit')
+        )
+        for i in xrange(0, len(user_changes), CHUNK_SIZE):
+            chunk = user_changes[i:i + CHUNK_SIZE]
+            latest_pks = set(
+                Submission.objects.get_unit_state_changes()
+                                  .filter(unit__in=set(unit_id for pk, unit_id
+                                                       in chunk))
+                                  .order_by()
+                                  .values('unit')
+                                  .annotate(latest=Max('pk'))
+                                  .values_list('latest', flat=True)
+            )
+            reverted_unit_ids.extend(
+                unit_id for pk, unit_id in chunk if pk in latest_pks
+            )
+        delete_in_chunks(state_changes)
+
+        reverted_units = Unit.objects.filter(pk__in=reverted_unit_ids)
+        for units in self.iter_units(reverted_units):
+            other_submissions = self.get_latest_submissions(
+                Submission.objects.get_unit_state_changes(), units,
+            )
+
+            changed = []
+            for unit in units:
+                if unit.id in other_submissions:
+                    new_state = int(other_submissions[unit.id].new_value)
+                else:
+                    new_state = UNTRANSLATED
+                if new_state != unit.state:
+                    if unit.state == FUZZY:
+                        unit.markfuzzy(False)
+                    elif new_state == FUZZY:
+                        unit.markfuzzy(True)
+                    unit.state = new_state
+
+                    # Increment revision
+                    unit._state_updated = True
+                    changed.append(unit)
+                    logger.debug("Unit state reverted: %s", repr(unit))
+
+            self.save_units(changed)
 
 
 def verify_user(user):
@@ -10,13 +10,27 @@
 import datetime
 import logging
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
+from pootle.core.utils.timezone import make_aware
 from pootle.runner import set_sync_mode
 from pootle_project.models import Project
 from pootle_translationproject.models import TranslationProject
 
 
+def parse_date(value, option_name):
+    """Parses a `YYYY-MM-DD` command line option value into an aware
+    `datetime`.
+    """
+    try:
+        return make_aware(datetime.datetime.strptime(value, '%Y-%m-%d'))
+    except ValueError:
+        raise CommandError(
+            '%s parameter has an invalid format: "%s", while it should be '
+            'in "YYYY-MM-DD" format' % (option_name, value)
+        )
+
+
 class SkipChecksMixin(object):
     def check(self, app_configs=None, tags=None, display_num_errors=False,
               include_deployment_checks=False):
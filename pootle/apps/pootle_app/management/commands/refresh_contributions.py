@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import datetime
+import os
+os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from pootle_statistics.models import DailyContribution
+
+from . import parse_date
+
+
+class Command(BaseCommand):
+    help = "Backfill or rebuild the daily contributions rollup."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='users',
+            help='User to rebuild contributions for',
+        )
+        parser.add_argument(
+            '--date-from',
+            dest='date_from',
+            default=None,
+            help='First day to rebuild (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--date-to',
+            dest='date_to',
+            default=None,
+            help='Last day to rebuild (YYYY-MM-DD)',
+        )
+
+    def handle(self, **options):
+        users = None
+        if options['users']:
+            User = get_user_model()
+            users = User.objects.filter(username__in=options['users'])
+
+        date_from = date_to = None
+        if options['date_from'] is not None:
+            date_from = parse_date(options['date_from'], '--date-from').date()
+        if options['date_to'] is not None:
+            date_to = parse_date(options['date_to'], '--date-to').date()
+
+        start = datetime.datetime.now()
+        total = 0
+        for date, rows in DailyContribution.objects.rebuild_by_day(
+            users=users, start=date_from, end=date_to,
+        ):
+            total += rows
+            self.stdout.write('%s: %d rows' % (date.isoformat(), rows))
+
+        end = datetime.datetime.now()
+        self.stdout.write('%d rows written in %s.' % (total, end - start))
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import datetime
+import os
+os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
+
+from django.core.management.base import BaseCommand
+
+from pootle_statistics.leaderboard import Leaderboard
+from pootle_statistics.models import DailyContribution
+
+
+class Command(BaseCommand):
+    help = "Seed the top scorers leaderboard from the contributions rollup."
+
+    def handle(self, **options):
+        start = datetime.datetime.now()
+
+        Leaderboard.clear()
+        DailyContribution.objects.refresh_leaderboard()
+        Leaderboard.set_ready()
+
+        end = datetime.datetime.now()
+        self.stdout.write('Leaderboard refreshed in %s.' % (end - start))
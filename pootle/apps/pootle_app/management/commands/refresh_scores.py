@@ -12,9 +12,30 @@ import os
 os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
 
 from django.contrib.auth import get_user_model
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Case, FloatField, Sum, Value, When
 
-from pootle_statistics.models import ScoreLog
+from pootle_statistics.models import DailyContribution, ScoreLog
+
+from . import parse_date
+
+
+def bulk_update_by_pk(model, field_name, values, batch_size=250):
+    """Sets `field_name` for several `model` objects using one UPDATE
+    statement per `batch_size` objects.
+
+    :param values: dictionary mapping primary keys to their new values.
+    """
+    pks = sorted(values.keys())
+    for i in xrange(0, len(pks), batch_size):
+        batch = pks[i:i + batch_size]
+        model.objects.filter(pk__in=batch).update(**{
+            field_name: Case(
+                *[When(pk=pk, then=Value(values[pk])) for pk in batch],
+                output_field=FloatField()
+            ),
+        })
 
 
 class Command(BaseCommand):
@@ -34,6 +55,41 @@ class Command(BaseCommand):
             dest='users',
             help='User to refresh',
         )
+        parser.add_argument(
+            '--date-from',
+            dest='date_from',
+            default=None,
+            help=(
+                'Only recalculate score logs created on or after this date '
+                '(YYYY-MM-DD)'
+            ),
+        )
+        parser.add_argument(
+            '--date-to',
+            dest='date_to',
+            default=None,
+            help=(
+                'Only recalculate score logs created on or before this date '
+                '(YYYY-MM-DD)'
+            ),
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            dest='chunk_size',
+            default=1000,
+            help='Number of rows processed per transaction',
+        )
+        parser.add_argument(
+            '--resume-from',
+            type=int,
+            dest='resume_from',
+            default=0,
+            help=(
+                'Skip score logs with an ID lower or equal to the given one. '
+                'Use the last ID reported by an interrupted run to resume it.'
+            ),
+        )
 
     def handle(self, **options):
         self.stdout.write('Start running of refresh_scores command...')
@@ -50,6 +106,10 @@ class Command(BaseCommand):
                 scorelogs = scorelogs.filter(user__in=users)
 
             scorelogs.delete()
+            contributions = DailyContribution.objects.all()
+            if options['users']:
+                contributions = contributions.filter(user__in=users)
+            contributions.delete()
 
             if options['users']:
                 self.stdout.write('Scores for specified users were reset to 0.')
@@ -57,25 +117,104 @@ class Command(BaseCommand):
                 self.stdout.write('Scores for all users were reset to 0.')
             return
 
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+
+        scorelogs = ScoreLog.objects.all()
+        date_from = date_to = None
+        if options['users']:
+            scorelogs = scorelogs.filter(user__in=users)
+        if options['date_from'] is not None:
+            date_from = parse_date(options['date_from'], '--date-from')
+            scorelogs = scorelogs.filter(creation_time__gte=date_from)
+        if options['date_to'] is not None:
+            date_to = parse_date(options['date_to'], '--date-to')
+            scorelogs = scorelogs.filter(
+                creation_time__lt=date_to + datetime.timedelta(days=1),
+            )
+
         start = datetime.datetime.now()
-        for user_pk, username in users.values_list("pk", "username"):
-            self.stdout.write("Processing user %s..." % username)
-            scorelog_qs = ScoreLog.objects.filter(user=user_pk) \
-                .select_related(
-                    'submission',
+        self.refresh_scorelogs(scorelogs, options['chunk_size'],
+                               options['resume_from'])
+        self.refresh_user_scores(users, options['chunk_size'])
+
+        days = list(DailyContribution.objects.rebuild_by_day(
+            users=users if options['users'] else None,
+            start=date_from and date_from.date(),
+            end=date_to and date_to.date(),
+        ))
+        self.stdout.write('Rebuilt daily contributions for %d days.' %
+                          len(days))
+        end = datetime.datetime.now()
+        self.stdout.write('All done in %s.' % (end - start))
+
+    def refresh_scorelogs(self, scorelogs, chunk_size, resume_from):
+        """Recalculates score deltas and translated wordcounts for
+        `scorelogs`, writing back only the changed rows.
+
+        Every chunk is committed on its own transaction, so an interrupted
+        run can be resumed by means of the reported last processed ID.
+        """
+        scorelogs = scorelogs.filter(id__gt=resume_from).order_by('id')
+        total = scorelogs.count()
+        processed = changed = 0
+        last_id = resume_from
+
+        self.stdout.write('Recalculating %d score logs...' % total)
+        while processed < total:
+            chunk = list(
+                scorelogs.filter(id__gt=last_id).select_related(
                     'submission__suggestion',
-                    'submission__unit')
-            user_score = 0
-            for scorelog in scorelog_qs.iterator():
+                    'submission__unit',
+                )[:chunk_size]
+            )
+            if not chunk:
+                break
+            ScoreLog.objects.prefetch_initial_similarities(chunk)
+
+            score_deltas = {}
+            translated_wordcounts = {}
+            for scorelog in chunk:
                 score_delta = scorelog.get_score_delta()
                 translated = scorelog.get_paid_wordcounts()[0]
-                user_score += score_delta
-                ScoreLog.objects.filter(id=scorelog.id).update(
-                    score_delta=score_delta,
-                    translated_wordcount=translated
-                )
-            self.stdout.write("Score for user %s set to %.3f" %
-                              (username, user_score))
-            User.objects.filter(id=user_pk).update(score=user_score)
-        end = datetime.datetime.now()
-        self.stdout.write('All done in %s.' % (end - start))
+                if score_delta != scorelog.score_delta:
+                    score_deltas[scorelog.id] = score_delta
+                if translated != scorelog.translated_wordcount:
+                    translated_wordcounts[scorelog.id] = translated
+
+            with transaction.atomic():
+                bulk_update_by_pk(ScoreLog, 'score_delta', score_deltas)
+                bulk_update_by_pk(ScoreLog, 'translated_wordcount',
+                                  translated_wordcounts)
+
+            last_id = chunk[-1].id
+            processed += len(chunk)
+            changed += len(set(score_deltas) | set(translated_wordcounts))
+            self.stdout.write(
+                'Processed %d/%d score logs, %d changed (last ID: %d)' %
+                (processed, total, changed, last_id)
+            )
+
+    def refresh_user_scores(self, users, chunk_size):
+        """Sets users' scores to the aggregated score deltas of their score
+        logs.
+        """
+        User = get_user_model()
+        user_list = list(users.order_by('pk').values_list('pk', 'username'))
+
+        for i in xrange(0, len(user_list), chunk_size):
+            chunk = dict(user_list[i:i + chunk_size])
+            scores = dict(
+                ScoreLog.objects.filter(user__in=chunk.keys())
+                                .values('user')
+                                .annotate(total=Sum('score_delta'))
+                                .values_list('user', 'total')
+            )
+            with transaction.atomic():
+                bulk_update_by_pk(User, 'score', {
+                    user_pk: scores.get(user_pk, 0) for user_pk in chunk
+                })
+
+            for user_pk, username in sorted(chunk.items()):
+                self.stdout.write("Score for user %s set to %.3f" %
+                                  (username, scores.get(user_pk, 0)))
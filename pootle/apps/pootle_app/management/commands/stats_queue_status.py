@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import json
+import os
+
+# This must be run before importing Django.
+os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pootle.core.utils.redis_rq import get_stats_queue_status
+
+from . import SkipChecksMixin
+
+
+class Command(SkipChecksMixin, BaseCommand):
+    help = "Report the status of RQ queues and of stats calculation."
+    skip_system_check_tags = ('data', )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--minutes',
+            type=int,
+            default=5,
+            help='Minutes to calculate the job processing rate over '
+                 '(default: 5).',
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=10,
+            help='Number of dirty tree items with the highest counts to list '
+                 '(default: 10).',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            default=False,
+            dest='json',
+            help='Output the status as JSON.',
+        )
+        parser.add_argument(
+            '--max-job-age',
+            type=int,
+            dest='max_job_age',
+            help='Exit with an error if the oldest queued job has been '
+                 'waiting for longer than this many seconds.',
+        )
+
+    def handle(self, **options):
+        if options['minutes'] < 1:
+            raise CommandError('--minutes must be a positive number.')
+
+        status = get_stats_queue_status(minutes=options['minutes'],
+                                        top=options['top'])
+        if options['json']:
+            self.stdout.write(json.dumps(status, indent=2, sort_keys=True))
+        else:
+            self.write_status(status)
+
+        max_job_age = options['max_job_age']
+        if max_job_age is not None:
+            ages = [queue['oldest_job_age'] for queue in status['queues']
+                    if queue['oldest_job_age'] is not None]
+            if ages and max(ages) > max_job_age:
+                raise CommandError(
+                    'The oldest queued job has been waiting for %ds.' %
+                    max(ages)
+                )
+
+    def write_status(self, status):
+        self.stdout.write('Queues:')
+        for queue in status['queues']:
+            age = queue['oldest_job_age']
+            self.stdout.write(
+                '  %s: %d jobs, oldest waiting for %s' %
+                (queue['name'], queue['count'],
+                 '-' if age is None else '%ds' % age)
+            )
+
+        failed = status['failed_jobs']
+        self.stdout.write('Failed jobs: %d' % failed['count'])
+        for func_name, count in sorted(failed['by_function'].items(),
+                                       key=lambda item: -item[1]):
+            self.stdout.write('  %s: %d' % (func_name, count))
+
+        dirty = status['dirty_treeitems']
+        self.stdout.write('Dirty tree items: %d' % dirty['count'])
+        for item in dirty['top']:
+            self.stdout.write('  %s: %d' % (item['pootle_path'],
+                                            item['count']))
+
+        last_jobs = status['last_jobs']
+        self.stdout.write(
+            'Last job keys: %d, %d with deferred dependents (%d jobs)' %
+            (last_jobs['count'], last_jobs['with_dependents'],
+             last_jobs['dependents'])
+        )
+
+        processed = status['processed_jobs']
+        self.stdout.write(
+            'Processed jobs over the last %d minutes: %d (%.2f/s)' %
+            (processed['minutes'], processed['count'],
+             processed['per_second'])
+        )
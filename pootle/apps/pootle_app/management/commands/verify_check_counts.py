@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import os
+os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pootle.core.mixins.treeitem import CachedMethods, content_revisions_batch
+from pootle_store.models import Store, StoreCheckCounts
+
+
+def format_counts(counts):
+    if counts is None:
+        return '-'
+    return '%(active)d active, %(false_positive)d muted' % counts
+
+
+class Command(BaseCommand):
+    help = ("Compare the per-store quality check counts with the quality "
+            "checks they are derived from.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            action='append',
+            dest='projects',
+            help='Project to verify',
+        )
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            help='Language to verify',
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            default=False,
+            help='Rebuild the counts of the stores that differ',
+        )
+
+    def handle(self, **options):
+        stores = None
+        if options['projects'] or options['languages']:
+            stores = Store.objects.all()
+            if options['projects']:
+                stores = stores.filter(
+                    translation_project__project__code__in=options['projects'],
+                )
+            if options['languages']:
+                stores = stores.filter(
+                    translation_project__language__code__in=(
+                        options['languages']),
+                )
+
+        drift = StoreCheckCounts.objects.get_drift(stores=stores)
+        drifted_stores = set(store_id for store_id, _, _, _ in drift)
+        paths = dict(
+            Store.objects.filter(pk__in=drifted_stores)
+                         .values_list('pk', 'pootle_path')
+        )
+        for store_id, name, expected, actual in drift:
+            self.stdout.write(
+                u'%s: %s: expected %s, found %s' % (
+                    paths.get(store_id, store_id), name,
+                    format_counts(expected), format_counts(actual),
+                )
+            )
+
+        if not drift:
+            self.stdout.write('Check counts are up to date.')
+            return
+
+        if not options['fix']:
+            raise CommandError('%d check counts differ.' % len(drift))
+
+        StoreCheckCounts.objects.rebuild(stores=drifted_stores)
+        with content_revisions_batch():
+            for store in Store.objects.filter(pk__in=drifted_stores):
+                store.mark_dirty(CachedMethods.CHECKS)
+                store.update_dirty_cache()
+        self.stdout.write(
+            'Rebuilt check counts of %d stores.' % len(drifted_stores))
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import os
+os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pootle.core.mixins.treeitem import CachedMethods, content_revisions_batch
+from pootle_store.models import Store, Unit
+
+
+class Command(BaseCommand):
+    help = ("Compare the pending suggestion counts stored in units with the "
+            "suggestions they are derived from.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            action='append',
+            dest='projects',
+            help='Project to verify',
+        )
+        parser.add_argument(
+            '--language',
+            action='append',
+            dest='languages',
+            help='Language to verify',
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            default=False,
+            help='Recalculate the counts of the units that differ',
+        )
+
+    def handle(self, **options):
+        units = None
+        if options['projects'] or options['languages']:
+            units = Unit.objects.all()
+            if options['projects']:
+                units = units.filter(
+                    store__translation_project__project__code__in=(
+                        options['projects']),
+                )
+            if options['languages']:
+                units = units.filter(
+                    store__translation_project__language__code__in=(
+                        options['languages']),
+                )
+            units = units.values('pk')
+
+        drift = Unit.objects.get_suggestion_count_drift(units=units)
+        unit_stores = dict(
+            Unit.objects.filter(pk__in=drift.keys())
+                        .values_list('pk', 'store__pootle_path')
+        )
+        for unit_id in sorted(drift):
+            stored, expected = drift[unit_id]
+            self.stdout.write(
+                u'%s: unit %d: expected %d, found %d' % (
+                    unit_stores.get(unit_id), unit_id, expected, stored,
+                )
+            )
+
+        if not drift:
+            self.stdout.write('Suggestion counts are up to date.')
+            return
+
+        if not options['fix']:
+            raise CommandError(
+                '%d suggestion counts differ.' % len(drift))
+
+        Unit.objects.refresh_suggestion_counts(units=drift.keys())
+        with content_revisions_batch():
+            for store in Store.objects.filter(
+                    pk__in=Unit.objects.filter(pk__in=drift.keys())
+                                       .values('store')):
+                store.mark_dirty(CachedMethods.SUGGESTIONS)
+                store.update_dirty_cache()
+        self.stdout.write(
+            'Recalculated suggestion counts of %d units.' % len(drift))
@@ -10,10 +10,13 @@
 from django.conf import settings
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
-from django.core.cache import cache
 from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
 from django.utils.encoding import iri_to_uri
 
+from django_redis import get_redis_connection
+
 from pootle.core.constants import CACHE_TIMEOUT
 
 
@@ -30,41 +33,135 @@ def get_pootle_permission(codename):
     return Permission.objects.get(content_type=content_type, codename=codename)
 
 
+#: Field marking a user's permissions index as built
+INDEX_BUILT_FIELD = '_built'
+
+#: Bit positions of the permissions in permission masks. Permissions not
+#: listed here are not taken into account
+PERMISSION_BITS = {
+    'view': 0,
+    'hide': 1,
+    'suggest': 2,
+    'translate': 3,
+    'review': 4,
+    'administrate': 5,
+}
+
+
+def get_permissions_index_key(username):
+    return iri_to_uri('pootle:permissions:%s' % username)
+
+
+def get_permissions_connection():
+    """Returns a connection to the Redis server backing the default cache,
+    or `None` if the default cache is not Redis-based.
+    """
+    if 'RedisCache' not in settings.CACHES['default']['BACKEND']:
+        return None
+
+    return get_redis_connection('default')
+
+
+def get_permission_bits(*codenames):
+    """Returns the permission mask for `codenames`."""
+    mask = 0
+    for codename in codenames:
+        if codename in PERMISSION_BITS:
+            mask |= 1 << PERMISSION_BITS[codename]
+    return mask
+
+
+def build_permissions_index(username):
+    """Returns a dictionary mapping the paths of the live directories
+    where `username` has permission sets to the mask of their positive
+    permissions.
+    """
+    index = {}
+    permission_sets = PermissionSet.objects.filter(
+        user__username=username,
+        directory__obsolete=False,
+    ).values_list('directory__pootle_path', 'positive_permissions__codename')
+    for pootle_path, codename in permission_sets:
+        index[pootle_path] = (index.get(pootle_path, 0) |
+                              get_permission_bits(codename))
+
+    return index
+
+
+def get_permission_masks(username, paths):
+    """Returns the masks of the permission sets `username` has on each of
+    `paths`, or `None` for paths with no permission sets.
+
+    Permission sets are looked up in a per-user Redis hash, which is
+    built from the DB on the first lookup after its invalidation.
+    """
+    conn = get_permissions_connection()
+    if conn is None:
+        index = build_permissions_index(username)
+        return [index.get(path) for path in paths]
+
+    key = get_permissions_index_key(username)
+    values = conn.hmget(key, [INDEX_BUILT_FIELD] + paths)
+    if values[0] is not None:
+        return [None if value is None else int(value)
+                for value in values[1:]]
+
+    index = build_permissions_index(username)
+    pipe = conn.pipeline()
+    pipe.delete(key)
+    pipe.hmset(key, dict(index, **{INDEX_BUILT_FIELD: 1}))
+    pipe.expire(key, CACHE_TIMEOUT)
+    pipe.execute()
+
+    return [index.get(path) for path in paths]
+
+
+def get_permission_mask(username, directory):
+    """Returns the mask of effective permissions `username` has on
+    `directory`, or `None` if no permission set applies.
+
+    The permission set on the closest ancestor (including `directory`
+    itself) applies. For paths within a language, permission sets set at
+    the language level or above are overridden by any permission set on
+    the project.
+    """
+    path_parts = filter(None, directory.pootle_path.split('/'))
+    trail = ['/'] + [
+        '/%s/' % '/'.join(path_parts[:i])
+        for i in xrange(1, len(path_parts) + 1)
+    ]
+    paths = list(trail)
+    if len(path_parts) > 1 and path_parts[0] != 'projects':
+        paths.append('/projects/%s/' % path_parts[1])
+
+    masks = get_permission_masks(username, paths)
+
+    mask = None
+    depth = 0
+    for depth in xrange(len(trail) - 1, -1, -1):
+        if masks[depth] is not None:
+            mask = masks[depth]
+            break
+
+    if len(paths) > len(trail) and (mask is None or depth < 2):
+        # Active permission at language level or higher, check project
+        # level permission
+        if masks[-1] is not None:
+            mask = masks[-1]
+
+    return mask
+
+
 def get_permissions_by_username(username, directory):
-    pootle_path = directory.pootle_path
-    path_parts = filter(None, pootle_path.split('/'))
-    key = iri_to_uri('Permissions:%s' % username)
-    permissions_cache = cache.get(key, {})
-
-    if pootle_path not in permissions_cache:
-        try:
-            permissionset = PermissionSet.objects.filter(
-                directory__in=directory.trail(),
-                user__username=username).order_by('-directory__pootle_path')[0]
-        except IndexError:
-            permissionset = None
-
-        if (len(path_parts) > 1 and path_parts[0] != 'projects' and
-            (permissionset is None or
-            len(filter(None, permissionset.directory.pootle_path.split('/'))) < 2)):
-            # Active permission at language level or higher, check project
-            # level permission
-            try:
-                project_path = '/projects/%s/' % path_parts[1]
-                permissionset = PermissionSet.objects.get(
-                    directory__pootle_path=project_path,
-                    user__username=username)
-            except PermissionSet.DoesNotExist:
-                pass
-
-        if permissionset:
-            permissions_cache[pootle_path] = permissionset.to_dict()
-        else:
-            permissions_cache[pootle_path] = None
-
-        cache.set(key, permissions_cache, CACHE_TIMEOUT)
-
-    return permissions_cache[pootle_path]
+    mask = get_permission_mask(username, directory)
+    if mask is None:
+        return None
+
+    return dict(
+        (codename, True)
+        for codename, bit in PERMISSION_BITS.iteritems()
+        if mask & 1 << bit
+    )
 
 
 def get_matching_permissions(user, directory):
@@ -83,6 +180,19 @@ def get_matching_permissions(user, directory):
     return permissions
 
 
+def get_matching_permission_mask(user, directory):
+    if user.is_authenticated:
+        mask = get_permission_mask(user.username, directory)
+        if mask is not None:
+            return mask
+
+        mask = get_permission_mask('default', directory)
+        if mask is not None:
+            return mask
+
+    return get_permission_mask('nobody', directory)
+
+
 def check_user_permission(user, permission_codename, directory):
     """Checks if the current user has the permission to perform
     ``permission_codename``.
@@ -90,10 +200,10 @@ def check_user_permission(user, permission_codename, directory):
     if user.is_superuser:
         return True
 
-    permissions = get_matching_permissions(user, directory)
+    mask = get_matching_permission_mask(user, directory)
 
-    return ("administrate" in permissions or
-            permission_codename in permissions)
+    permission_bits = get_permission_bits('administrate', permission_codename)
+    return bool(mask and mask & permission_bits)
 
 
 def check_permission(permission_codename, request):
@@ -143,16 +253,36 @@ class PermissionSet(models.Model):
         permissions_iterator = self.positive_permissions.iterator()
         return dict((perm.codename, perm) for perm in permissions_iterator)
 
-    def save(self, *args, **kwargs):
-        super(PermissionSet, self).save(*args, **kwargs)
-        # FIXME: can we use `post_save` signals or invalidate caches in model
-        # managers, please?
-        key = iri_to_uri('Permissions:%s' % self.user.username)
-        cache.delete(key)
-
-    def delete(self, *args, **kwargs):
-        super(PermissionSet, self).delete(*args, **kwargs)
-        # FIXME: can we use `post_delete` signals or invalidate caches in model
-        # managers, please?
-        key = iri_to_uri('Permissions:%s' % self.user.username)
-        cache.delete(key)
+
+@receiver([post_delete, post_save], sender=PermissionSet)
+@receiver(m2m_changed, sender=PermissionSet.positive_permissions.through)
+def invalidate_permissions_index(**kwargs):
+    conn = get_permissions_connection()
+    if conn is None:
+        return
+
+    instance = kwargs['instance']
+    if isinstance(instance, PermissionSet):
+        usernames = [instance.user.username]
+    elif kwargs.get('pk_set'):
+        usernames = PermissionSet.objects.filter(
+            pk__in=kwargs['pk_set'],
+        ).values_list('user__username', flat=True)
+    elif kwargs.get('action') == 'pre_clear':
+        # Clearing the permission sets of a permission: they can only be
+        # looked up before they are cleared
+        usernames = list(
+            PermissionSet.objects.filter(
+                positive_permissions=instance,
+            ).values_list('user__username', flat=True).distinct()
+        )
+        instance._permission_set_usernames = usernames
+    elif kwargs.get('action') == 'post_clear':
+        # Indexes could have been rebuilt meanwhile
+        usernames = getattr(instance, '_permission_set_usernames', [])
+    else:
+        return
+
+    keys = [get_permissions_index_key(username) for username in usernames]
+    if keys:
+        conn.delete(*keys)
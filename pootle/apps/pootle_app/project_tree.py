@@ -8,10 +8,21 @@
 # AUTHORS file for copyright and authorship information.
 
 import errno
+import hashlib
 import logging
 import os
+import time
+from collections import defaultdict
+
+try:
+    from os import scandir
+except ImportError:
+    from scandir import scandir
 
 from django.conf import settings
+from django.utils.encoding import iri_to_uri
+
+from django_redis import get_redis_connection
 
 from pootle.core.log import STORE_RESURRECTED, store_log
 from pootle_app.models.directory import Directory
@@ -21,6 +32,8 @@ from pootle_store.util import relative_real_path
 
 FILE_EXTENSIONS = ['po']
 
+KEY_SCAN_INDEX_PREFIX = 'pootle:scan:index:'
+
 
 def get_matching_language_dirs(project_dir, language):
     return [lang_dir for lang_dir in os.listdir(project_dir)
@@ -64,20 +77,21 @@ def is_hidden_file(path):
 
 
 def split_files_and_dirs(real_dir):
+    """Returns the translation files and the subdirectories of `real_dir`.
+
+    File types are taken from the directory listing where the file system
+    provides them, so entries are not stat'ed one by one.
+    """
     files = []
     dirs = []
-    for child_path in os.listdir(real_dir):
-        if is_hidden_file(child_path):
+    for entry in scandir(real_dir):
+        if is_hidden_file(entry.name):
             continue
-        full_child_path = os.path.join(real_dir, child_path)
-        should_include_file = (
-            os.path.isfile(full_child_path)
-            and os.path.splitext(full_child_path)[1][1:] in FILE_EXTENSIONS
-        )
-        if should_include_file:
-            files.append(child_path)
-        elif os.path.isdir(full_child_path):
-            dirs.append(child_path)
+        if entry.is_file():
+            if os.path.splitext(entry.name)[1][1:] in FILE_EXTENSIONS:
+                files.append(entry.name)
+        elif entry.is_dir():
+            dirs.append(entry.name)
     return files, dirs
 
 
@@ -120,10 +134,13 @@ def add_items(fs_items_set, db_items, create_or_resurrect_db_item, parent):
     return items, new_items
 
 
-def create_or_resurrect_store(f, parent, name, translation_project):
-    """Create or resurrect a store db item with given name and parent."""
-    try:
-        store = Store.objects.get(parent=parent, name=name)
+def create_or_resurrect_store(f, parent, name, translation_project,
+                              store=None):
+    """Create or resurrect a store db item with given name and parent.
+
+    :param store: the in-DB store with the given name and parent, if any.
+    """
+    if store is not None:
         store.obsolete = False
         store.file_mtime = 0
         if store.last_sync_revision is None:
@@ -131,7 +148,7 @@ def create_or_resurrect_store(f, parent, name, translation_project):
 
         store_log(user='system', action=STORE_RESURRECTED,
                   path=store.pootle_path, store=store.id)
-    except Store.DoesNotExist:
+    else:
         store = Store.objects.create(
             file=f, parent=parent,
             name=name, translation_project=translation_project)
@@ -139,66 +156,159 @@ def create_or_resurrect_store(f, parent, name, translation_project):
     return store
 
 
-def create_or_resurrect_dir(name, parent):
-    """Create or resurrect a directory db item with given name and parent."""
-    try:
-        directory = Directory.objects.get(parent=parent, name=name)
+def create_or_resurrect_dir(name, parent, directory=None):
+    """Create or resurrect a directory db item with given name and parent.
+
+    :param directory: the in-DB directory with the given name and parent,
+        if any.
+    """
+    if directory is not None:
         directory.obsolete = False
-    except Directory.DoesNotExist:
+    else:
         directory = Directory(name=name, parent=parent)
 
     directory.mark_all_dirty()
     return directory
 
 
-# TODO: rename function or even rewrite it
-def add_files(translation_project, relative_dir, db_dir):
-    podir_path = to_podir_path(relative_dir)
-    files, dirs = split_files_and_dirs(podir_path)
-    file_set = set(files)
-    dir_set = set(dirs)
-
-    existing_stores = dict((store.name, store) for store in
-                           db_dir.child_stores.live().exclude(file='')
-                                                     .iterator())
-    existing_dirs = dict((dir.name, dir) for dir in
-                         db_dir.child_dirs.live().iterator())
-
-    files, new_files = add_items(
-        file_set,
-        existing_stores,
-        lambda name: create_or_resurrect_store(
-            f=os.path.join(relative_dir, name),
-            parent=db_dir,
-            name=name,
-            translation_project=translation_project,
-        ),
-        db_dir,
-    )
-
-    db_subdirs, new_db_subdirs_ = add_items(
-        dir_set,
-        existing_dirs,
-        lambda name: create_or_resurrect_dir(name=name, parent=db_dir),
-        db_dir,
-    )
-
-    is_empty = len(files) == 0
-    for db_subdir in db_subdirs:
-        fs_subdir = os.path.join(relative_dir, db_subdir.name)
-        _files, _new_files, _is_empty = add_files(
-            translation_project,
-            fs_subdir,
-            db_subdir,
-        )
-        files += _files
-        new_files += _new_files
-        is_empty &= _is_empty
+def get_scan_index_key(translation_project):
+    return iri_to_uri(KEY_SCAN_INDEX_PREFIX + translation_project.pootle_path)
 
-    if is_empty:
-        db_dir.makeobsolete()
 
-    return files, new_files, is_empty
+class ProjectTreeScanner(object):
+    """Makes the in-DB directories and stores of a translation project
+    reflect its files on disk.
+
+    All directories and stores of the translation project are loaded
+    upfront. A per-directory index kept in Redis records the modification
+    time of every scanned directory along with its in-DB contents, so
+    directories which didn't change since the last scan are not listed
+    again.
+    """
+
+    #: Directories modified this number of seconds before the scan started
+    #: or later are always listed on the next scan, as they might change
+    #: again within the resolution of their modification time
+    RACY_SECONDS = 2
+
+    def __init__(self, translation_project, force=False):
+        self.translation_project = translation_project
+        self.force = force
+        self.dirs = defaultdict(dict)
+        self.stores = defaultdict(dict)
+        self.index = {}
+        self.new_index = {}
+
+    def load(self):
+        tp = self.translation_project
+        directories = Directory.objects.filter(
+            pootle_path__startswith=tp.pootle_path,
+        )
+        for directory in directories.iterator():
+            self.dirs[directory.parent_id][directory.name] = directory
+        for store in Store.objects.filter(translation_project=tp).iterator():
+            store.translation_project = tp
+            self.stores[store.parent_id][store.name] = store
+
+        if not self.force:
+            self.index = get_redis_connection('redis').hgetall(
+                get_scan_index_key(tp)
+            )
+
+    def save_index(self):
+        key = get_scan_index_key(self.translation_project)
+        pipe = get_redis_connection('redis').pipeline()
+        pipe.delete(key)
+        if self.new_index:
+            pipe.hmset(key, self.new_index)
+        pipe.execute()
+
+    def scan(self):
+        """Scans the translation project's files.
+
+        :return: list of all live stores, list of newly added stores.
+        """
+        self.started = time.time()
+        self.load()
+        tp = self.translation_project
+        files, new_files, __ = self.scan_dir(tp.real_path, tp.directory)
+        self.save_index()
+        return files, new_files
+
+    def get_live_items(self, db_dir):
+        stores = {
+            name: store
+            for name, store in self.stores[db_dir.id].iteritems()
+            if not store.obsolete and store.file
+        }
+        dirs = {
+            name: directory
+            for name, directory in self.dirs[db_dir.id].iteritems()
+            if not directory.obsolete
+        }
+        return stores, dirs
+
+    def get_signature(self, mtime, store_names, dir_names):
+        contents = repr((sorted(store_names), sorted(dir_names)))
+        return '%r:%s' % (mtime, hashlib.sha1(contents).hexdigest())
+
+    def scan_dir(self, relative_dir, db_dir):
+        podir_path = to_podir_path(relative_dir)
+        mtime = os.stat(podir_path).st_mtime
+        existing_stores, existing_dirs = self.get_live_items(db_dir)
+        signature = self.get_signature(mtime, existing_stores, existing_dirs)
+        index_field = relative_dir.encode('utf-8')
+
+        if self.index.get(index_field) == signature:
+            files = existing_stores.values()
+            new_files = []
+            db_subdirs = existing_dirs.values()
+        else:
+            file_set, dir_set = map(set, split_files_and_dirs(podir_path))
+            files, new_files = add_items(
+                file_set,
+                existing_stores,
+                lambda name: create_or_resurrect_store(
+                    f=os.path.join(relative_dir, name),
+                    parent=db_dir,
+                    name=name,
+                    translation_project=self.translation_project,
+                    store=self.stores[db_dir.id].get(name),
+                ),
+                db_dir,
+            )
+            db_subdirs, new_db_subdirs_ = add_items(
+                dir_set,
+                existing_dirs,
+                lambda name: create_or_resurrect_dir(
+                    name=name,
+                    parent=db_dir,
+                    directory=self.dirs[db_dir.id].get(name),
+                ),
+                db_dir,
+            )
+
+        is_empty = len(files) == 0
+        for db_subdir in db_subdirs:
+            fs_subdir = os.path.join(relative_dir, db_subdir.name)
+            _files, _new_files, _is_empty = self.scan_dir(fs_subdir,
+                                                          db_subdir)
+            files += _files
+            new_files += _new_files
+            is_empty &= _is_empty
+
+        if is_empty:
+            db_dir.makeobsolete()
+        elif mtime < self.started - self.RACY_SECONDS:
+            store_names = [store.name for store in files
+                           if store.parent_id == db_dir.id]
+            dir_names = [directory.name for directory in db_subdirs
+                         if not directory.obsolete]
+            self.new_index[index_field] = self.get_signature(
+                mtime, store_names, dir_names,
+            )
+
+        return files, new_files, is_empty
 
 
 def to_podir_path(path):
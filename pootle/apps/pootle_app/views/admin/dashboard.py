@@ -15,6 +15,8 @@ from django_rq.queues import get_failed_queue, get_queue
 from django_rq.workers import Worker
 
 from pootle.core.decorators import admin_required
+from pootle.core.http import JsonResponse
+from pootle.core.utils.redis_rq import get_stats_queue_status
 from pootle.i18n.gettext import ugettext as _, ungettext
 
 
@@ -60,3 +62,14 @@ def view(request):
         'checks': checks(),
     }
     return render(request, "admin/dashboard.html", ctx)
+
+
+@admin_required
+def stats_queue_status(request):
+    try:
+        minutes = max(1, int(request.GET.get('minutes', 5)))
+        top = max(0, int(request.GET.get('top', 10)))
+    except ValueError:
+        minutes, top = 5, 10
+
+    return JsonResponse(get_stats_queue_status(minutes=minutes, top=top))
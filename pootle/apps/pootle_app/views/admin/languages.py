@@ -33,3 +33,5 @@ class LanguageAPIView(SuperuserRequiredMixin, APIView):
     edit_form_class = LanguageForm
     page_size = 10
     search_fields = ('code', 'fullname')
+    cursor_field = '-id'
+    count_cache_timeout = 60
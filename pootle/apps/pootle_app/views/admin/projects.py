@@ -50,3 +50,5 @@ class ProjectAPIView(SuperuserRequiredMixin, APIView):
     edit_form_class = ProjectForm
     page_size = 10
     search_fields = ('code', 'fullname', 'disabled')
+    cursor_field = '-id'
+    count_cache_timeout = 60
@@ -52,6 +52,10 @@ urlpatterns = [
 
 
 api_patterns = [
+    url(r'^stats-queue/?$',
+        dashboard.stats_queue_status,
+        name='pootle-xhr-admin-stats-queue'),
+
     url(r'^users/?$',
         UserAPIView.as_view(),
         name='pootle-xhr-admin-users'),
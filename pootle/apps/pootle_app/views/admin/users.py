@@ -34,3 +34,5 @@ class UserAPIView(SuperuserRequiredMixin, APIView):
     edit_form_class = UserForm
     page_size = 10
     search_fields = ('username', 'full_name', 'email')
+    cursor_field = '-id'
+    count_cache_timeout = 60
@@ -17,7 +17,7 @@ from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.translation import ugettext_lazy as _
 
-from pootle.core.cache import make_method_key
+from pootle.core.cache import invalidate_collection_counts, make_method_key
 from pootle.core.constants import CACHE_TIMEOUT
 from pootle.core.mixins import TreeItem
 from pootle.core.url_helpers import get_editor_filter
@@ -229,3 +229,12 @@ def invalidate_language_list_cache(**kwargs):
         return
 
     clear_language_list_cache()
+
+
+@receiver([post_delete, post_save])
+def invalidate_language_counts_cache(**kwargs):
+    instance = kwargs["instance"]
+    if instance.__class__.__name__ != 'Language':
+        return
+
+    invalidate_collection_counts(instance)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pootle_project', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VisibleProject',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profile', models.CharField(db_index=True, max_length=64)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visible_to', to='pootle_project.Project')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='visibleproject',
+            unique_together=set([('profile', 'project')]),
+        ),
+    ]
@@ -7,25 +7,26 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import hashlib
 import logging
 import os
 from collections import OrderedDict
 
-from translate.filters import checks
-
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models.signals import post_delete, post_save
+from django.db import IntegrityError, models, transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.urls import reverse
 from django.utils.encoding import iri_to_uri
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
-from pootle.core.cache import make_method_key
+from pootle.core.cache import invalidate_collection_counts, make_method_key
 from pootle.core.constants import CACHE_TIMEOUT
 from pootle.core.mixins import CachedTreeItem
+from pootle.core.mixins.treeitem import bump_content_metadata_revision
 from pootle.core.models import VirtualResource
 from pootle.core.url_helpers import (get_editor_filter, get_path_sortkey,
                                      split_pootle_path, to_tp_relative_path)
@@ -37,17 +38,19 @@ from pootle_store.util import absolute_real_path
 
 
 RESERVED_PROJECT_CODES = ('admin', 'translate', 'settings')
+#: Names of the `translate.filters.checks` classes of the checkers projects
+#: can use. The module is costly to import, so it's only loaded on first use
 PROJECT_CHECKERS = {
-    "standard": checks.StandardChecker,
-    "openoffice": checks.OpenOfficeChecker,
-    "libreoffice": checks.LibreOfficeChecker,
-    "mozilla": checks.MozillaChecker,
-    "kde": checks.KdeChecker,
-    "wx": checks.KdeChecker,
-    "gnome": checks.GnomeChecker,
-    "creativecommons": checks.CCLicenseChecker,
-    "drupal": checks.DrupalChecker,
-    "terminology": checks.TermChecker,
+    "standard": "StandardChecker",
+    "openoffice": "OpenOfficeChecker",
+    "libreoffice": "LibreOfficeChecker",
+    "mozilla": "MozillaChecker",
+    "kde": "KdeChecker",
+    "wx": "KdeChecker",
+    "gnome": "GnomeChecker",
+    "creativecommons": "CCLicenseChecker",
+    "drupal": "DrupalChecker",
+    "terminology": "TermChecker",
 }
 
 
@@ -113,7 +116,7 @@ class ProjectManager(models.Manager):
         if user.is_superuser:
             return self.all()
 
-        return self.enabled().filter(code__in=Project.accessible_by_user(user))
+        return self.enabled().filter(**Project.get_visibility_filter(user))
 
 
 class ProjectURLMixin(object):
@@ -209,8 +212,47 @@ class Project(models.Model, CachedTreeItem, ProjectURLMixin):
         db_table = 'pootle_app_project'
 
     @classmethod
-    def accessible_by_user(cls, user):
-        """Returns a list of project codes accessible by `user`.
+    def get_access_profile(cls, user):
+        """Returns the access profile of `user`.
+
+        Users with the same explicit `view` and `hide` permissions at the
+        root and project levels can access the same projects, so they
+        share their access profile.
+
+        :param user: The non-superuser ``User`` instance to get the access
+            profile for.
+        """
+        key = iri_to_uri('projects:profile:%s' % user.username)
+        profile = cache.get(key, None)
+        if profile is not None:
+            return profile
+
+        logging.debug(u'Cache miss for %s', key)
+
+        project_or_root = (Q(directory__project__isnull=False) |
+                           Q(directory__pootle_path='/'))
+        permission_sets = PermissionSet.objects.filter(user=user)
+        view_paths = permission_sets.filter(
+            project_or_root,
+            positive_permissions__codename='view',
+        ).values_list('directory__pootle_path', flat=True)
+        hide_paths = permission_sets.filter(
+            directory__project__isnull=False,
+            negative_permissions__codename='hide',
+        ).values_list('directory__pootle_path', flat=True)
+
+        fingerprint = hashlib.sha1(
+            repr((sorted(view_paths), sorted(hide_paths)))
+        ).hexdigest()
+        profile = '%s:%s' % ('anonymous' if user.is_anonymous else 'user',
+                             fingerprint)
+        cache.set(key, profile, CACHE_TIMEOUT)
+
+        return profile
+
+    @classmethod
+    def _get_accessible_ids(cls, user):
+        """Returns the set of IDs of the projects accessible by `user`.
 
         Checks for explicit `view` permissions for `user`, and extends
         them with the `default` (if logged-in) and `nobody` users' `view`
@@ -219,69 +261,120 @@ class Project(models.Model, CachedTreeItem, ProjectURLMixin):
         Negative `hide` permissions are also taken into account and
         they'll forbid project access as far as there's no `view`
         permission set at the same level for the same user.
-
-        :param user: The ``User`` instance to get accessible projects for.
         """
-        if user.is_superuser:
-            key = iri_to_uri('projects:all')
+        username = user.username
+        if user.is_anonymous:
+            allow_usernames = [username]
+            forbid_usernames = [username, 'default']
         else:
-            username = user.username
-            key = iri_to_uri('projects:accessible:%s' % username)
-        user_projects = cache.get(key, None)
+            allow_usernames = list(set([username, 'default', 'nobody']))
+            forbid_usernames = list(set([username, 'default']))
 
-        if user_projects is not None:
-            return user_projects
+        # Check root for `view` permissions
+
+        root_permissions = PermissionSet.objects.filter(
+            directory__pootle_path='/',
+            user__username__in=allow_usernames,
+            positive_permissions__codename='view',
+        )
+        if root_permissions.exists():
+            user_projects = set(cls.objects.values_list('id', flat=True))
+        else:
+            user_projects = set()
+
+        # Check specific permissions at the project level
+
+        accessible_projects = cls.objects.filter(
+            directory__permission_sets__positive_permissions__codename='view',
+            directory__permission_sets__user__username__in=allow_usernames,
+        ).values_list('id', flat=True)
+
+        forbidden_projects = cls.objects.filter(
+            directory__permission_sets__negative_permissions__codename='hide',
+            directory__permission_sets__user__username__in=forbid_usernames,
+        ).values_list('id', flat=True)
+
+        allow_projects = set(accessible_projects)
+        forbid_projects = set(forbidden_projects) - allow_projects
+        return user_projects.union(allow_projects).difference(forbid_projects)
+
+    @classmethod
+    def get_accessible_bitmap(cls, user):
+        """Returns the access profile of `user` along with a bitmap of the
+        projects accessible to it, where the bit at the position of each
+        project's ID is set if the project is accessible.
+
+        The bitmap is shared by all users with the same access profile.
+        Whenever it needs to be computed, the visible projects of the
+        profile are updated as well.
+
+        :param user: The non-superuser ``User`` instance to get the
+            accessible projects bitmap for.
+        """
+        profile = cls.get_access_profile(user)
+        key = iri_to_uri('projects:bitmap:%s' % profile)
+        bitmap = cache.get(key, None)
+        if bitmap is not None:
+            return profile, bitmap
 
         logging.debug(u'Cache miss for %s', key)
 
-        # FIXME: use `cls.objects.cached_dict().keys()`
-        ALL_PROJECTS = cls.objects.values_list('code', flat=True)
+        project_ids = cls._get_accessible_ids(user)
+        VisibleProject.objects.update_profile(profile, project_ids)
 
-        if user.is_superuser:
-            user_projects = ALL_PROJECTS
-        else:
-            ALL_PROJECTS = set(ALL_PROJECTS)
+        bitmap = 0
+        for project_id in project_ids:
+            bitmap |= 1 << project_id
+        cache.set(key, bitmap, CACHE_TIMEOUT)
 
-            if user.is_anonymous:
-                allow_usernames = [username]
-                forbid_usernames = [username, 'default']
-            else:
-                allow_usernames = list(set([username, 'default', 'nobody']))
-                forbid_usernames = list(set([username, 'default']))
+        return profile, bitmap
 
-            # Check root for `view` permissions
+    @classmethod
+    def get_visibility_filter(cls, user, prefix=''):
+        """Returns the lookups filtering the projects accessible by `user`.
 
-            root_permissions = PermissionSet.objects.filter(
-                directory__pootle_path='/',
-                user__username__in=allow_usernames,
-                positive_permissions__codename='view',
-            )
-            if root_permissions.count():
-                user_projects = ALL_PROJECTS
-            else:
-                user_projects = set()
+        The lookups join the visible projects of the access profile of
+        `user`, which is cheaper than filtering by a potentially long list
+        of project codes.
 
-            # Check specific permissions at the project level
+        :param user: The non-superuser ``User`` instance to filter
+            accessible projects for.
+        :param prefix: Lookup path from the filtered model to projects,
+            e.g. `'project__'`.
+        """
+        profile = cls.get_accessible_bitmap(user)[0]
+        return {'%svisible_to__profile' % prefix: profile}
 
-            accessible_projects = cls.objects.filter(
-                directory__permission_sets__positive_permissions__codename='view',
-                directory__permission_sets__user__username__in=allow_usernames,
-            ).values_list('code', flat=True)
+    @classmethod
+    def is_id_accessible_by(cls, project_id, user):
+        """Returns `True` if the project with ID `project_id` is
+        accessible by `user`.
+        """
+        if user.is_superuser:
+            return True
 
-            forbidden_projects = cls.objects.filter(
-                directory__permission_sets__negative_permissions__codename='hide',
-                directory__permission_sets__user__username__in=forbid_usernames,
-            ).values_list('code', flat=True)
+        return bool(cls.get_accessible_bitmap(user)[1] >> project_id & 1)
 
-            allow_projects = set(accessible_projects)
-            forbid_projects = set(forbidden_projects) - allow_projects
-            user_projects = (user_projects.union(
-                allow_projects)).difference(forbid_projects)
+    @classmethod
+    def accessible_by_user(cls, user):
+        """Returns a list of project codes accessible by `user`.
 
-        user_projects = list(user_projects)
-        cache.set(key, user_projects, CACHE_TIMEOUT)
+        :param user: The ``User`` instance to get accessible projects for.
+        """
+        if user.is_superuser:
+            key = iri_to_uri('projects:all')
+            user_projects = cache.get(key, None)
+            if user_projects is None:
+                user_projects = list(cls.objects.values_list('code',
+                                                             flat=True))
+                cache.set(key, user_projects, CACHE_TIMEOUT)
 
-        return user_projects
+            return user_projects
+
+        return list(
+            cls.objects.filter(**cls.get_visibility_filter(user))
+                       .values_list('code', flat=True)
+        )
 
     # # # # # # # # # # # # # #  Properties # # # # # # # # # # # # # # # # # #
 
@@ -404,10 +497,51 @@ class Project(models.Model, CachedTreeItem, ProjectURLMixin):
         """Returns `True` if the current project is accessible by
         `user`.
         """
-        if user.is_superuser:
-            return True
+        return Project.is_id_accessible_by(self.id, user)
+
+
+class VisibleProjectManager(models.Manager):
+
+    def update_profile(self, profile, project_ids):
+        """Makes `project_ids` the visible projects of `profile`."""
+        project_ids = set(project_ids)
+        current_ids = set(
+            self.filter(profile=profile).values_list('project_id', flat=True)
+        )
+
+        stale_ids = current_ids - project_ids
+        if stale_ids:
+            self.filter(profile=profile, project_id__in=stale_ids).delete()
+
+        new_ids = project_ids - current_ids
+        if new_ids:
+            try:
+                with transaction.atomic():
+                    self.bulk_create([
+                        VisibleProject(profile=profile, project_id=project_id)
+                        for project_id in new_ids
+                    ])
+            except IntegrityError:
+                # Concurrently added by another process
+                pass
+
 
-        return self.code in Project.accessible_by_user(user)
+class VisibleProject(models.Model):
+    """Projects accessible to the users of an access profile.
+
+    See `Project.get_access_profile()`.
+    """
+
+    profile = models.CharField(max_length=64, db_index=True)
+    project = models.ForeignKey(Project, related_name='visible_to')
+
+    objects = VisibleProjectManager()
+
+    class Meta(object):
+        unique_together = ('profile', 'project')
+
+    def __unicode__(self):
+        return u'%s: %s' % (self.profile, self.project_id)
 
 
 class ProjectResource(VirtualResource, ProjectURLMixin):
@@ -469,5 +603,70 @@ def invalidate_accessible_projects_cache(**kwargs):
         return
 
     cache.delete_pattern(make_method_key('Project', 'cached_dict', '*'))
-    cache.delete('projects:all')
-    cache.delete_pattern('projects:accessible:*')
+
+    if isinstance(instance, Project):
+        # Only added or removed projects change accessibility
+        if kwargs.get('created', True):
+            cache.delete('projects:all')
+            cache.delete_pattern('projects:bitmap:*')
+    elif isinstance(instance, PermissionSet):
+        invalidate_access_profile(instance.user)
+
+
+@receiver([post_delete, post_save])
+def invalidate_project_counts_cache(**kwargs):
+    instance = kwargs["instance"]
+    if instance.__class__.__name__ != 'Project':
+        return
+
+    invalidate_collection_counts(instance)
+
+
+@receiver(m2m_changed, sender=PermissionSet.positive_permissions.through)
+@receiver(m2m_changed, sender=PermissionSet.negative_permissions.through)
+def invalidate_accessible_projects_cache_m2m(**kwargs):
+    instance = kwargs['instance']
+    if kwargs['action'] not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if isinstance(instance, PermissionSet):
+        users = [instance.user]
+    elif kwargs['pk_set']:
+        users = [
+            permission_set.user
+            for permission_set in PermissionSet.objects.filter(
+                pk__in=kwargs['pk_set'],
+            ).select_related('user')
+        ]
+    else:
+        return
+
+    cache.delete_pattern(make_method_key('Project', 'cached_dict', '*'))
+    for user in users:
+        invalidate_access_profile(user)
+    bump_content_metadata_revision()
+
+
+@receiver([post_delete, post_save])
+@disable_for_loaddata
+def invalidate_content_metadata(**kwargs):
+    """Invalidates responses validated by content revisions after changes
+    in data shown along with stats.
+    """
+    instance = kwargs['instance']
+    if (instance.__class__.__name__ not in
+        ['Project', 'Language', 'TranslationProject', 'PermissionSet',
+         'DueDate']):
+        return
+
+    bump_content_metadata_revision()
+
+
+def invalidate_access_profile(user):
+    """Invalidates the accessible projects of `user` after changes in its
+    permission sets.
+    """
+    cache.delete(iri_to_uri('projects:profile:%s' % user.username))
+    if user.is_meta:
+        # Meta users' permissions apply to every access profile
+        cache.delete_pattern('projects:bitmap:*')
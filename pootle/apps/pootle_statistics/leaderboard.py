@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import datetime
+
+from django_redis import get_redis_connection
+
+
+class Leaderboard(object):
+    """Per-day user scores stored as Redis sorted sets.
+
+    Every day has one sorted set per scope: the whole server, every
+    language, every project and every language+project pair. Members of the
+    sets are user IDs, scored with the user's score delta for that day.
+    """
+
+    KEY_PREFIX = 'pootle:leaderboard'
+    READY_KEY = 'pootle:leaderboard:ready'
+
+    #: Number of days daily scores are kept for. Longer periods are not
+    #: served from the leaderboard.
+    RETENTION_DAYS = 400
+
+    #: Number of seconds the union of daily scores for a period is kept for
+    UNION_TIMEOUT = 60
+
+    @classmethod
+    def get_connection(cls):
+        return get_redis_connection('redis')
+
+    @classmethod
+    def get_scope(cls, language_id=None, project_id=None):
+        scope = []
+        if language_id is not None:
+            scope.append('language=%s' % language_id)
+        if project_id is not None:
+            scope.append('project=%s' % project_id)
+
+        return ':'.join(scope) or 'all'
+
+    @classmethod
+    def get_scopes(cls, language_id, project_id):
+        """Returns all scopes a score in the given language and project
+        accounts for.
+        """
+        return [
+            cls.get_scope(),
+            cls.get_scope(language_id=language_id),
+            cls.get_scope(project_id=project_id),
+            cls.get_scope(language_id=language_id, project_id=project_id),
+        ]
+
+    @classmethod
+    def get_day_key(cls, date, scope):
+        return '%s:day:%s:%s' % (cls.KEY_PREFIX, date.isoformat(), scope)
+
+    @classmethod
+    def _get_expiry(cls, date):
+        expiry = date + datetime.timedelta(days=cls.RETENTION_DAYS + 1)
+        return datetime.datetime.combine(expiry, datetime.time())
+
+    @classmethod
+    def get_index_key(cls, date):
+        """Returns the key of the set listing all daily keys of `date`."""
+        return '%s:index:%s' % (cls.KEY_PREFIX, date.isoformat())
+
+    @classmethod
+    def _incr(cls, pipe, date, user_id, language_id, project_id, score):
+        expiry = cls._get_expiry(date)
+        index_key = cls.get_index_key(date)
+        for scope in cls.get_scopes(language_id, project_id):
+            key = cls.get_day_key(date, scope)
+            pipe.zincrby(name=key, value=user_id, amount=score)
+            pipe.expireat(key, expiry)
+            pipe.sadd(index_key, key)
+        pipe.expireat(index_key, expiry)
+
+    @classmethod
+    def _get_index_keys(cls, conn, start=None, end=None):
+        if start is not None and end is not None:
+            date = start
+            while date <= end:
+                yield cls.get_index_key(date)
+                date += datetime.timedelta(days=1)
+            return
+
+        index_prefix = '%s:index:' % cls.KEY_PREFIX
+        for key in conn.scan_iter(match=index_prefix + '*'):
+            date = key[len(index_prefix):]
+            if ((start is None or date >= start.isoformat()) and
+                    (end is None or date <= end.isoformat())):
+                yield key
+
+    @classmethod
+    def is_ready(cls):
+        """Returns whether the leaderboard has been seeded."""
+        return bool(cls.get_connection().exists(cls.READY_KEY))
+
+    @classmethod
+    def add_score(cls, date, user_id, language_id, project_id, score):
+        """Adds `score` to the user's daily score in all the scopes the
+        given language and project account for.
+        """
+        pipe = cls.get_connection().pipeline(transaction=False)
+        cls._incr(pipe, date, user_id, language_id, project_id, score)
+        pipe.execute()
+
+    @classmethod
+    def replace(cls, scores, start=None, end=None, users=None):
+        """Replaces daily scores with `scores`.
+
+        Existing scores within the [`start`, `end`] date range (and for
+        `users` only, if provided) are removed before adding the new ones.
+
+        :param scores: iterable of `(date, user_id, language_id, project_id,
+            score)` tuples.
+        :param users: iterable of user IDs to limit the replacement to.
+        """
+        conn = cls.get_connection()
+        index_keys = list(cls._get_index_keys(conn, start=start, end=end))
+
+        pipe = conn.pipeline()
+        for index_key in index_keys:
+            pipe.smembers(index_key)
+        day_keys = set()
+        for members in pipe.execute():
+            day_keys.update(members)
+
+        pipe = conn.pipeline()
+        if users is None:
+            keys = list(day_keys) + index_keys
+            if keys:
+                pipe.delete(*keys)
+        elif users:
+            for key in day_keys:
+                pipe.zrem(key, *users)
+
+        for date, user_id, language_id, project_id, score in scores:
+            cls._incr(pipe, date, user_id, language_id, project_id, score)
+        pipe.execute()
+
+    @classmethod
+    def clear(cls):
+        """Removes all leaderboard data."""
+        conn = cls.get_connection()
+        keys = list(conn.scan_iter(match='%s:*' % cls.KEY_PREFIX))
+        if keys:
+            conn.delete(*keys)
+
+    @classmethod
+    def set_ready(cls):
+        cls.get_connection().set(cls.READY_KEY, 1)
+
+    @classmethod
+    def get_top(cls, start, end, language_id=None, project_id=None,
+                count=None):
+        """Returns the users with the highest accumulated scores in the
+        [`start`, `end`) date range.
+
+        :param count: number of users to return. Values other than
+            positive numbers return all of them.
+        :return: list of `(user_id, score)` tuples, sorted by descending
+            score.
+        """
+        scope = cls.get_scope(language_id=language_id, project_id=project_id)
+        union_key = '%s:union:%s:%s:%s' % (cls.KEY_PREFIX, start.isoformat(),
+                                           end.isoformat(), scope)
+
+        conn = cls.get_connection()
+        if not conn.exists(union_key):
+            days = (end - start).days
+            keys = [
+                cls.get_day_key(start + datetime.timedelta(days=i), scope)
+                for i in xrange(days)
+            ]
+            pipe = conn.pipeline()
+            if keys:
+                pipe.zunionstore(union_key, keys)
+            pipe.expire(union_key, cls.UNION_TIMEOUT)
+            pipe.execute()
+
+        last = count - 1 if count > 0 else -1
+        return [
+            (int(user_id), score)
+            for user_id, score in conn.zrevrange(union_key, 0, last,
+                                                 withscores=True)
+        ]
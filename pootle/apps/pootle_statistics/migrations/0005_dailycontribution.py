@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pootle_translationproject', '0003_realpath_can_be_none'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('pootle_statistics', '0004_fill_translated_wordcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyContribution',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(db_index=True)),
+                ('action_code', models.IntegerField()),
+                ('rate', models.FloatField(default=0)),
+                ('review_rate', models.FloatField(default=0)),
+                ('score_delta', models.FloatField(default=0)),
+                ('translated_wordcount', models.FloatField(default=0)),
+                ('reviewed_wordcount', models.PositiveIntegerField(default=0)),
+                ('suggested_wordcount', models.PositiveIntegerField(default=0)),
+                ('translation_project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='pootle_translationproject.TranslationProject')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='dailycontribution',
+            unique_together=set([('date', 'user', 'translation_project', 'action_code', 'rate', 'review_rate')]),
+        ),
+        migrations.AlterIndexTogether(
+            name='dailycontribution',
+            index_together=set([('user', 'date')]),
+        ),
+    ]
@@ -7,20 +7,27 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import datetime
+import functools
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.db.models import F
 from django.template.defaultfilters import truncatechars
+from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 
 from pootle.core.log import SCORE_CHANGED, log
 from pootle.core.utils import dateformat
-from pootle_misc.checks import check_names
+from pootle.core.utils.timezone import make_aware, make_naive
+from pootle_misc.constants import check_names
 from pootle_store.constants import FUZZY, TRANSLATED, UNTRANSLATED
 from pootle_store.fields import to_python
 
+from .leaderboard import Leaderboard
+
 
 SIMILARITY_THRESHOLD = 0.5
 
@@ -378,6 +385,57 @@ class ScoreLogManager(models.Manager):
             creation_time__lte=end,
         )
 
+    def prefetch_initial_similarities(self, scorelogs):
+        """Fetches the initial similarities needed to calculate the score
+        deltas of `scorelogs` in bulk, instead of querying them once per
+        score log.
+
+        Score logs are expected to have their `submission__unit` related
+        objects loaded already.
+        """
+        scorelogs = list(scorelogs)
+        suggestion_ids = set()
+        unit_ids = set()
+        for scorelog in scorelogs:
+            if scorelog.action_code in (TranslationActionCodes.SUGG_ACCEPTED,
+                                        TranslationActionCodes.SUGG_REJECTED):
+                suggestion_ids.add(scorelog.submission.suggestion_id)
+            elif scorelog.action_code == TranslationActionCodes.EDIT_PENALTY:
+                unit_ids.add(scorelog.submission.unit_id)
+
+        suggestion_similarities = {}
+        if suggestion_ids:
+            suggestion_similarities = dict(
+                Submission.objects.filter(
+                    suggestion__in=suggestion_ids,
+                    type=SubmissionTypes.SUGG_ADD,
+                ).values_list('suggestion', 'similarity')
+            )
+
+        edit_similarities = {}
+        if unit_ids:
+            submissions = Submission.objects.filter(
+                unit__in=unit_ids,
+                field=SubmissionFields.TARGET,
+                type=SubmissionTypes.NORMAL,
+            ).values_list('unit', 'submitter', 'creation_time', 'similarity')
+            for unit_id, submitter_id, creation_time, similarity in submissions:
+                edit_similarities[(unit_id, submitter_id, creation_time)] = \
+                    similarity
+
+        for scorelog in scorelogs:
+            if scorelog.action_code == TranslationActionCodes.EDIT_PENALTY:
+                unit = scorelog.submission.unit
+                scorelog._initial_similarity = edit_similarities.get(
+                    (unit.id, unit.submitted_by_id, unit.submitted_on),
+                    Submission.DoesNotExist,
+                )
+            elif scorelog.submission.suggestion_id in suggestion_ids:
+                scorelog._initial_similarity = suggestion_similarities.get(
+                    scorelog.submission.suggestion_id,
+                    Submission.DoesNotExist,
+                )
+
 
 class ScoreLog(models.Model):
     creation_time = models.DateTimeField(db_index=True, null=False)
@@ -498,7 +556,7 @@ class ScoreLog(models.Model):
         self.rate = self.user.rate
         self.review_rate = self.user.review_rate
         self.score_delta = self.get_score_delta()
-        translated = self.get_paid_wordcounts()[0]
+        translated, reviewed = self.get_paid_wordcounts()
         self.translated_wordcount = translated
 
         super(ScoreLog, self).save(*args, **kwargs)
@@ -507,6 +565,16 @@ class ScoreLog(models.Model):
         User.objects.filter(id=self.user.id).update(
             score=F('score') + self.score_delta
         )
+        DailyContribution.objects.add_scorelog(
+            self, translated=translated, reviewed=reviewed,
+        )
+        tp = self.submission.translation_project
+        # Redis isn't rolled back along with the DB: only record the score
+        # once it is stored
+        transaction.on_commit(functools.partial(
+            Leaderboard.add_score, get_local_date(self.creation_time),
+            self.user_id, tp.language_id, tp.project_id, self.score_delta,
+        ))
         self.log()
 
     def log(self):
@@ -563,9 +631,7 @@ class ScoreLog(models.Model):
             try:
                 # Get similarity from initial submission where
                 # the suggestion was added.
-                s = self.submission.suggestion.submission_set \
-                        .get(type=SubmissionTypes.SUGG_ADD) \
-                        .similarity
+                s = self.get_initial_similarity()
                 if s is None:
                     s = 0
                 self.similarity = s
@@ -580,13 +646,7 @@ class ScoreLog(models.Model):
             try:
                 # Get similarity from initial submission where overwritten
                 # translation was added.
-                s = Submission.objects.get(
-                    unit__id=self.submission.unit_id,
-                    submitter_id=self.submission.unit.submitted_by_id,
-                    creation_time=self.submission.unit.submitted_on,
-                    field=SubmissionFields.TARGET,
-                    type=SubmissionTypes.NORMAL
-                ).similarity
+                s = self.get_initial_similarity()
                 if s is None:
                     s = 0
                 self.similarity = s
@@ -600,9 +660,7 @@ class ScoreLog(models.Model):
             try:
                 # Get similarity from initial submission where overwritten
                 # translation was added.
-                s = self.submission.suggestion.submission_set \
-                        .get(type=SubmissionTypes.SUGG_ADD) \
-                        .similarity
+                s = self.get_initial_similarity()
                 if s is None:
                     s = 0
                 self.similarity = s
@@ -631,6 +689,34 @@ class ScoreLog(models.Model):
             TranslationActionCodes.SUGG_REVIEWED_REJECTED: lambda: analyzeCost,
         }.get(self.action_code, lambda: 0)()
 
+    def get_initial_similarity(self):
+        """Returns the similarity of the submission which initially added the
+        suggestion or translation the current action refers to.
+
+        The value set by `ScoreLogManager.prefetch_initial_similarities()`
+        is used when available.
+
+        :raise Submission.DoesNotExist: if there is no such submission.
+        """
+        if hasattr(self, '_initial_similarity'):
+            if self._initial_similarity is Submission.DoesNotExist:
+                raise Submission.DoesNotExist
+            return self._initial_similarity
+
+        if self.action_code == TranslationActionCodes.EDIT_PENALTY:
+            return Submission.objects.get(
+                unit__id=self.submission.unit_id,
+                submitter_id=self.submission.unit.submitted_by_id,
+                creation_time=self.submission.unit.submitted_on,
+                field=SubmissionFields.TARGET,
+                type=SubmissionTypes.NORMAL
+            ).similarity
+
+        return Submission.objects.get(
+            suggestion_id=self.submission.suggestion_id,
+            type=SubmissionTypes.SUGG_ADD,
+        ).similarity
+
     def get_similarity(self):
         return self.similarity \
             if self.similarity >= SIMILARITY_THRESHOLD \
@@ -672,8 +758,8 @@ class ScoreLog(models.Model):
         reviewed_words = ns
 
         def get_sugg_reviewed_accepted():
-            suggester = self.submission.suggestion.user.pk
-            reviewer = self.submission.submitter.pk
+            suggester = self.submission.suggestion.user_id
+            reviewer = self.submission.submitter_id
             if suggester == reviewer:
                 if self.submission.old_value == '':
                     return translated_words, None
@@ -683,8 +769,8 @@ class ScoreLog(models.Model):
             return None, None
 
         def get_sugg_accepted():
-            suggester = self.submission.suggestion.user.pk
-            reviewer = self.submission.submitter.pk
+            suggester = self.submission.suggestion.user_id
+            reviewer = self.submission.submitter_id
             if suggester != reviewer and self.submission.old_value == '':
                 return translated_words, None
 
@@ -704,3 +790,215 @@ class ScoreLog(models.Model):
             TranslationActionCodes.SUGG_REVIEWED_ACCEPTED:
                 get_sugg_reviewed_accepted,
         }.get(self.action_code, lambda: (None, None))()
+
+
+def get_local_date(value):
+    """Returns the date `value` falls on in the server's timezone."""
+    return make_naive(value).date()
+
+
+def get_date_bounds(start, end):
+    """Returns the `[start, end)` datetime range covering the `start` and
+    `end` dates, both inclusive.
+    """
+    bounds = []
+    for date in (start, end + datetime.timedelta(days=1)):
+        bounds.append(make_aware(datetime.datetime.combine(date,
+                                                           datetime.time())))
+    return bounds
+
+
+class DailyContributionManager(models.Manager):
+
+    INCREMENT_FIELDS = ('score_delta', 'translated_wordcount',
+                        'reviewed_wordcount', 'suggested_wordcount')
+
+    def for_user_in_range(self, user, start, end):
+        """Returns the contribution rollups for `user` on the days of the
+        [`start`, `end`] datetime range.
+        """
+        return self.filter(
+            user=user,
+            date__gte=get_local_date(start),
+            date__lte=get_local_date(end),
+        )
+
+    def _get_key(self, scorelog):
+        return {
+            'date': get_local_date(scorelog.creation_time),
+            'user_id': scorelog.user_id,
+            'translation_project_id':
+                scorelog.submission.translation_project_id,
+            'action_code': scorelog.action_code,
+            'rate': scorelog.rate,
+            'review_rate': scorelog.review_rate,
+        }
+
+    def _get_values(self, scorelog, translated, reviewed):
+        return {
+            'score_delta': scorelog.score_delta,
+            'translated_wordcount': translated or 0,
+            'reviewed_wordcount': reviewed or 0,
+            'suggested_wordcount': scorelog.get_suggested_wordcount() or 0,
+        }
+
+    def add_scorelog(self, scorelog, translated=None, reviewed=None):
+        """Accounts `scorelog` in its daily contribution rollup.
+
+        :param translated: translated wordcount as reported by
+            `scorelog.get_paid_wordcounts()`.
+        :param reviewed: reviewed wordcount as reported by
+            `scorelog.get_paid_wordcounts()`.
+        """
+        key = self._get_key(scorelog)
+        values = self._get_values(scorelog, translated, reviewed)
+        increments = {
+            field: F(field) + value for field, value in values.items()
+        }
+
+        if self.filter(**key).update(**increments):
+            return
+
+        try:
+            with transaction.atomic():
+                values.update(key)
+                self.create(**values)
+        except IntegrityError:
+            # Someone else created the row in the meantime
+            self.filter(**key).update(**increments)
+
+    def rebuild(self, users=None, start=None, end=None):
+        """Recalculates contribution rollups from the score logs.
+
+        :param users: limit the rebuild to these users (a queryset or an
+            iterable of primary keys).
+        :param start: first date to rebuild, inclusive.
+        :param end: last date to rebuild, inclusive.
+        :return: the number of rollup rows written.
+        """
+        contributions = self.all()
+        scorelogs = ScoreLog.objects.all()
+        if users is not None:
+            contributions = contributions.filter(user__in=users)
+            scorelogs = scorelogs.filter(user__in=users)
+        if start is not None:
+            contributions = contributions.filter(date__gte=start)
+            scorelogs = scorelogs.filter(
+                creation_time__gte=get_date_bounds(start, start)[0],
+            )
+        if end is not None:
+            contributions = contributions.filter(date__lte=end)
+            scorelogs = scorelogs.filter(
+                creation_time__lt=get_date_bounds(end, end)[1],
+            )
+
+        scorelogs = scorelogs.select_related('submission__suggestion')
+
+        rows = {}
+        for scorelog in scorelogs.iterator():
+            key = self._get_key(scorelog)
+            translated, reviewed = scorelog.get_paid_wordcounts()
+            values = self._get_values(scorelog, translated, reviewed)
+
+            row_key = tuple(sorted(key.items()))
+            if row_key not in rows:
+                rows[row_key] = self.model(**key)
+            for field in self.INCREMENT_FIELDS:
+                setattr(rows[row_key], field,
+                        getattr(rows[row_key], field) + values[field])
+
+        with transaction.atomic():
+            contributions.delete()
+            self.bulk_create(rows.values(), batch_size=500)
+
+        self.refresh_leaderboard(users=users, start=start, end=end)
+        return len(rows)
+
+    def rebuild_by_day(self, users=None, start=None, end=None):
+        """Rebuilds contribution rollups one day at a time, committing every
+        day separately.
+
+        When `start` or `end` are omitted, the dates of the first and last
+        score logs are used.
+
+        :return: a generator of `(date, rows_written)` tuples.
+        """
+        if start is None or end is None:
+            scorelogs = ScoreLog.objects.all()
+            if users is not None:
+                scorelogs = scorelogs.filter(user__in=users)
+            scorelog_range = scorelogs.aggregate(
+                first=models.Min('creation_time'),
+                last=models.Max('creation_time'),
+            )
+            if scorelog_range['first'] is None:
+                return
+
+            if start is None:
+                start = get_local_date(scorelog_range['first'])
+            if end is None:
+                end = get_local_date(scorelog_range['last'])
+
+        date = start
+        while date <= end:
+            yield date, self.rebuild(users=users, start=date, end=date)
+            date += datetime.timedelta(days=1)
+
+    def refresh_leaderboard(self, users=None, start=None, end=None):
+        """Replaces the leaderboard's daily scores with the ones from the
+        contribution rollups.
+
+        Dates older than the leaderboard retention period are skipped.
+
+        :param users: limit the refresh to these users (a queryset or an
+            iterable of primary keys).
+        :param start: first date to refresh, inclusive.
+        :param end: last date to refresh, inclusive.
+        """
+        oldest = (get_local_date(timezone.now()) -
+                  datetime.timedelta(days=Leaderboard.RETENTION_DAYS))
+        if start is None or start < oldest:
+            start = oldest
+
+        contributions = self.filter(date__gte=start)
+        if end is not None:
+            contributions = contributions.filter(date__lte=end)
+        if users is not None:
+            users = list(users.values_list('pk', flat=True)
+                         if hasattr(users, 'values_list') else users)
+            contributions = contributions.filter(user__in=users)
+
+        scores = contributions.order_by().values_list(
+            'date', 'user', 'translation_project__language',
+            'translation_project__project',
+        ).annotate(score=models.Sum('score_delta'))
+
+        Leaderboard.replace(scores.iterator(), start=start, end=end,
+                            users=users)
+
+
+class DailyContribution(models.Model):
+    """Per-day rollup of score logs, grouped by user, translation project,
+    action and rates.
+    """
+
+    date = models.DateField(db_index=True, null=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=False)
+    translation_project = models.ForeignKey(
+        'pootle_translationproject.TranslationProject', null=False,
+    )
+    action_code = models.IntegerField(null=False)
+    rate = models.FloatField(null=False, default=0)
+    review_rate = models.FloatField(null=False, default=0)
+
+    score_delta = models.FloatField(null=False, default=0)
+    translated_wordcount = models.FloatField(null=False, default=0)
+    reviewed_wordcount = models.PositiveIntegerField(null=False, default=0)
+    suggested_wordcount = models.PositiveIntegerField(null=False, default=0)
+
+    objects = DailyContributionManager()
+
+    class Meta(object):
+        unique_together = ('date', 'user', 'translation_project',
+                           'action_code', 'rate', 'review_rate')
+        index_together = [['user', 'date']]
@@ -9,23 +9,25 @@
 
 from django.template.defaultfilters import truncatechars
 from django.urls import reverse
-from django.utils.functional import cached_property
 
 from accounts.proxy import DisplayUser
+from pootle.core.proxy import ValuesProxy
 from pootle.core.url_helpers import get_editor_filter, split_pootle_path
 from pootle.core.utils import dateformat
-from pootle_misc.checks import check_names
+from pootle_misc.constants import check_names
 from pootle_store.constants import FUZZY, TRANSLATED
 from pootle_store.fields import to_python
 
 from .models import SubmissionFields, SubmissionTypes, TranslationActionTypes
 
 
-class SubmissionProxy(object):
+class SubmissionProxy(ValuesProxy):
     """Wraps a dictionary of submission values, which is useful for wrapping
     results from qs.values calls
     """
 
+    __slots__ = ('values', '_display_user')
+
     fields = (
         "type",
         "old_value",
@@ -69,15 +71,18 @@ class SubmissionProxy(object):
         + suggestion_fields
         + suggestion_reviewer_fields
         + unit_fields)
+    proxied_fields = (
+        fields
+        + qc_fields
+        + submitter_fields
+        + suggestion_fields
+        + suggestion_reviewer_fields
+        + suggestion_user_fields
+        + unit_fields)
 
     def __init__(self, values):
         self.values = values
-
-    def __getattr__(self, k):
-        try:
-            return self.__dict__["values"][k] or ""
-        except KeyError:
-            return self.__getattribute__(k)
+        self._display_user = None
 
     @property
     def field(self):
@@ -141,11 +146,14 @@ class SubmissionProxy(object):
                 SubmissionTypes.SUGG_ACCEPT,
                 SubmissionTypes.SUGG_REJECT))
 
-    @cached_property
+    @property
     def display_user(self):
-        if self.is_suggestion:
-            return self.suggestion_reviewer_display
-        return self.submitter_display
+        if self._display_user is None:
+            if self.is_suggestion:
+                self._display_user = self.suggestion_reviewer_display
+            else:
+                self._display_user = self.submitter_display
+        return self._display_user
 
     @property
     def unit_pootle_path(self):
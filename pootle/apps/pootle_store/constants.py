@@ -56,6 +56,10 @@ FUZZY = 50
 #: Unit is fully translated
 TRANSLATED = 200
 
+#: Distance between the indexes of consecutive units when they are appended,
+#: which leaves room for inserting units without renumbering the store
+UNIT_INDEX_GAP = 1000
+
 # Map for retrieving natural names for unit states
 STATES_MAP = {
     OBSOLETE: _("Obsolete"),
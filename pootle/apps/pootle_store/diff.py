@@ -13,11 +13,38 @@ from collections import OrderedDict
 from django.db import models
 from django.utils.functional import cached_property
 
-from .constants import FUZZY, OBSOLETE, TRANSLATED, UNTRANSLATED
+from .constants import (FUZZY, OBSOLETE, TRANSLATED, UNIT_INDEX_GAP,
+                        UNTRANSLATED)
 from .fields import to_python as multistring_to_python
 from .unit import UnitProxy
 
 
+def get_insert_indexes(insert_at, next_index, count):
+    """Returns indexes for `count` units placed between the units indexed
+    `insert_at` and `next_index`.
+
+    Units are spread over the gap between both indexes. If the gap is too
+    small to hold them, the units starting at `next_index` have to be shifted
+    to make room for `count` units `UNIT_INDEX_GAP` apart.
+
+    :param next_index: index of the following unit, or `None` if units are
+        appended to the end of the store.
+    :return: a tuple `(indexes, update_index_delta)`, where
+        `update_index_delta` is the offset to apply from `next_index` on.
+    """
+    step = UNIT_INDEX_GAP
+    update_index_delta = 0
+    if next_index is not None:
+        if next_index - insert_at > count:
+            step = (next_index - insert_at) // (count + 1)
+        else:
+            update_index_delta = insert_at + step * (count + 1) - next_index
+    return (
+        [insert_at + step * (i + 1) for i in xrange(count)],
+        update_index_delta,
+    )
+
+
 class UnitDiffProxy(UnitProxy):
     """Wraps File/DB Unit dicts used by StoreDiff for equality comparison"""
 
@@ -33,11 +60,21 @@ class UnitDiffProxy(UnitProxy):
 
 
 class DBUnit(UnitDiffProxy):
-    pass
+
+    proxied_fields = (
+        'unitid', 'state', 'id', 'index', 'revision',
+        'source_f', 'target_f', 'developer_comment',
+        'translator_comment', 'locations', 'context',
+    )
 
 
 class FileUnit(UnitDiffProxy):
 
+    proxied_fields = (
+        'unitid', 'context', 'locations', 'source', 'target', 'state',
+        'developer_comment', 'translator_comment',
+    )
+
     @property
     def locations(self):
         return "\n".join(self.unit["locations"])
@@ -103,11 +140,7 @@ class DBStore(object):
         (i.e. filter out obsolete units)
     """
 
-    unit_fields = (
-        'unitid', 'state', 'id', 'index', 'revision',
-        'source_f', 'target_f', 'developer_comment',
-        'translator_comment', 'locations', 'context',
-    )
+    unit_fields = DBUnit.proxied_fields
 
     def __init__(self, store, only_active=False):
         self.store = store
@@ -174,46 +207,46 @@ class StoreDiff(object):
         """Returns a list of insert points with update index info.
 
         :return: a list of tuples
-            `(insert_at, uids_to_add, next_index, update_index_delta)` where
-                * `insert_at` is the point for inserting,
+            `(uids_to_add, new_indexes, next_index, update_index_delta)`
+            where
                 * `uids_to_add` are the units to be inserted,
+                * `new_indexes` are the indexes for `uids_to_add`,
                 * `next_index` is the starting point after which
                     `update_index_delta` should be applied,
-                * `update_index_delta` is the offset for index updating.
+                * `update_index_delta` is the offset for index updating,
+                    which is zero unless the gap between the neighbouring
+                    units is exhausted.
+            Indexes account for the updates of previous insert points.
         """
         inserts = []
         new_unitid_list = self.new_unit_list
         units = self.target.units
         active_uids = self.target.active_uids
+        offset = 0
 
         for (tag, i1, i2, j1, j2) in self.opcodes:
-            if tag == 'insert':
-                update_index_delta = 0
-                insert_at = 0
-                if i1 > 0:
-                    insert_at = units[active_uids[i1 - 1]]['index']
-
-                next_index = insert_at + 1
-                if i1 < len(active_uids):
-                    next_index = units[active_uids[i1]]['index']
-                    update_index_delta = j2 - j1 - next_index + insert_at + 1
-
-                inserts.append((
-                    insert_at,
-                    new_unitid_list[j1:j2],
-                    next_index,
-                    update_index_delta,
-                ))
-
-            elif tag == 'replace':
-                insert_at = units[active_uids[i1 - 1]]['index']
-                next_index = units[active_uids[i2 - 1]]['index']
-                inserts.append((
-                    insert_at,
-                    new_unitid_list[j1:j2],
-                    next_index,
-                    j2 - j1 - insert_at + next_index,
-                ))
+            if tag not in ('insert', 'replace'):
+                continue
+
+            insert_at = 0
+            if i1 > 0:
+                insert_at = units[active_uids[i1 - 1]]['index'] + offset
+
+            next_index = None
+            if i2 < len(active_uids):
+                next_index = units[active_uids[i2]]['index'] + offset
+
+            uids_to_add = new_unitid_list[j1:j2]
+            new_indexes, update_index_delta = get_insert_indexes(
+                insert_at, next_index, len(uids_to_add),
+            )
+            inserts.append((
+                uids_to_add,
+                new_indexes,
+                next_index,
+                update_index_delta,
+            ))
+            offset += update_index_delta
 
         return inserts
 
@@ -259,25 +292,18 @@ class StoreDiff(object):
         return None
 
     def get_indexes_to_update(self):
-        offset = 0
-        index_updates = []
-        for (insert_at_, uids_add_, next_index, delta) in self.insert_points:
-            if delta > 0:
-                index_updates += [(next_index + offset, delta)]
-                offset += delta
-        return index_updates
+        return [(next_index, delta)
+                for (uids_add_, indexes_, next_index, delta)
+                in self.insert_points
+                if delta > 0]
 
     def get_units_to_add(self):
-        offset = 0
         to_add = []
-        for (insert_at, uids_add, next_index_, delta) in self.insert_points:
-            for index, uid in enumerate(uids_add):
+        for (uids_add, indexes, next_index_, delta_) in self.insert_points:
+            for uid, new_unit_index in zip(uids_add, indexes):
                 source_unit = self.source_store.findid(uid)
                 if source_unit and source_unit.getid() not in self.target.units:
-                    new_unit_index = insert_at + index + 1 + offset
                     to_add += [(source_unit, new_unit_index)]
-            if delta > 0:
-                offset += delta
         return to_add
 
     def get_units_to_obsolete(self):
@@ -288,17 +314,13 @@ class StoreDiff(object):
 
     def get_units_to_update(self):
         uid_index_map = {}
-        offset = 0
 
-        for (insert_at, uids_add, next_index_, delta) in self.insert_points:
-            for index, uid in enumerate(uids_add):
-                new_unit_index = insert_at + index + 1 + offset
+        for (uids_add, indexes, next_index_, delta_) in self.insert_points:
+            for uid, new_unit_index in zip(uids_add, indexes):
                 if uid in self.target.units:
                     uid_index_map[uid] = {
                         'dbid': self.target.units[uid]['id'],
                         'index': new_unit_index}
-            if delta > 0:
-                offset += delta
         update_ids = self.get_updated_sourceids()
         update_ids.update({x['dbid'] for x in uid_index_map.values()})
         return (update_ids, uid_index_map)
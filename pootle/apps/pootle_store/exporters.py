@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import io
+from itertools import groupby
+
+from lxml import etree
+from translate.misc import csv_utils
+from translate.storage import csvl10n, po, xliff
+
+
+#: Number of units serialized at once
+CHUNK_SIZE = 500
+
+
+class UnitExporter(object):
+    """Serializes a sequence of units into a translation file, yielding
+    the file contents bit by bit so that they can be streamed.
+
+    Units are expected to be sorted by store, as consecutive units
+    belonging to the same store are grouped together.
+    """
+
+    content_type = 'text/plain'
+    extension = None
+    unit_class = None
+
+    def __init__(self, language=None, source_language=None):
+        """
+        :param language: `Language` of the translations, if any.
+        :param source_language: `Language` of the source strings, if any.
+        """
+        self.language = language
+        self.source_language = source_language
+
+    @property
+    def language_code(self):
+        return getattr(self.language, 'code', None)
+
+    @property
+    def source_language_code(self):
+        return getattr(self.source_language, 'code',
+                       self.source_language) or 'en'
+
+    def get_header(self):
+        return b''
+
+    def get_footer(self):
+        return b''
+
+    def get_store_header(self, store):
+        return b''
+
+    def get_store_footer(self, store):
+        return b''
+
+    def serialize_units(self, units):
+        raise NotImplementedError
+
+    def iter_content(self, units, chunk_size=None):
+        """Yields the serialized file, one chunk of units at a time.
+
+        :param units: iterable of `Unit`s, sorted by store.
+        :param chunk_size: maximum number of units serialized at once.
+            Defaults to `CHUNK_SIZE`.
+        """
+        chunk_size = chunk_size or CHUNK_SIZE
+        yield self.get_header()
+
+        for store, store_units in groupby(units, lambda x: x.store):
+            yield self.get_store_header(store)
+
+            chunk = []
+            for unit in store_units:
+                chunk.append(unit.convert(self.unit_class))
+                if len(chunk) >= chunk_size:
+                    yield self.serialize_units(chunk)
+                    chunk = []
+            if chunk:
+                yield self.serialize_units(chunk)
+
+            yield self.get_store_footer(store)
+
+        yield self.get_footer()
+
+
+class PoExporter(UnitExporter):
+
+    content_type = 'text/x-gettext-translation; charset=utf-8'
+    extension = 'po'
+    unit_class = po.pofile.UnitClass
+
+    def get_header(self):
+        output = po.pofile()
+        if self.language_code is not None:
+            output.settargetlanguage(self.language_code)
+        return bytes(output)
+
+    def serialize_units(self, units):
+        return b''.join(b'\n' + bytes(unit) for unit in units)
+
+
+class CsvExporter(UnitExporter):
+
+    content_type = 'text/csv; charset=utf-8'
+    extension = 'csv'
+    unit_class = csvl10n.csvunit
+
+    def __init__(self, *args, **kwargs):
+        super(CsvExporter, self).__init__(*args, **kwargs)
+        self.fieldnames = csvl10n.csvfile().fieldnames
+
+    def _write_rows(self, rows):
+        output = io.BytesIO()
+        writer = csv_utils.UnicodeDictWriter(output, self.fieldnames,
+                                             encoding='utf-8',
+                                             extrasaction='ignore',
+                                             dialect='default')
+        for row in rows:
+            writer.writerow(row)
+        return output.getvalue()
+
+    def get_header(self):
+        return self._write_rows([dict(zip(self.fieldnames, self.fieldnames))])
+
+    def serialize_units(self, units):
+        return self._write_rows(
+            {key: value if value is not None else u''
+             for key, value in unit.todict().iteritems()}
+            for unit in units
+        )
+
+
+class XliffExporter(UnitExporter):
+    """Exports units to XLIFF, using one `<file>` element per store."""
+
+    content_type = 'application/x-xliff+xml; charset=utf-8'
+    extension = 'xlf'
+    unit_class = xliff.xlifffile.UnitClass
+
+    def get_header(self):
+        return (
+            b'<?xml version="1.0" encoding="UTF-8"?>\n'
+            b'<xliff xmlns="%s" version="1.1">\n' % xliff.xlifffile.namespace
+        )
+
+    def get_footer(self):
+        return b'</xliff>\n'
+
+    def get_store_header(self, store):
+        file_node = etree.Element('file', {
+            'original': store.pootle_path,
+            'source-language': self.source_language_code,
+            'datatype': 'po',
+        })
+        if self.language_code is not None:
+            file_node.set('target-language', self.language_code)
+
+        # Serialize an empty element and leave it open for units to follow
+        start_tag = etree.tostring(file_node, encoding='UTF-8',
+                                   xml_declaration=False)
+        return b'  %s>\n    <body>\n' % start_tag[:-len(b'/>')]
+
+    def get_store_footer(self, store):
+        return b'    </body>\n  </file>\n'
+
+    def serialize_units(self, units):
+        output = xliff.xlifffile()
+        for unit in units:
+            output.addunit(unit)
+
+        # Keep the units only, which are already in the default namespace
+        body = etree.tostring(output.getbodynode(output.getfilenode('NoName')),
+                              encoding='UTF-8', xml_declaration=False)
+        return b'%s\n' % body[body.index(b'>') + 1:body.rindex(b'</')]
+
+
+EXPORTERS = {
+    'csv': CsvExporter,
+    'po': PoExporter,
+    'xliff': XliffExporter,
+}
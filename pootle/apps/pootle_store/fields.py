@@ -18,7 +18,7 @@ from django.db import models
 from django.db.models.fields.files import FieldFile, FileField
 
 from pootle.core.constants import PARSE_POOL_CULL_FREQUENCY, PARSE_POOL_SIZE
-from pootle.core.utils.multistring import (parse_multistring,
+from pootle.core.utils.multistring import (LazyMultiString,
                                            unparse_multistring)
 
 
@@ -36,13 +36,16 @@ def to_db(value):
 
 
 def to_python(value):
-    """Reconstruct a multistring from the database string representation."""
+    """Reconstruct a multistring from the database string representation.
+
+    Strings are parsed lazily, as most code paths only use the first form.
+    """
     if not value:
         return multistring("", encoding="UTF-8")
     elif isinstance(value, multistring):
         return value
     elif isinstance(value, basestring):
-        return parse_multistring(value)
+        return LazyMultiString(value)
     elif isinstance(value, dict):
         return multistring([val for __, val in sorted(value.items())],
                            encoding="UTF-8")
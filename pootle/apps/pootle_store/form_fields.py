@@ -10,7 +10,7 @@
 from django import forms
 from django.utils.datastructures import MultiValueDict
 
-from pootle_misc.checks import CATEGORY_IDS
+from pootle_misc.constants import CATEGORY_IDS
 
 
 class CommaSeparatedCheckboxSelectMultiple(forms.CheckboxSelectMultiple):
@@ -23,7 +23,7 @@ from pootle.core.url_helpers import split_pootle_path
 from pootle.i18n.gettext import ugettext as _
 from pootle_app.models import Directory
 from pootle_app.models.permissions import check_permission, check_user_permission
-from pootle_misc.checks import CATEGORY_CODES, check_names
+from pootle_misc.constants import CATEGORY_CODES, check_names
 from pootle_misc.util import get_date_interval
 from pootle_project.models import Project
 from pootle_statistics.models import (Submission, SubmissionFields,
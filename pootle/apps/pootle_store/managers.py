@@ -7,9 +7,12 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
-from django.db import models
+from collections import defaultdict
 
-from .constants import LANGUAGE_REGEX, OBSOLETE, PROJECT_REGEX
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Max
+
+from .constants import LANGUAGE_REGEX, OBSOLETE, PROJECT_REGEX, UNTRANSLATED
 from .util import SuggestionStates
 
 
@@ -40,11 +43,10 @@ class UnitManager(models.Manager):
         if user.is_superuser:
             return self.live()
 
-        user_projects = Project.accessible_by_user(user)
-        filter_by = {
-            "store__translation_project__project__disabled": False,
-            "store__translation_project__project__code__in": user_projects
-        }
+        filter_by = Project.get_visibility_filter(
+            user, prefix='store__translation_project__project__',
+        )
+        filter_by["store__translation_project__project__disabled"] = False
         return self.live().filter(**filter_by)
 
     def get_translatable(self, user, project_code=None, language_code=None,
@@ -94,6 +96,65 @@ class UnitManager(models.Manager):
             return units_qs.filter(
                 store__pootle_path__regex=pootle_path)
 
+    def calculate_suggestion_counts(self, units=None):
+        """Counts pending suggestions of `units` from the suggestions
+        table.
+
+        :param units: optional queryset or iterable of unit IDs to restrict
+            the calculation to.
+        :return: a dictionary of counts keyed by unit ID, which only
+            includes units having pending suggestions.
+        """
+        from .models import Suggestion
+
+        suggestions = Suggestion.objects.pending()
+        if units is not None:
+            suggestions = suggestions.filter(unit__in=units)
+        return dict(
+            suggestions.order_by().values_list('unit')
+                       .annotate(count=Count('id'))
+        )
+
+    def get_suggestion_count_drift(self, units=None):
+        """Returns the units whose stored suggestion count differs from the
+        calculated one, as a dictionary mapping unit IDs to
+        `(stored, calculated)` tuples.
+        """
+        qs = self.get_queryset()
+        if units is not None:
+            qs = qs.filter(pk__in=units)
+        expected = self.calculate_suggestion_counts(units)
+        stored = dict(
+            qs.filter(suggestion_count__gt=0)
+              .values_list('id', 'suggestion_count')
+        )
+        stored.update(
+            (unit_id, 0) for unit_id in expected if unit_id not in stored
+        )
+        return {
+            unit_id: (count, expected.get(unit_id, 0))
+            for unit_id, count in stored.iteritems()
+            if count != expected.get(unit_id, 0)
+        }
+
+    def refresh_suggestion_counts(self, units=None):
+        """Recalculates suggestion counts for `units`, or for all units if
+        none are given.
+
+        :return: the number of units whose count was repaired.
+        """
+        drift = self.get_suggestion_count_drift(units)
+        units_by_count = defaultdict(list)
+        for unit_id, (stored_count, count) in drift.iteritems():
+            units_by_count[count].append(unit_id)
+
+        with transaction.atomic():
+            for count, unit_ids in units_by_count.iteritems():
+                self.get_queryset().filter(pk__in=unit_ids).update(
+                    suggestion_count=count,
+                )
+        return len(drift)
+
 
 class StoreManager(models.Manager):
     use_for_related_fields = True
@@ -106,3 +167,141 @@ class StoreManager(models.Manager):
         kwargs["pootle_path"] = '%s%s' % (kwargs['parent'].pootle_path,
                                           kwargs['name'])
         return super(StoreManager, self).create(*args, **kwargs)
+
+
+def counts_checks(state):
+    """Whether the checks of a unit in `state` are accounted in the check
+    counts of its store.
+    """
+    return state is not None and state > UNTRANSLATED
+
+
+class StoreCheckCountsManager(models.Manager):
+
+    def get_changes(self, checks, sign=1):
+        """Returns the check count changes resulting from adding (or removing,
+        if `sign` is -1) `checks`.
+
+        :param checks: an iterable of dictionaries with the `name`,
+            `category` and `false_positive` values of quality checks.
+        :return: a dictionary of `[active, false_positive]` deltas keyed by
+            `(name, category)`.
+        """
+        changes = defaultdict(lambda: [0, 0])
+        for check in checks:
+            key = (check['name'], check['category'])
+            changes[key][1 if check['false_positive'] else 0] += sign
+        return changes
+
+    def update_counts(self, store_id, changes):
+        """Applies `changes`, as returned by `get_changes()`, to the check
+        counts of a store.
+        """
+        for (name, category), (active, false_positive) in changes.items():
+            if not (active or false_positive):
+                continue
+
+            key = {'store_id': store_id, 'name': name}
+            increments = {
+                'category': category,
+                'active': F('active') + active,
+                'false_positive': F('false_positive') + false_positive,
+            }
+            if self.filter(**key).update(**increments):
+                continue
+
+            try:
+                with transaction.atomic():
+                    self.create(category=category, active=active,
+                                false_positive=false_positive, **key)
+            except IntegrityError:
+                # Someone else created the row in the meantime
+                self.filter(**key).update(**increments)
+
+    def calculate(self, stores=None):
+        """Counts quality checks of translated and fuzzy units.
+
+        :param stores: limit counting to these stores (a queryset or an
+            iterable of primary keys).
+        :return: a dictionary of `category`, `active` and `false_positive`
+            values keyed by `(store_id, name)`.
+        """
+        from .models import QualityCheck
+
+        checks = QualityCheck.objects.filter(unit__state__gt=UNTRANSLATED)
+        if stores is not None:
+            checks = checks.filter(unit__store__in=stores)
+
+        counts = {}
+        rows = (
+            checks.order_by()
+                  .values('unit__store', 'name', 'false_positive')
+                  .annotate(count=Count('id'),
+                            max_category=Max('category'))
+        )
+        for row in rows:
+            key = (row['unit__store'], row['name'])
+            values = counts.setdefault(key, {
+                'category': row['max_category'],
+                'active': 0,
+                'false_positive': 0,
+            })
+            values['category'] = max(values['category'],
+                                     row['max_category'])
+            field = 'false_positive' if row['false_positive'] else 'active'
+            values[field] = row['count']
+
+        return counts
+
+    def rebuild(self, stores=None):
+        """Recalculates check counts from the quality checks.
+
+        :param stores: limit the rebuild to these stores (a queryset or an
+            iterable of primary keys).
+        :return: the number of rows written.
+        """
+        counts = self.calculate(stores=stores)
+        rows = [
+            self.model(store_id=store_id, name=name, **values)
+            for (store_id, name), values in counts.iteritems()
+        ]
+
+        existing = self.all()
+        if stores is not None:
+            existing = existing.filter(store__in=stores)
+
+        with transaction.atomic():
+            existing.delete()
+            self.bulk_create(rows, batch_size=500)
+
+        return len(rows)
+
+    def get_drift(self, stores=None):
+        """Compares stored check counts with freshly calculated ones.
+
+        :param stores: limit the comparison to these stores (a queryset or
+            an iterable of primary keys).
+        :return: a sorted list of `(store_id, name, expected, actual)`
+            tuples, where `expected` and `actual` are dictionaries of
+            `category`, `active` and `false_positive` values, or `None` when
+            there are no checks with that name.
+        """
+        expected = self.calculate(stores=stores)
+
+        existing = self.all()
+        if stores is not None:
+            existing = existing.filter(store__in=stores)
+
+        actual = {}
+        rows = existing.values('store', 'name', 'category', 'active',
+                               'false_positive')
+        for row in rows:
+            if not (row['active'] or row['false_positive']):
+                continue
+            actual[(row.pop('store'), row.pop('name'))] = row
+
+        return [
+            key + (expected.get(key), actual.get(key))
+            for key in sorted(set(expected) | set(actual))
+            if expected.get(key) != actual.get(key)
+        ]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.18 on 2026-10-19 12:54
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+import django.db.models.deletion
+
+
+def populate_check_counts(apps, schema_editor):
+    QualityCheck = apps.get_model('pootle_store', 'QualityCheck')
+    StoreCheckCounts = apps.get_model('pootle_store', 'StoreCheckCounts')
+
+    counts = {}
+    rows = (
+        # Translated and fuzzy units
+        QualityCheck.objects.filter(unit__state__gt=0)
+                    .order_by()
+                    .values('unit__store', 'name', 'false_positive')
+                    .annotate(count=Count('id'), max_category=Max('category'))
+    )
+    for row in rows:
+        key = (row['unit__store'], row['name'])
+        if key not in counts:
+            counts[key] = StoreCheckCounts(store_id=key[0], name=key[1],
+                                           category=row['max_category'])
+        check_counts = counts[key]
+        check_counts.category = max(check_counts.category,
+                                    row['max_category'])
+        if row['false_positive']:
+            check_counts.false_positive = row['count']
+        else:
+            check_counts.active = row['count']
+
+    StoreCheckCounts.objects.bulk_create(counts.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pootle_store', '0004_add_file_mtime_integer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoreCheckCounts',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=64)),
+                ('category', models.IntegerField(default=0)),
+                ('active', models.IntegerField(default=0)),
+                ('false_positive', models.IntegerField(default=0)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='check_counts', to='pootle_store.Store')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='storecheckcounts',
+            unique_together=set([('store', 'name')]),
+        ),
+        migrations.RunPython(populate_check_counts,
+                             migrations.RunPython.noop),
+    ]
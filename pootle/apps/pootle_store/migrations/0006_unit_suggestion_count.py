@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.18 on 2026-10-19 13:13
+from __future__ import unicode_literals
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_suggestion_counts(apps, schema_editor):
+    Suggestion = apps.get_model('pootle_store', 'Suggestion')
+    Unit = apps.get_model('pootle_store', 'Unit')
+
+    units_by_count = defaultdict(list)
+    rows = (
+        Suggestion.objects.filter(state='pending')
+                  .order_by()
+                  .values_list('unit')
+                  .annotate(count=Count('id'))
+    )
+    for unit_id, count in rows:
+        units_by_count[count].append(unit_id)
+
+    for count, unit_ids in units_by_count.items():
+        for i in range(0, len(unit_ids), 500):
+            Unit.objects.filter(pk__in=unit_ids[i:i + 500]).update(
+                suggestion_count=count,
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pootle_store', '0005_storecheckcounts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unit',
+            name='suggestion_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AlterIndexTogether(
+            name='unit',
+            index_together=set([('store', 'revision'), ('store', 'index'), ('store', 'mtime'), ('store', 'suggestion_count')]),
+        ),
+        migrations.RunPython(populate_suggestion_counts,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.db.models import F
+
+
+# Value of `pootle_store.constants.UNIT_INDEX_GAP` at the time of writing
+UNIT_INDEX_GAP = 1000
+
+
+def spread_unit_indexes(apps, schema_editor):
+    Unit = apps.get_model('pootle_store', 'Unit')
+    # Obsolete units have no index
+    Unit.objects.filter(state__gt=-100).update(
+        index=F('index') * UNIT_INDEX_GAP,
+    )
+
+
+def compact_unit_indexes(apps, schema_editor):
+    Unit = apps.get_model('pootle_store', 'Unit')
+    Store = apps.get_model('pootle_store', 'Store')
+    for store_id in Store.objects.values_list('id', flat=True).iterator():
+        units = (
+            Unit.objects.filter(store_id=store_id, state__gt=-100)
+                        .order_by('index')
+                        .values_list('id', flat=True)
+        )
+        for index, unit_id in enumerate(list(units), start=1):
+            Unit.objects.filter(pk=unit_id).update(index=index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pootle_store', '0006_unit_suggestion_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(spread_unit_indexes, compact_unit_indexes),
+    ]
@@ -21,7 +21,7 @@ from translate.storage.factory import getobject
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import F
 from django.urls import reverse
 from django.utils import timezone
@@ -34,7 +34,7 @@ from pootle.core.log import (
     UNIT_ADDED, UNIT_DELETED, UNIT_OBSOLETE, UNIT_RESURRECTED,
     STORE_ADDED, STORE_DELETED, STORE_OBSOLETE,
     MUTE_QUALITYCHECK, UNMUTE_QUALITYCHECK,
-    action_log, store_log)
+    action_log, action_log_many, store_log)
 from pootle.core.mixins import CachedMethods, CachedTreeItem
 from pootle.core.models import Revision
 from pootle.core.search import SearchBroker
@@ -45,14 +45,16 @@ from pootle.core.utils import dateformat
 from pootle.core.utils.aggregate import max_column
 from pootle.core.utils.multistring import PLURAL_PLACEHOLDER, SEPARATOR
 from pootle.core.utils.timezone import datetime_min
-from pootle_misc.checks import check_names
+from pootle_misc.constants import check_names
 from pootle_misc.util import import_func
 from pootle_statistics.models import (Submission, SubmissionFields,
                                       SubmissionTypes)
 
-from .constants import FUZZY, NEW, OBSOLETE, PARSED, TRANSLATED, UNTRANSLATED
+from .constants import (FUZZY, NEW, OBSOLETE, PARSED, TRANSLATED,
+                        UNIT_INDEX_GAP, UNTRANSLATED)
 from .fields import MultiStringField, TranslationStoreField
-from .managers import StoreManager, SuggestionManager, UnitManager
+from .managers import (StoreCheckCountsManager, StoreManager,
+                       SuggestionManager, UnitManager, counts_checks)
 from .util import SuggestionStates
 from .syncer import PoStoreSyncer
 from .updater import StoreUpdater
@@ -91,7 +93,34 @@ class QualityCheck(models.Model):
     def delete_unknown_checks(cls):
         unknown_checks = QualityCheck.objects \
             .exclude(name__in=check_names.keys())
+        stores = set(
+            unknown_checks.values_list('unit__store', flat=True).distinct()
+        )
         unknown_checks.delete()
+        if stores:
+            StoreCheckCounts.objects.rebuild(stores=stores)
+
+
+class StoreCheckCounts(models.Model):
+    """Denormalized counts of the quality checks of a store's translated and
+    fuzzy units, by check name.
+    """
+
+    store = models.ForeignKey('pootle_store.Store',
+                              related_name='check_counts')
+    name = models.CharField(max_length=64)
+    category = models.IntegerField(null=False,
+                                   default=Category.NO_CATEGORY)
+    active = models.IntegerField(null=False, default=0)
+    false_positive = models.IntegerField(null=False, default=0)
+
+    objects = StoreCheckCountsManager()
+
+    class Meta(object):
+        unique_together = ('store', 'name')
+
+    def __unicode__(self):
+        return u'%s: %s' % (self.store_id, self.name)
 
 # # # # # # # # # Suggestion # # # # # # # #
 
@@ -232,6 +261,11 @@ class Unit(models.Model, base.TranslationUnit):
                                     db_index=True, related_name='reviewed')
     reviewed_on = models.DateTimeField(db_index=True, null=True)
 
+    # Number of pending suggestions, only written through
+    # `update_suggestion_count()`
+    suggestion_count = models.IntegerField(null=False, default=0,
+                                           editable=False)
+
     objects = UnitManager()
     simple_objects = models.Manager()
 
@@ -241,7 +275,8 @@ class Unit(models.Model, base.TranslationUnit):
         index_together = [
             ["store", "index"],
             ["store", "revision"],
-            ["store", "mtime"]]
+            ["store", "mtime"],
+            ["store", "suggestion_count"]]
 
     # # # # # # # # # # # # # #  Properties # # # # # # # # # # # # # # # # # #
 
@@ -298,13 +333,17 @@ class Unit(models.Model, base.TranslationUnit):
         self._comment_updated = False
         self._auto_translated = False
         self._encoding = 'UTF-8'
+        # State as last saved, which determines whether the unit's checks
+        # are accounted in its store's check counts. Deferred states are
+        # left unknown
+        self._saved_state = self.__dict__.get('state')
 
     # should be called to flag the store cache for a deletion
     # before the unit will be deleted
     def flag_store_before_going_away(self):
         self.store.mark_dirty(CachedMethods.WORDCOUNT_STATS)
 
-        if self.suggestion_set.pending().count() > 0:
+        if self.suggestion_count > 0:
             self.store.mark_dirty(CachedMethods.SUGGESTIONS)
 
         if self.get_qualitychecks().filter(false_positive=False):
@@ -327,17 +366,22 @@ class Unit(models.Model, base.TranslationUnit):
 
         self.flag_store_before_going_away()
 
-        super(Unit, self).delete(*args, **kwargs)
-
-    def save(self, *args, **kwargs):
-        created = self.id is None
+        with transaction.atomic():
+            if counts_checks(self._saved_state):
+                checks = self.qualitycheck_set.values(
+                    'name', 'category', 'false_positive')
+                self.update_check_counts(
+                    StoreCheckCounts.objects.get_changes(checks, sign=-1))
+            super(Unit, self).delete(*args, **kwargs)
 
-        if not hasattr(self, '_log_user'):
-            User = get_user_model()
-            self._log_user = User.objects.get_system_user()
-        user = kwargs.pop("user", self._log_user)
+    def prepare_save(self, revision=None):
+        """Updates the fields derived from the changes flagged on the unit
+        before saving it, and marks the affected stats of its store as dirty.
 
-        if created:
+        :param revision: revision number to set, as given when updating the
+            unit from a file.
+        """
+        if self.id is None:
             self._save_action = UNIT_ADDED
             self.store.mark_dirty(CachedMethods.WORDCOUNT_STATS,
                                   CachedMethods.LAST_UPDATED)
@@ -375,7 +419,6 @@ class Unit(models.Model, base.TranslationUnit):
         # a new value (the same for all units during its store updated)
         # since that change doesn't require further sync but note that
         # auto_translated units require further sync
-        revision = kwargs.pop('revision', None)
         if revision is not None and not self._auto_translated:
             self.revision = revision
         elif (self._target_updated or
@@ -383,12 +426,6 @@ class Unit(models.Model, base.TranslationUnit):
               self._comment_updated):
             self.revision = Revision.incr()
 
-        if not created and hasattr(self, '_save_action'):
-            action_log(user=self._log_user, action=self._save_action,
-                       lang=self.store.translation_project.language.code,
-                       unit=self.id, translation=self.target_f,
-                       path=self.store.pootle_path)
-
         if (self._state_updated and self.state == TRANSLATED and
             self._save_action == TRANSLATION_CHANGED and
             not self._target_updated):
@@ -408,8 +445,39 @@ class Unit(models.Model, base.TranslationUnit):
             self.submitted_by = None
             self.submitted_on = None
 
+    def save(self, *args, **kwargs):
+        created = self.id is None
+
+        if not hasattr(self, '_log_user'):
+            User = get_user_model()
+            self._log_user = User.objects.get_system_user()
+        user = kwargs.pop("user", self._log_user)
+
+        self.prepare_save(revision=kwargs.pop('revision', None))
+
+        if not created and hasattr(self, '_save_action'):
+            action_log(user=self._log_user, action=self._save_action,
+                       lang=self.store.translation_project.language.code,
+                       unit=self.id, translation=self.target_f,
+                       path=self.store.pootle_path)
+
+        if not created and 'update_fields' not in kwargs:
+            # Don't overwrite a suggestion count which changed since the unit
+            # was loaded
+            deferred_fields = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not (field.primary_key or
+                        field.name == 'suggestion_count' or
+                        field.attname in deferred_fields)
+            ]
+
         super(Unit, self).save(*args, **kwargs)
 
+        if not created:
+            self.update_state_check_counts()
+        self._saved_state = self.state
+
         if hasattr(self, '_save_action') and self._save_action == UNIT_ADDED:
             # just added FUZZY unit
             if self.state == FUZZY:
@@ -471,8 +539,9 @@ class Unit(models.Model, base.TranslationUnit):
             return True
 
         from pootle_project.models import Project
-        user_projects = Project.accessible_by_user(user)
-        return self.store.translation_project.project.code in user_projects
+        return Project.is_id_accessible_by(
+            self.store.translation_project.project_id, user,
+        )
 
     def add_initial_submission(self, user=None):
         if self.istranslated() or self.isfuzzy():
@@ -654,17 +723,19 @@ class Unit(models.Model, base.TranslationUnit):
         checks = self.qualitycheck_set.all()
 
         existing = {}
-        for check in checks.values('name', 'false_positive', 'id'):
-            existing[check['name']] = {
-                'false_positive': check['false_positive'],
-                'id': check['id'],
-            }
+        for check in checks.values('name', 'category', 'false_positive',
+                                   'id'):
+            existing[check['name']] = check
 
         # no checks if unit is untranslated
         if not self.target:
             if existing:
                 self.store.mark_dirty(CachedMethods.CHECKS)
-                self.qualitycheck_set.all().delete()
+                with transaction.atomic():
+                    self.qualitycheck_set.all().delete()
+                    self.update_check_counts(
+                        StoreCheckCounts.objects.get_changes(
+                            existing.values(), sign=-1))
                 return True
 
             return False
@@ -672,12 +743,14 @@ class Unit(models.Model, base.TranslationUnit):
         checker = self.store.translation_project.checker
         qc_failures = checker.run_filters(self, categorised=True)
         checks_to_add = []
+        unmuted = []
         for name in qc_failures.iterkeys():
             if name in existing:
                 # keep false-positive checks if check is active
                 if (existing[name]['false_positive'] and
                         not keep_false_positives):
                     unmute_list.append(name)
+                    unmuted.append(existing[name])
                 del existing[name]
                 continue
 
@@ -692,20 +765,59 @@ class Unit(models.Model, base.TranslationUnit):
             self.store.mark_dirty(CachedMethods.CHECKS)
             result = True
 
-        if checks_to_add:
-            self.qualitycheck_set.bulk_create(checks_to_add)
+        with transaction.atomic():
+            if checks_to_add:
+                self.qualitycheck_set.bulk_create(checks_to_add)
 
-        if not keep_false_positives and unmute_list:
-            self.qualitycheck_set.filter(name__in=unmute_list) \
-                                 .update(false_positive=False)
+            if not keep_false_positives and unmute_list:
+                self.qualitycheck_set.filter(name__in=unmute_list) \
+                                     .update(false_positive=False)
 
-        # delete inactive checks
-        if existing:
-            self.store.mark_dirty(CachedMethods.CHECKS)
-            self.qualitycheck_set.filter(name__in=existing).delete()
+            # delete inactive checks
+            if existing:
+                self.store.mark_dirty(CachedMethods.CHECKS)
+                self.qualitycheck_set.filter(name__in=existing).delete()
+
+            changes = StoreCheckCounts.objects.get_changes(
+                existing.values(), sign=-1)
+            for check in checks_to_add:
+                changes[(check.name, check.category)][0] += 1
+            for check in unmuted:
+                key = (check['name'], check['category'])
+                changes[key][0] += 1
+                changes[key][1] -= 1
+            self.update_check_counts(changes)
 
         return result or bool(unmute_list) or bool(existing)
 
+    def update_check_counts(self, changes):
+        """Applies `changes` to the check counts of the unit's store, unless
+        the unit's saved state leaves its checks out of them.
+
+        :param changes: check count changes, as returned by
+            `StoreCheckCounts.objects.get_changes()`.
+        """
+        if counts_checks(self._saved_state):
+            StoreCheckCounts.objects.update_counts(self.store_id, changes)
+
+    def update_state_check_counts(self):
+        """Accounts the unit's checks in or out of its store's check counts
+        when its state moves it in or out of them.
+        """
+        if self._saved_state is None:
+            return
+
+        was_counted = counts_checks(self._saved_state)
+        if was_counted == counts_checks(self.state):
+            return
+
+        manager = StoreCheckCounts.objects
+        checks = self.qualitycheck_set.values('name', 'category',
+                                              'false_positive')
+        manager.update_counts(
+            self.store_id,
+            manager.get_changes(checks, sign=-1 if was_counted else 1))
+
     def get_qualitychecks(self):
         return self.qualitycheck_set.all()
 
@@ -738,7 +850,8 @@ class Unit(models.Model, base.TranslationUnit):
 
 # # # # # # # # # # # TranslationUnit # # # # # # # # # # # # # #
 
-    def update_tmserver(self):
+    def get_tmserver_data(self):
+        """Returns the TM server document of the unit."""
         obj = {
             'id': self.id,
             # 'revision' must be an integer for statistical queries to work
@@ -764,8 +877,11 @@ class Unit(models.Model, base.TranslationUnit):
                 'email_md5': md5(self.submitted_by.email).hexdigest(),
             })
 
+        return obj
+
+    def update_tmserver(self):
         get_tm_broker().update(self.store.translation_project.language.code,
-                               obj)
+                               self.get_tmserver_data())
 
     def get_tm_suggestions(self):
         return get_tm_broker().search(self)
@@ -901,6 +1017,13 @@ class Unit(models.Model, base.TranslationUnit):
     def get_suggestions(self):
         return self.suggestion_set.pending().select_related('user').all()
 
+    def update_suggestion_count(self, delta):
+        """Adds `delta` to the unit's count of pending suggestions."""
+        Unit.simple_objects.filter(pk=self.pk).update(
+            suggestion_count=F('suggestion_count') + delta,
+        )
+        self.suggestion_count += delta
+
     def add_suggestion(self, translation, user=None, touch=True,
                        similarity=None, mt_similarity=None):
         """Adds a new suggestion to the unit.
@@ -943,7 +1066,9 @@ class Unit(models.Model, base.TranslationUnit):
                 creation_time=timezone.now(),
             )
             suggestion.target = translation
-            suggestion.save()
+            with transaction.atomic():
+                suggestion.save()
+                self.update_suggestion_count(1)
 
             sub = Submission(
                 creation_time=suggestion.creation_time,
@@ -983,10 +1108,14 @@ class Unit(models.Model, base.TranslationUnit):
             suggestion_user = User.objects.get_nobody_user()
 
         current_time = timezone.now()
+        was_pending = suggestion.state == SuggestionStates.PENDING
         suggestion.state = SuggestionStates.ACCEPTED
         suggestion.reviewer = reviewer
         suggestion.review_time = current_time
-        suggestion.save()
+        with transaction.atomic():
+            suggestion.save()
+            if was_pending:
+                self.update_suggestion_count(-1)
 
         create_subs = OrderedDict()
         if old_state != self.state:
@@ -1031,10 +1160,14 @@ class Unit(models.Model, base.TranslationUnit):
         self.save()
 
     def reject_suggestion(self, suggestion, translation_project, reviewer):
+        was_pending = suggestion.state == SuggestionStates.PENDING
         suggestion.state = SuggestionStates.REJECTED
         suggestion.review_time = timezone.now()
         suggestion.reviewer = reviewer
-        suggestion.save()
+        with transaction.atomic():
+            suggestion.save()
+            if was_pending:
+                self.update_suggestion_count(-1)
 
         sub = Submission(
             creation_time=suggestion.review_time,
@@ -1064,7 +1197,12 @@ class Unit(models.Model, base.TranslationUnit):
             return
 
         check.false_positive = false_positive
-        check.save()
+        with transaction.atomic():
+            check.save()
+            sign = 1 if false_positive else -1
+            self.update_check_counts({
+                (check.name, check.category): [-sign, sign],
+            })
 
         self.store.mark_dirty(CachedMethods.CHECKS,
                               CachedMethods.LAST_ACTION)
@@ -1217,10 +1355,13 @@ class Store(models.Model, CachedTreeItem, base.TranslationStore):
         store_log(user='system', action=STORE_DELETED,
                   path=self.pootle_path, store=self.id)
 
-        lang = self.translation_project.language.code
-        for unit in self.unit_set.iterator():
-            action_log(user='system', action=UNIT_DELETED, lang=lang,
-                       unit=unit.id, translation='', path=self.pootle_path)
+        action_log_many(
+            ({'unit': unit_id}
+             for unit_id in self.unit_set.values_list('id', flat=True)),
+            user='system', action=UNIT_DELETED,
+            lang=self.translation_project.language.code,
+            translation='', path=self.pootle_path,
+        )
 
         super(Store, self).delete(*args, **kwargs)
 
@@ -1233,13 +1374,17 @@ class Store(models.Model, CachedTreeItem, base.TranslationStore):
         store_log(user='system', action=STORE_OBSOLETE,
                   path=self.pootle_path, store=self.id)
 
-        lang = self.translation_project.language.code
         unit_query = self.unit_set.filter(state__gt=OBSOLETE)
-        unit_ids = unit_query.values_list('id', flat=True)
-        for unit_id in unit_ids:
-            action_log(user='system', action=UNIT_OBSOLETE, lang=lang,
-                       unit=unit_id, translation='', path=self.pootle_path)
-        unit_query.update(state=OBSOLETE, index=0)
+        action_log_many(
+            ({'unit': unit_id}
+             for unit_id in unit_query.values_list('id', flat=True)),
+            user='system', action=UNIT_OBSOLETE,
+            lang=self.translation_project.language.code,
+            translation='', path=self.pootle_path,
+        )
+        with transaction.atomic():
+            unit_query.update(state=OBSOLETE, index=0)
+            self.check_counts.all().delete()
         self.obsolete = True
         self.save()
         self.clear_cache()
@@ -1397,7 +1542,7 @@ class Store(models.Model, CachedTreeItem, base.TranslationStore):
 
     def addunit(self, unit, index=None, user=None, update_revision=None):
         if index is None:
-            index = self.max_index() + 1
+            index = max(self.max_index(), 0) + UNIT_INDEX_GAP
 
         newunit = self.UnitClass(store=self, index=index)
         newunit.update(unit, user=user)
@@ -1480,27 +1625,27 @@ class Store(models.Model, CachedTreeItem, base.TranslationStore):
 
     def _get_checks(self):
         try:
-            queryset = QualityCheck.objects.filter(
-                unit__store=self, unit__state__gt=UNTRANSLATED,
-                false_positive=False)
-
-            queryset = queryset.values('unit', 'name', 'category') \
-                               .order_by('unit', '-category')
-
-            saved_unit = None
             result = {
                 'unit_critical_error_count': 0,
                 'checks': {},
             }
-            for item in queryset:
-                if item['unit'] != saved_unit or saved_unit is None:
-                    saved_unit = item['unit']
-                    if item['category'] == Category.CRITICAL:
-                        result['unit_critical_error_count'] += 1
-                if item['name'] in result['checks']:
-                    result['checks'][item['name']] += 1
-                else:
-                    result['checks'][item['name']] = 1
+            has_critical = False
+            counts = self.check_counts.filter(active__gt=0) \
+                                      .values_list('name', 'category',
+                                                   'active')
+            for name, category, active in counts:
+                result['checks'][name] = active
+                has_critical |= category == Category.CRITICAL
+
+            # Units with several critical checks are counted once, so they
+            # can't be derived from the counts
+            if has_critical:
+                result['unit_critical_error_count'] = (
+                    QualityCheck.objects.filter(
+                        unit__store=self, unit__state__gt=UNTRANSLATED,
+                        false_positive=False, category=Category.CRITICAL,
+                    ).values('unit').distinct().count()
+                )
 
             return result
         except Exception as e:
@@ -1540,11 +1685,10 @@ class Store(models.Model, CachedTreeItem, base.TranslationStore):
         return sub.get_submission_info()
 
     def _get_suggestion_count(self):
-        """Check if any unit in the store has suggestions"""
-        return Suggestion.objects.filter(
-            unit__store=self, unit__state__gt=OBSOLETE,
-            state=SuggestionStates.PENDING
-        ).count()
+        """Count pending suggestions of the store's live units"""
+        return self.unit_set.live().filter(
+            suggestion_count__gt=0,
+        ).aggregate(count=models.Sum('suggestion_count'))['count'] or 0
 
     def all_pootle_paths(self):
         """Get cache_key for all parents (to the Language and Project)
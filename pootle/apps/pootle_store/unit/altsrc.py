@@ -13,6 +13,16 @@ from .proxy import UnitProxy
 
 
 class AltSrcUnitProxy(UnitProxy):
+
+    proxied_fields = (
+        "id",
+        "source_f",
+        "target_f",
+        "store__translation_project__language__code",
+        "store__translation_project__language__fullname",
+        "store__translation_project__language__nplurals",
+    )
+
     @property
     def language_code(self):
         return self.unit["store__translation_project__language__code"]
@@ -45,14 +55,7 @@ class AltSrcUnitProxy(UnitProxy):
 
 
 class AltSrcUnits(object):
-    fields = {
-        "id",
-        "source_f",
-        "target_f",
-        "store__translation_project__language__code",
-        "store__translation_project__language__fullname",
-        "store__translation_project__language__nplurals",
-    }
+    fields = AltSrcUnitProxy.proxied_fields
 
     def __init__(self, qs):
         self.qs = qs
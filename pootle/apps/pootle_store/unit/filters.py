@@ -82,13 +82,13 @@ class UnitContributionFilter(BaseUnitFilter):
         self.user = kwargs.get("user")
 
     def filter_suggestions(self):
-        return self.qs.filter(
-            suggestion__state=SuggestionStates.PENDING).distinct()
+        return self.qs.filter(suggestion_count__gt=0)
 
     def filter_user_suggestions(self):
         if not self.user:
             return self.qs.none()
         return self.qs.filter(
+            suggestion_count__gt=0,
             suggestion__user=self.user,
             suggestion__state=SuggestionStates.PENDING).distinct()
 
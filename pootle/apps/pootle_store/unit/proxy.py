@@ -6,12 +6,17 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+from pootle.core.proxy import ValuesProxy
 from pootle_store.fields import to_python as multistring_to_python
 
 
-class UnitProxy(object):
+class UnitProxy(ValuesProxy):
     """Wraps a values Unit dictionary"""
 
+    __slots__ = ('unit', )
+
+    values_attr = 'unit'
+
     @property
     def source(self):
         return multistring_to_python(self.unit["source_f"])
@@ -23,12 +28,6 @@ class UnitProxy(object):
     def __init__(self, unit):
         self.unit = unit
 
-    def __getattr__(self, k):
-        try:
-            return self.__dict__["unit"][k] or ""
-        except KeyError:
-            return self.__getattribute__(k)
-
     def getlocations(self):
         if self.locations is None:
             return []
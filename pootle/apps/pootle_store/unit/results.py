@@ -17,6 +17,18 @@ from pootle_store.unit.proxy import UnitProxy
 
 class UnitResult(UnitProxy):
 
+    proxied_fields = (
+        'id',
+        'source_f',
+        'target_f',
+        'state',
+        'store__translation_project__project__source_language__code',
+        'store__translation_project__language__code',
+        'store__translation_project__language__fullname',
+        'store__translation_project__project__fullname',
+        'store__pootle_path',
+    )
+
     @property
     def nplurals(self):
         return self.unit[
@@ -82,17 +94,7 @@ class UnitResult(UnitProxy):
 
 class ViewRowResults(object):
 
-    select_fields = [
-        'id',
-        'source_f',
-        'target_f',
-        'state',
-        'store__translation_project__project__source_language__code',
-        'store__translation_project__language__code',
-        'store__translation_project__language__fullname',
-        'store__translation_project__project__fullname',
-        'store__pootle_path',
-    ]
+    select_fields = UnitResult.proxied_fields
 
     def __init__(self, units_qs, header_uids=None):
         self.units_qs = units_qs
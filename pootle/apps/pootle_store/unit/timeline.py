@@ -18,7 +18,7 @@ from django.utils.safestring import mark_safe
 from accounts.proxy import DisplayUser
 from pootle.i18n.gettext import ugettext as _
 from pootle_comment import get_model as get_comment_model
-from pootle_misc.checks import check_names
+from pootle_misc.constants import check_names
 from pootle_statistics.models import (
     Submission, SubmissionFields, SubmissionTypes)
 from pootle_statistics.proxy import SubmissionProxy
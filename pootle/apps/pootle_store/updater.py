@@ -272,12 +272,17 @@ class StoreUpdater(object):
             diff = StoreDiff(self.target_store, store, store_revision).diff()
             if diff is not None:
                 update_revision = Revision.incr()
-                changes, unsynced_uids = self.update_from_diff(
-                    store,
-                    store_revision,
-                    diff, update_revision,
-                    user, submission_type,
-                )
+                # Most units take `update_revision`: the few needing a
+                # revision of their own draw it from blocks which grow as
+                # they are used up
+                max_block_size = len(diff["add"]) + len(diff["update"][0])
+                with Revision.block(1, max_size=max_block_size):
+                    changes, unsynced_uids = self.update_from_diff(
+                        store,
+                        store_revision,
+                        diff, update_revision,
+                        user, submission_type,
+                    )
         finally:
             if old_state < PARSED:
                 self.target_store.state = PARSED
@@ -19,7 +19,7 @@ from django.template import loader
 from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.lru_cache import lru_cache
-from django.utils.translation import to_locale
+from django.utils.translation import get_language, to_locale
 from django.utils.translation.trans_real import parse_accept_lang_header
 from django.views.decorators.http import require_http_methods
 
@@ -27,9 +27,11 @@ from pootle.core.decorators import (get_path_obj, get_resource,
                                     permission_required)
 from pootle.core.exceptions import Http400
 from pootle.core.http import JsonResponse, JsonResponseBadRequest
+from pootle.core.mixins.treeitem import get_content_revision
 from pootle.core.utils import dateformat
 from pootle.core.views import (BaseBrowseDataJSON, BasePathDispatcherView,
                                PootleJSON)
+from pootle.core.views.mixins import ConditionalGetMixin
 from pootle.i18n.gettext import ugettext as _
 from pootle_app.models.directory import Directory
 from pootle_app.models.permissions import (check_permission,
@@ -196,14 +198,19 @@ def get_context_units(request, unit):
     units_qs = request.store.units
     limit = 5
 
-    units_before = []
-    if unit.index > 0:
-        limit_before = min(unit.index - 1, limit)
+    # Indexes are not contiguous: look up where the window starts
+    indexes_before = list(
+        units_qs.filter(index__lt=unit.index)
+                .order_by('-index')
+                .values_list('index', flat=True)[:limit]
+    )
+    units_before = units_qs.none()
+    if indexes_before:
         units_before = units_qs.filter(
-            index__gt=unit.index - 1 - limit
-        ).order_by('index')[:limit_before]
+            index__gte=indexes_before[-1],
+            index__lt=unit.index,
+        )
 
-    # FIXME: can we avoid this query if length is known?
     units_after = units_qs.filter(
         index__gt=unit.index,
     )[:limit]
@@ -315,7 +322,7 @@ class PootleUnitJSON(PootleJSON):
         return super(PootleUnitJSON, self).get_object()
 
 
-class UnitTimelineJSON(PootleUnitJSON):
+class UnitTimelineJSON(ConditionalGetMixin, PootleUnitJSON):
 
     model = Unit
     pk_url_kwarg = "uid"
@@ -339,6 +346,19 @@ class UnitTimelineJSON(PootleUnitJSON):
     def timeline(self):
         return Timeline(self.object)
 
+    def get_etag(self):
+        """Returns an entity tag which changes along with the unit and
+        with the suggestions and checks of its store.
+        """
+        revision = get_content_revision(self.store.pootle_path)
+        if revision is None:
+            return None
+
+        return u'%s-%s-%s-%s-%s' % (revision, self.object.id,
+                                    self.object.revision,
+                                    self.object.mtime.isoformat(),
+                                    get_language())
+
     def get_context_data(self, *args, **kwargs):
         return dict(
             entries_group=self.timeline.grouped_entries,
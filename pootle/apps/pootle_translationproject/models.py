@@ -24,7 +24,7 @@ from pootle_app.project_tree import (does_not_exist,
                                      get_translation_project_dir,
                                      translation_project_dir_exists)
 from pootle_language.models import Language
-from pootle_misc.checks import excluded_filters
+from pootle_misc.constants import excluded_filters
 from pootle_project.models import Project
 from pootle_store.constants import PARSED
 from pootle_store.models import Store
@@ -129,7 +129,7 @@ class TranslationProjectManager(models.Manager):
 
         return qs.filter(
             project__disabled=False,
-            project__code__in=Project.accessible_by_user(user))
+            **Project.get_visibility_filter(user, prefix='project__'))
 
     def get_for_user(self, user, project_code, language_code,
                      select_related=None):
@@ -285,10 +285,7 @@ class TranslationProject(models.Model, CachedTreeItem):
         """Returns `True` if the current translation project is accessible
         by `user`.
         """
-        if user.is_superuser:
-            return True
-
-        return self.project.code in Project.accessible_by_user(user)
+        return Project.is_id_accessible_by(self.project_id, user)
 
     def update_from_disk(self, force=False, overwrite=False):
         """Update all stores to reflect state on disk.
@@ -302,7 +299,7 @@ class TranslationProject(models.Model, CachedTreeItem):
 
         logging.info(u"Scanning for new files in %s", self)
         # Create new, make obsolete in-DB stores to reflect state on disk
-        self.scan_files()
+        self.scan_files(force=force)
 
         stores = self.stores.live().select_related('parent').exclude(file='')
         # Update store content from disk store
@@ -341,21 +338,15 @@ class TranslationProject(models.Model, CachedTreeItem):
         """
         return not does_not_exist(self.abs_real_path)
 
-    def scan_files(self):
+    def scan_files(self, force=False):
         """Scans the file system and returns a list of translation files.
-        """
-        from pootle_app.project_tree import add_files
 
-        all_files = []
-        new_files = []
-
-        all_files, new_files, __ = add_files(
-            self,
-            self.real_path,
-            self.directory,
-        )
+        :param force: if `True`, directories are listed even if they didn't
+            change since the last scan.
+        """
+        from pootle_app.project_tree import ProjectTreeScanner
 
-        return all_files, new_files
+        return ProjectTreeScanner(self, force=force).scan()
 
     ###########################################################################
 
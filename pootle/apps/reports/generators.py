@@ -9,7 +9,7 @@
 import codecs
 import logging
 import os
-from subprocess import call
+from subprocess import PIPE, Popen, call
 
 from django.conf import settings
 from django.template.loader import render_to_string
@@ -18,6 +18,10 @@ from django.template.loader import render_to_string
 logger = logging.getLogger(__name__)
 
 
+HTML2PDF_JS = os.path.join(os.path.abspath(os.path.dirname(__file__)),
+                           'html2pdf.js')
+
+
 class HTMLGenerator(object):
     extension = 'html'
     media_type = 'text/html'
@@ -56,11 +60,13 @@ class PDFGenerator(object):
             return False
         return True
 
-    def generate(self, filepath, context, **kwargs):
+    def generate(self, filepath, context, renderer=None, **kwargs):
         """Generates the PDF invoice and writes it to disk.
 
         :param filepath: absolute path where the invoice will be generated.
         :param context: dictionary with rendering context data.
+        :param renderer: optional `PDFRenderer` to render the PDF with.
+            Otherwise a new PhantomJS process is spawned for this invoice.
         """
         html_filepath = filepath.replace('.pdf', '.html')
         if not os.path.exists(html_filepath):
@@ -68,12 +74,74 @@ class PDFGenerator(object):
                         'PDF will not be generated.', html_filepath)
             return False
 
-        html2pdf_js = os.path.join(os.path.abspath(os.path.dirname(__file__)),
-                                   'html2pdf.js')
+        if renderer is not None:
+            return renderer.render(html_filepath, filepath)
+
         exit_code = call([settings.ZING_INVOICES_PHANTOMJS_BIN,
-                          html2pdf_js, html_filepath, filepath])
+                          HTML2PDF_JS, html_filepath, filepath])
         if exit_code:
             logger.debug('Script exited with code: %s', exit_code)
             return False
 
         return True
+
+
+class PDFRenderer(object):
+    """Long-lived PhantomJS process rendering HTML files into PDFs.
+
+    Files are passed to the process one at a time, so its startup cost is
+    only paid once for all the invoices rendered with it.
+    """
+
+    def __init__(self):
+        self.process = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        self.process = Popen(
+            [settings.ZING_INVOICES_PHANTOMJS_BIN, HTML2PDF_JS],
+            stdin=PIPE, stdout=PIPE, close_fds=True,
+        )
+
+    def stop(self):
+        if self.process is None:
+            return
+
+        try:
+            self.process.stdin.close()
+        except IOError:
+            pass
+        self.process.wait()
+        self.process = None
+
+    def render(self, html_filepath, filepath):
+        """Renders `html_filepath` as a PDF file at `filepath`.
+
+        The PhantomJS process is (re)started if it isn't running.
+
+        :return: `True` if the PDF was rendered, `False` otherwise.
+        """
+        if self.process is None or self.process.poll() is not None:
+            self.start()
+
+        line = u'%s\t%s\n' % (html_filepath, filepath)
+        try:
+            self.process.stdin.write(line.encode('utf-8'))
+            self.process.stdin.flush()
+            result = self.process.stdout.readline().strip()
+        except IOError:
+            logger.exception('Lost connection to the PDF renderer')
+            self.stop()
+            return False
+
+        if result != 'OK':
+            logger.debug('Renderer failed to render %s: %r', filepath, result)
+            return False
+
+        return True
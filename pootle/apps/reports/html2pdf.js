@@ -6,23 +6,67 @@
  * AUTHORS file for copyright and authorship information.
  */
 
+/*
+ * Usage:
+ *
+ *   phantomjs html2pdf.js <infile> <outfile>
+ *
+ * When no files are given, `<infile>\t<outfile>` lines are read from the
+ * standard input, and `OK` or `ERROR` is written to the standard output for
+ * each of them, until the standard input is closed.
+ */
+
 var system = require('system')
-var page = require('webpage').create();
-var fs = require('fs');
+var webpage = require('webpage');
+
 
-var infile = system.args[1];
-var outfile = system.args[2];
+function render(infile, outfile, callback) {
+  var page = webpage.create();
 
-page.viewportSize = { width: 600, height: 600 };
-page.paperSize = { format: 'Letter', orientation: 'portrait', margin: '1cm' };
-page.zoomFactor = 1.3;
+  page.viewportSize = { width: 600, height: 600 };
+  page.paperSize = { format: 'Letter', orientation: 'portrait', margin: '1cm' };
+  page.zoomFactor = 1.3;
 
-page.open(infile, function (status) {
-  if (status !== 'success') {
-    console.log('Failed to load the file');
-    phantom.exit(1);
+  page.open(infile, function (status) {
+    if (status !== 'success') {
+      page.close();
+      callback(false);
+      return;
+    }
+
+    page.render(outfile);
+    page.close();
+    callback(true);
+  });
+}
+
+
+function serve() {
+  var line = system.stdin.readLine();
+  if (!line) {
+    phantom.exit();
+    return;
   }
 
-  page.render(outfile);
-  phantom.exit();
-});
+  var files = line.split('\t');
+  render(files[0], files[1], function (success) {
+    system.stdout.writeLine(success ? 'OK' : 'ERROR');
+    system.stdout.flush();
+    setTimeout(serve, 0);
+  });
+}
+
+
+if (system.args.length > 2) {
+  render(system.args[1], system.args[2], function (success) {
+    if (!success) {
+      console.log('Failed to load the file');
+      phantom.exit(1);
+      return;
+    }
+
+    phantom.exit();
+  });
+} else {
+  serve();
+}
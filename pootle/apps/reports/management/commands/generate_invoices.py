@@ -9,8 +9,9 @@
 
 
 import os
-
+from contextlib import contextmanager
 from datetime import datetime
+from multiprocessing import Pool
 
 # This must be run before importing Django.
 os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
@@ -18,10 +19,13 @@ os.environ['DJANGO_SETTINGS_MODULE'] = 'pootle.settings'
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import get_connection
 from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
 
 from pootle.core.utils.docs import get_docs_url
 
+from ...generators import PDFGenerator, PDFRenderer
 from ...models import Invoice
 from ...reporters import JSONReporter
 
@@ -29,6 +33,36 @@ from ...reporters import JSONReporter
 User = get_user_model()
 
 
+@contextmanager
+def pdf_renderer():
+    """Provides a long-lived PDF renderer if PDF generation is configured,
+    `None` otherwise.
+    """
+    if not PDFGenerator.is_configured():
+        yield None
+        return
+
+    with PDFRenderer() as renderer:
+        yield renderer
+
+
+# PDF renderer owned by each worker process
+_worker_renderer = None
+
+
+def _init_worker():
+    global _worker_renderer
+    # The renderer is started on first use. PhantomJS exits once its standard
+    # input is closed, which happens when the pool terminates the worker.
+    if PDFGenerator.is_configured():
+        _worker_renderer = PDFRenderer()
+
+
+def _generate_invoice(invoice):
+    invoice.generate(renderer=_worker_renderer)
+    return invoice
+
+
 class Command(BaseCommand):
     help = "Generate invoices and send them via e-mail."
 
@@ -76,6 +110,14 @@ class Command(BaseCommand):
             default=[],
         )
 
+        parser.add_argument(
+            '--jobs',
+            type=int,
+            dest='jobs',
+            help='Number of invoices to generate in parallel',
+            default=1,
+        )
+
         report_group = parser.add_argument_group(
             'Reporting',
             'Options for invoice-related reports.',
@@ -90,6 +132,9 @@ class Command(BaseCommand):
 
     def handle(self, **options):
         send_emails = options['send_emails']
+        if options['jobs'] < 1:
+            raise CommandError('--jobs must be a positive integer')
+
         month = options['month']
         if month is not None:
             try:
@@ -128,34 +173,76 @@ class Command(BaseCommand):
                 except User.DoesNotExist:
                     raise ImproperlyConfigured('User %s not found.' % username)
 
-        reporter = JSONReporter()
+        invoices = []
         for username, user_conf in users:
             subcontractors = [
                 user_dict[subcontractor_name]
                 for subcontractor_name in user_conf.get('subcontractors', ())
             ]
-            invoice = Invoice(user_dict[username], user_conf, month=month,
-                              subcontractors=subcontractors,
-                              add_correction=month is None)
-            reporter.add(invoice)
+            invoices.append(
+                Invoice(user_dict[username], user_conf, month=month,
+                        subcontractors=subcontractors,
+                        add_correction=month is None)
+            )
 
-            fullname = user_conf['name']
+        reporter = JSONReporter()
+        mail_connection = None
+        if send_emails:
+            # A single connection to the mail server is used for all emails
+            mail_connection = get_connection()
+            mail_connection.open()
 
-            self.stdout.write('Generating invoices for %s...' % fullname)
-            invoice.generate()
+        try:
+            for invoice in self.generate_invoices(invoices, options['jobs']):
+                reporter.add(invoice)
 
-            if not send_emails:
-                continue
+                fullname = invoice.conf['name']
+                self.stdout.write('Generated invoices for %s.' % fullname)
 
-            self.stdout.write('Sending email to %s...' % fullname)
-            # FIXME: reuse connections to the mail server
-            # (http://stackoverflow.com/a/10215091/783019)
-            if invoice.send_by_email(override_to=options['to_email_list'],
-                                     override_bcc=options['bcc_email_list']) > 0:
-                self.stdout.write('Email sent')
-            else:
-                self.stdout.write('ERROR: sending failed')
+                if not send_emails:
+                    continue
+
+                self.stdout.write('Sending email to %s...' % fullname)
+                if invoice.send_by_email(
+                    override_to=options['to_email_list'],
+                    override_bcc=options['bcc_email_list'],
+                    connection=mail_connection,
+                ) > 0:
+                    self.stdout.write('Email sent')
+                else:
+                    self.stdout.write('ERROR: sending failed')
+        finally:
+            if mail_connection is not None:
+                mail_connection.close()
 
         if options['generate_report']:
             reporter.generate()
             self.stdout.write('JSON report written to %s.' % reporter.filepath)
+
+    def generate_invoices(self, invoices, jobs):
+        """Generates `invoices`, using `jobs` worker processes.
+
+        :return: a generator of invoices, in the same order as given, as
+            their generation is completed.
+        """
+        if jobs == 1 or len(invoices) < 2:
+            with pdf_renderer() as renderer:
+                for invoice in invoices:
+                    invoice.generate(renderer=renderer)
+                    yield invoice
+            return
+
+        # Worker processes must not share the parent's DB connections
+        connections.close_all()
+        pool = Pool(processes=min(jobs, len(invoices)),
+                    initializer=_init_worker)
+        try:
+            for invoice in pool.imap(_generate_invoice, invoices):
+                yield invoice
+        except BaseException:
+            pool.terminate()
+            raise
+        else:
+            pool.close()
+        finally:
+            pool.join()
@@ -12,14 +12,14 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Sum
 from django.utils import timezone
 from django.utils.lru_cache import lru_cache
 
 from pootle_misc.util import get_date_interval
-from pootle_statistics.models import ScoreLog
+from pootle_statistics.models import DailyContribution
 
 from ..generators import HTMLGenerator, PDFGenerator
-from ..utils import get_grouped_word_stats
 from .paidtask import PaidTask, PaidTaskTypes
 from .payment_email import (AccountingPaymentEmail, UserNoPaymentEmail,
                             UserPaymentEmail)
@@ -67,9 +67,9 @@ class Invoice(object):
 
         # Holds a list of tuples with generated file paths and their media types
         self.files = []
-        self.generators = (
+        self.generators = [
             Mod() for Mod in GENERATOR_MODULES if Mod.is_configured()
-        )
+        ]
 
     def __repr__(self):
         return u'<Invoice %s:%s>' % (self.user.username, self.month_string)
@@ -126,9 +126,11 @@ class Invoice(object):
             ``hourly_rate`` is the rate for hourly work that can be added as
             PaidTask.
         """
-        scores = ScoreLog.objects.for_user_in_range(self.user, self.month_start,
-                                                    self.month_end)
-        rates = scores.values('rate', 'review_rate').distinct()
+        contributions = DailyContribution.objects.for_user_in_range(
+            self.user, self.month_start, self.month_end,
+        )
+        rates = contributions.order_by().values('rate', 'review_rate') \
+                             .distinct()
         if len(rates) > 1:
             raise ValueError('Multiple rate values recorded for user %s.' %
                              (self.user.username))
@@ -236,12 +238,15 @@ class Invoice(object):
         """
         translated_words = reviewed_words = hours = correction = 0
 
-        scores = ScoreLog.objects.for_user_in_range(user, self.month_start,
-                                                    self.month_end)
-        scores = scores.order_by('submission__translation_project')
-        for row in get_grouped_word_stats(scores):
-            translated_words += row['translated']
-            reviewed_words += row['reviewed']
+        contributions = DailyContribution.objects.for_user_in_range(
+            user, self.month_start, self.month_end,
+        )
+        totals = contributions.aggregate(
+            translated=Sum('translated_wordcount'),
+            reviewed=Sum('reviewed_wordcount'),
+        )
+        translated_words += totals['translated'] or 0
+        reviewed_words += totals['reviewed'] or 0
 
         tasks = PaidTask.objects.for_user_in_range(user, self.month_start,
                                                    self.month_end)
@@ -346,9 +351,10 @@ class Invoice(object):
 
         return os.path.join(month_dir, u'.'.join([self.get_filename(), extension]))
 
-    def _write_to_disk(self):
+    def _write_to_disk(self, renderer=None):
         """Write the invoice to disk using all available generators.
 
+        :param renderer: optional `PDFRenderer` passed to the generators.
         :return: a list of two-tuples which contain the absolute path to the
             generated file, and their media type.
         """
@@ -357,15 +363,17 @@ class Invoice(object):
         for generator in self.generators:
             filepath = self.get_filepath(generator.extension)
             logger.info('Generating %s at "%s"...', generator.name, filepath)
-            success = generator.generate(filepath, ctx)
+            success = generator.generate(filepath, ctx, renderer=renderer)
             if success:
                 generated_files.append((filepath, generator.media_type))
 
         return generated_files
 
-    def generate(self):
+    def generate(self, renderer=None):
         """Calculates invoices' amounts and generates the invoices on disk.
 
+        :param renderer: optional `PDFRenderer` to render PDF invoices with.
+
         * Side-effect: populates the invoice's amounts.
         * Side-effect: writes a correction if the total amount is below the
             minimum stipulated.
@@ -385,13 +393,15 @@ class Invoice(object):
             })
 
         self._amounts = amounts
-        self.files = self._write_to_disk()
+        self.files = self._write_to_disk(renderer=renderer)
 
-    def send_by_email(self, override_to=None, override_bcc=None):
+    def send_by_email(self, override_to=None, override_bcc=None,
+                      connection=None):
         """Sends the invoice by email.
 
         :param override_to: Optionally override configured message recipients.
         :param override_bcc: Bcc recipients.
+        :param connection: Optional mail backend connection to reuse.
 
         :return: The number of successfully delivered messages
         """
@@ -400,7 +410,8 @@ class Invoice(object):
         if self.amounts['total'] <= 0:
             return UserNoPaymentEmail(self.id, self.conf, ctx,
                                       override_to=override_to,
-                                      override_bcc=override_bcc).send()
+                                      override_bcc=override_bcc,
+                                      connection=connection).send()
 
         attachments = [
             (file[0], file[1])  # file path, mime type
@@ -410,9 +421,11 @@ class Invoice(object):
         count += UserPaymentEmail(self.id, self.conf, ctx,
                                   override_to=override_to,
                                   override_bcc=override_bcc,
-                                  attachments=attachments).send()
+                                  attachments=attachments,
+                                  connection=connection).send()
         count += AccountingPaymentEmail(self.id, self.conf, ctx,
                                         override_to=override_to,
                                         override_bcc=override_bcc,
-                                        attachments=attachments).send()
+                                        attachments=attachments,
+                                        connection=connection).send()
         return count
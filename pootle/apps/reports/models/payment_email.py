@@ -19,18 +19,22 @@ class BasePaymentEmail(object):
     :param override_bcc: Override list of Bcc recipients.
     :param attachments: A list of tuples where elements are of the
         `(path_to_attachment, type)` shape.
+    :param connection: Mail backend connection to send the email with. A new
+        connection is used if omitted.
     """
 
     template_name = 'invoices/invoice_message.html'
 
     def __init__(self, id, config, invoice_context, override_to=None,
-                 override_bcc=None, attachments=None, **kwargs):
+                 override_bcc=None, attachments=None, connection=None,
+                 **kwargs):
         self.id = id
         self.conf = config
         self.invoice_ctx = invoice_context
         self.override_to = override_to
         self.override_bcc = override_bcc
         self.attachments = attachments or []
+        self.connection = connection
 
     def get_recipient_list(self):
         return self.override_to or []
@@ -71,7 +75,8 @@ class BasePaymentEmail(object):
                                       body=strip_tags(body),
                                       to=self.get_recipient_list(),
                                       cc=self.get_cc_list(),
-                                      bcc=self.get_bcc_list())
+                                      bcc=self.get_bcc_list(),
+                                      connection=self.connection)
         mail.attach_alternative(body, 'text/html')
 
         for attachment in self.attachments:
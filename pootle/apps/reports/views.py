@@ -9,12 +9,13 @@
 
 
 import calendar
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Sum
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils import timezone
@@ -32,7 +33,7 @@ from pootle.core.views.mixins import (AjaxResponseMixin, NoDefaultUserMixin,
                                       TestUserFieldMixin, UserObjectMixin)
 from pootle_misc.util import (ajax_required, get_date_interval,
                               get_max_month_datetime, import_func)
-from pootle_statistics.models import ScoreLog
+from pootle_statistics.models import DailyContribution, ScoreLog
 
 from .forms import PaidTaskForm, UserRatesForm
 from .models import PaidTask, PaidTaskTypes, ReportActionTypes
@@ -148,7 +149,8 @@ def get_detailed_report_context(user, month):
 
     if user and start and end:
         scores = ScoreLog.objects \
-            .select_related('submission__unit__store') \
+            .select_related('submission__unit__store',
+                            'submission__suggestion') \
             .filter(user=user,
                     creation_time__gte=start,
                     creation_time__lte=end) \
@@ -178,28 +180,17 @@ def get_detailed_report_context(user, month):
                      translated_details['raw_rate'])
                 translated_details['review_subtotal'] = \
                     score.wordcount * score.review_rate
-                if score.rate in totals['translated']:
-                    totals['translated'][score.rate]['words'] += translated
-                else:
-                    totals['translated'][score.rate] = {'words': translated}
 
             elif reviewed is not None:
                 action = ReportActionTypes.REVIEW
                 subtotal = score.review_rate * reviewed
                 wordcount = reviewed
 
-                if score.review_rate in totals['reviewed']:
-                    totals['reviewed'][score.review_rate]['words'] += reviewed
-                else:
-                    totals['reviewed'][score.review_rate] = {'words': reviewed}
-
             suggested = score.get_suggested_wordcount()
             if suggested is not None:
                 action = ReportActionTypes.SUGGESTION
                 wordcount = suggested
 
-                totals['suggested'] += suggested
-
             if action is not None:
                 items.append({
                     'score': score,
@@ -213,6 +204,24 @@ def get_detailed_report_context(user, month):
                     'creation_time': score.creation_time,
                 })
 
+        contributions = DailyContribution.objects \
+            .for_user_in_range(user, start, end) \
+            .order_by() \
+            .values('rate', 'review_rate') \
+            .annotate(translated=Sum('translated_wordcount'),
+                      reviewed=Sum('reviewed_wordcount'),
+                      suggested=Sum('suggested_wordcount'))
+        for row in contributions:
+            if row['translated'] > 0:
+                rate = totals['translated'].setdefault(row['rate'],
+                                                       {'words': 0})
+                rate['words'] += row['translated']
+            if row['reviewed'] > 0:
+                rate = totals['reviewed'].setdefault(row['review_rate'],
+                                                     {'words': 0})
+                rate['words'] += row['reviewed']
+            totals['suggested'] += row['suggested']
+
         paid_tasks = totals['paid_tasks']
         for task in tasks.iterator():
             subtotal = task.amount * task.rate
@@ -331,6 +340,9 @@ def update_user_rates(request):
         paid_task_count = paid_task_query.count()
 
         scorelog_query.update(rate=user.rate, review_rate=user.review_rate)
+        DailyContribution.objects.rebuild(
+            users=[user.pk], start=form.cleaned_data['effective_from'],
+        )
 
         def get_task_rate_for(user, task_type):
             return {
@@ -415,12 +427,11 @@ def get_activity_data(request, user, month):
     }
 
     if user != '':
-        scores = ScoreLog.objects.for_user_in_range(user, start, end)
-        scores = list(scores.order_by('submission__translation_project'))
-        json['grouped'] = get_grouped_word_stats(scores, user, month)
-        scores.sort(key=lambda x: x.creation_time)
-        json['daily'] = get_daily_activity(user, scores, start, end)
-        json['summary'] = get_summary(scores, start, end)
+        contributions = DailyContribution.objects.for_user_in_range(user, start,
+                                                                    end)
+        json['grouped'] = get_grouped_word_stats(contributions, user, month)
+        json['daily'] = get_daily_activity(user, contributions, start, end)
+        json['summary'] = get_summary(contributions, start, end)
         tasks = get_paid_tasks(user, start, end)
         for task in tasks:
             if settings.USE_TZ:
@@ -448,7 +459,7 @@ def user_date_prj_activity(request):
     return JsonResponse(data)
 
 
-def get_daily_activity(user, scores, start, end):
+def get_daily_activity(user, contributions, start, end):
     result_translated = {
         'label': ReportActionTypes.NAMES_MAP[ReportActionTypes.TRANSLATION],
         'data': [],
@@ -481,41 +492,31 @@ def get_daily_activity(user, scores, start, end):
         except ImproperlyConfigured:
             pass
 
-    saved_date = None
-    current_day_score = 0
     translated_group = {}
     reviewed_group = {}
     suggested_group = {}
-    for score in scores:
-        score_time = make_naive(score.creation_time)
-        date = score_time.date()
-
-        translated, reviewed = score.get_paid_wordcounts()
-        suggested = score.get_suggested_wordcount()
-
-        if any(map(lambda x: x is not None, [translated, reviewed,
-                                             suggested])):
-            translated = 0 if translated is None else translated
-            reviewed = 0 if reviewed is None else reviewed
-            suggested = 0 if suggested is None else suggested
-
-            if saved_date != date:
-                saved_date = date
-                reviewed_group[date] = 0
-                translated_group[date] = 0
-                suggested_group[date] = 0
-                if result['max_day_score'] < current_day_score:
-                    result['max_day_score'] = current_day_score
-                current_day_score = 0
-            current_day_score += int(reviewed + translated + suggested)
-            result['nonempty'] |= current_day_score > 0
-
-            translated_group[date] += translated
-            reviewed_group[date] += reviewed
-            suggested_group[date] += suggested
-
-    if result['max_day_score'] < current_day_score:
-        result['max_day_score'] = current_day_score
+    daily_totals = contributions.order_by('date').values('date').annotate(
+        translated=Sum('translated_wordcount'),
+        reviewed=Sum('reviewed_wordcount'),
+        suggested=Sum('suggested_wordcount'),
+    )
+    for row in daily_totals:
+        date = row['date']
+        translated = row['translated']
+        reviewed = row['reviewed']
+        suggested = row['suggested']
+
+        if not any([translated, reviewed, suggested]):
+            continue
+
+        day_score = int(reviewed + translated + suggested)
+        if result['max_day_score'] < day_score:
+            result['max_day_score'] = day_score
+        result['nonempty'] |= day_score > 0
+
+        translated_group[date] = translated
+        reviewed_group[date] = reviewed
+        suggested_group[date] = suggested
 
     for group, res in [(translated_group, result_translated),
                        (reviewed_group, result_reviewed),
@@ -546,7 +547,7 @@ def get_paid_tasks(user, start, end):
     return result
 
 
-def get_summary(scores, start, end):
+def get_summary(contributions, start, end):
     rate = review_rate = None
     translation_month = review_month = None
     translated_row = reviewed_row = None
@@ -557,44 +558,48 @@ def get_summary(scores, start, end):
     start = make_naive(start)
     end = make_naive(end)
 
-    for score in scores:
-        score_time = make_naive(score.creation_time)
+    daily_totals = contributions.order_by(
+        'date', 'rate', 'review_rate',
+    ).values('date', 'rate', 'review_rate').annotate(
+        translated=Sum('translated_wordcount'),
+        reviewed=Sum('reviewed_wordcount'),
+    )
+    for row in daily_totals:
+        score_time = datetime.combine(row['date'], time())
 
-        if (score.rate != rate or
+        if (row['rate'] != rate or
             translation_month != score_time.month):
-            rate = score.rate
+            rate = row['rate']
             translation_month = score_time.month
             translated_row = {
                 'type': PaidTaskTypes.TRANSLATION,
                 'action': PaidTaskTypes.TRANSLATION,
                 'amount': 0,
-                'rate': score.rate,
+                'rate': row['rate'],
                 'start': score_time,
                 'end': score_time,
             }
             translations.append(translated_row)
-        if (score.review_rate != review_rate or
+        if (row['review_rate'] != review_rate or
             review_month != score_time.month):
-            review_rate = score.review_rate
+            review_rate = row['review_rate']
             review_month = score_time.month
             reviewed_row = {
                 'type': PaidTaskTypes.REVIEW,
                 'action': PaidTaskTypes.REVIEW,
                 'amount': 0,
-                'rate': score.review_rate,
+                'rate': row['review_rate'],
                 'start': score_time,
                 'end': score_time,
             }
             reviews.append(reviewed_row)
 
-        translated_words, reviewed_words = score.get_paid_wordcounts()
-
-        if translated_words is not None:
+        if row['translated'] > 0:
             translated_row['end'] = score_time
-            translated_row['amount'] += translated_words
-        elif reviewed_words is not None:
+            translated_row['amount'] += row['translated']
+        if row['reviewed'] > 0:
             reviewed_row['end'] = score_time
-            reviewed_row['amount'] += reviewed_words
+            reviewed_row['amount'] += row['reviewed']
 
     for group in [translations, reviews]:
         for i, item in enumerate(group):
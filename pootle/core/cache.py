@@ -44,6 +44,24 @@ def make_key(*args, **kwargs):
     ])
 
 
+def make_collection_generation_key(model):
+    """Creates the cache key holding the generation of cached collection
+    data for `model`, e.g. API collection counts.
+
+    :param model: A model class or instance
+    """
+    return u'collection-generation:%s' % model._meta.label_lower
+
+
+def invalidate_collection_counts(model):
+    """Invalidates the cached collection counts for `model` by dropping
+    its generation, so that new counts are cached under new keys.
+
+    :param model: A model class or instance
+    """
+    default_cache.delete(make_collection_generation_key(model))
+
+
 def get_cache(cache=None):
     """Return ``cache`` or the 'default' cache if ``cache`` is not specified or
     ``cache`` is not configured.
@@ -13,10 +13,10 @@ from django.utils import timezone
 from django.utils.functional import cached_property
 from django.utils.lru_cache import lru_cache
 
-from pootle.core.mixins.treeitem import CachedMethods
+from pootle.core.mixins.treeitem import CachedMethods, content_revisions_batch
 from pootle_misc.checks import run_given_filters
 from pootle_store.constants import OBSOLETE
-from pootle_store.models import QualityCheck, Store, Unit
+from pootle_store.models import QualityCheck, Store, StoreCheckCounts, Unit
 from pootle_store.unit import UnitProxy
 from pootle_translationproject.models import TranslationProject
 
@@ -32,6 +32,12 @@ class CheckableUnit(UnitProxy):
     store__translation_project__id
     """
 
+    proxied_fields = (
+        "id", "source_f", "target_f", "locations", "store__id",
+        "store__translation_project__id",
+        "store__translation_project__language__code",
+    )
+
     @property
     def store(self):
         return self.store__id
@@ -271,11 +277,14 @@ class QualityCheckUpdater(object):
             trans, (time.time() - start))
 
     def update_store_caches(self, stores):
-        """After completing QualityCheck updates expire caches for affected Stores.
+        """After completing QualityCheck updates rebuild check counts and
+        expire caches for affected Stores.
         """
-        for store in Store.objects.filter(pk__in=stores):
-            store.mark_dirty(CachedMethods.CHECKS, CachedMethods.MTIME)
-            store.update_dirty_cache()
+        StoreCheckCounts.objects.rebuild(stores=stores)
+        with content_revisions_batch():
+            for store in Store.objects.filter(pk__in=stores):
+                store.mark_dirty(CachedMethods.CHECKS, CachedMethods.MTIME)
+                store.update_dirty_cache()
 
     def update_translated_unit(self, unit, checker=None):
         """Update checks for a translated Unit
@@ -330,8 +339,9 @@ class QualityCheckUpdater(object):
         """Delete QualityChecks for untranslated Units
         """
         checks_qs = self.checks_qs.exclude(unit__state__gte=OBSOLETE)
-        self.update_store_caches(
-            set(checks_qs.values_list("unit__store__pk", flat=True).distinct()))
+        stores = set(
+            checks_qs.values_list("unit__store__pk", flat=True).distinct())
         deleted = checks_qs.count()
         checks_qs.delete()
+        self.update_store_caches(stores)
         return deleted
@@ -87,10 +87,12 @@ def get_path_obj(func):
 
                 raise Http404
         elif language_code:
-            user_projects = Project.accessible_by_user(request.user)
             language = get_object_or_404(Language, code=language_code)
-            children = language.children \
-                               .filter(project__code__in=user_projects)
+            children = language.children
+            if not request.user.is_superuser:
+                children = children.filter(**Project.get_visibility_filter(
+                    request.user, prefix='project__',
+                ))
             language.set_children(children)
             path_obj = language
         elif project_code:
@@ -8,7 +8,7 @@
 # AUTHORS file for copyright and authorship information.
 
 from pootle.i18n.gettext import ugettext as _
-from pootle_misc.checks import check_names
+from pootle_misc.constants import check_names
 
 
 def get_filter_name(GET):
@@ -8,6 +8,11 @@
 
 
 import logging
+import os
+import threading
+import traceback
+from logging.handlers import MemoryHandler
+from Queue import Empty, Full, Queue
 
 
 # Log actions
@@ -36,8 +41,7 @@ def log(message):
     logger.info(message)
 
 
-def action_log(*args, **kwargs):
-    logger = logging.getLogger('action')
+def _format_action(**kwargs):
     d = {}
     for p in ['user', 'lang', 'action', 'unit', 'path']:
         d[p] = kwargs.pop(p, '')
@@ -47,10 +51,38 @@ def action_log(*args, **kwargs):
     tr = tr.replace("\n", "\\\n")
     d['translation'] = tr
 
-    msg = (u"%(user)s\t%(action)s\t%(lang)s\t"
-           "%(unit)s\t%(path)s\t%(translation)s" % d)
+    return (u"%(user)s\t%(action)s\t%(lang)s\t"
+            "%(unit)s\t%(path)s\t%(translation)s" % d)
+
+
+def action_log(*args, **kwargs):
+    logger = logging.getLogger('action')
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
-    logger.info(msg)
+    logger.info(_format_action(**kwargs))
+
+
+def action_log_many(actions, **kwargs):
+    """Logs several actions at once.
+
+    :param actions: iterable of dictionaries with the arguments of each
+        action, as accepted by `action_log()`.
+    :param kwargs: arguments shared by all actions.
+    """
+    logger = logging.getLogger('action')
+    if not logger.isEnabledFor(logging.INFO):
+        return
+
+    for action in actions:
+        params = dict(kwargs, **action)
+        logger.info(_format_action(**params))
+
+
+def flush_action_log():
+    """Waits until the records of the `action` logger are written."""
+    for handler in logging.getLogger('action').handlers:
+        handler.flush()
 
 
 def cmd_log(*args, **kwargs):
@@ -88,3 +120,132 @@ def store_log(*args, **kwargs):
     message = "%(user)s\t%(action)s\t%(path)s\t%(store)s" % d
 
     logger.info(message)
+
+
+class BufferedHandler(MemoryHandler):
+    """Handler passing records on to its `target` handler from a background
+    thread, so that callers never wait for the target to write them.
+
+    Records are queued up to `capacity`; once the queue is full, new
+    records are dropped and counted in `dropped` rather than blocking. A
+    warning with the number of dropped records is written to the target
+    along with the next batch.
+    The background thread hands queued records to the target in batches
+    of up to `batch_size`, flushing the target after every batch and at
+    least every `flush_interval` seconds.
+    """
+
+    def __init__(self, capacity=10000, target=None, batch_size=500,
+                 flush_interval=1.0):
+        MemoryHandler.__init__(self, capacity, target=target)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = Queue(capacity)
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._pid = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_writer(self):
+        # The writer thread does not survive forking, so worker processes
+        # start their own
+        if self._pid == os.getpid():
+            return
+
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+
+            if self._pid is not None:
+                # Records queued before forking are written by the parent
+                self.queue = Queue(self.capacity)
+
+            self._thread = threading.Thread(target=self._write,
+                                            name='BufferedHandler')
+            self._thread.daemon = True
+            self._thread.start()
+            self._pid = os.getpid()
+
+    def emit(self, record):
+        self._ensure_writer()
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def _get_batch(self):
+        try:
+            batch = [self.queue.get(timeout=self.flush_interval)]
+        except Empty:
+            return []
+
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except Empty:
+                break
+
+        return batch
+
+    def _get_dropped_record(self):
+        dropped = self.dropped
+        if dropped == self._reported_dropped:
+            return None
+
+        record = logging.makeLogRecord({
+            'name': __name__,
+            'levelno': logging.WARNING,
+            'levelname': logging.getLevelName(logging.WARNING),
+            'msg': '%d log records were dropped: the buffer was full',
+            'args': (dropped - self._reported_dropped, ),
+        })
+        self._reported_dropped = dropped
+        return record
+
+    def _handle_batch(self, batch):
+        """Hands `batch` to the target.
+
+        :return: `True` if the batch includes the stop sentinel.
+        """
+        try:
+            if self.target is not None:
+                dropped_record = self._get_dropped_record()
+                if dropped_record is not None:
+                    self.target.handle(dropped_record)
+            for record in batch:
+                if record is not None and self.target is not None:
+                    self.target.handle(record)
+            if self.target is not None:
+                self.target.flush()
+        finally:
+            for record in batch:
+                self.queue.task_done()
+
+        return None in batch
+
+    def _write(self):
+        while True:
+            try:
+                if self._handle_batch(self._get_batch()):
+                    return
+            except Exception:
+                # Keep writing subsequent records, as `Handler.handleError()`
+                # does for synchronous handlers
+                if logging.raiseExceptions:
+                    traceback.print_exc()
+
+    def shouldFlush(self, record):
+        return False
+
+    def flush(self):
+        """Waits until all queued records are handed to the target."""
+        if self._pid == os.getpid() and self._thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            self.queue.put(None)
+            self._thread.join()
+            self._pid = None
+        MemoryHandler.close(self)
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+"""Performance metrics for views and RQ jobs.
+
+Wall time, DB queries, Redis commands and cache hits are recorded for
+every request and job, aggregated in-process per view name or job
+function, and periodically flushed to the sink configured in the
+`ZING_METRICS` setting.
+"""
+
+import atexit
+import heapq
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from rq import Worker
+
+
+logger = logging.getLogger(__name__)
+slow_logger = logging.getLogger('metrics.slow')
+
+_local = threading.local()
+_install_lock = threading.Lock()
+_installed = False
+_collector = None
+
+_MISSING = object()
+
+#: Default values of the `ZING_METRICS` setting
+DEFAULTS = {
+    'SINK': None,
+    'OPTIONS': {},
+    'FLUSH_INTERVAL': 10,
+    'SLOW_THRESHOLD': 1.0,
+    'SLOW_TOP_QUERIES': 5,
+}
+
+#: Counters recorded for every request or job
+COUNTERS = (
+    'queries', 'query_time', 'redis_commands', 'redis_time', 'cache_hits',
+    'cache_misses',
+)
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'ZING_METRICS', None) or {})
+    return config
+
+
+def is_enabled():
+    return get_config()['SINK'] is not None
+
+
+class Record(object):
+    """Metrics of a single request or job."""
+
+    def __init__(self, kind, name, top_queries=0):
+        self.kind = kind
+        self.name = name
+        self.start = time.time()
+        self.duration = None
+        self.top_queries_size = top_queries
+        self.top_queries = []
+        for counter in COUNTERS:
+            setattr(self, counter, 0)
+
+    def add_query(self, sql, duration):
+        self.queries += 1
+        self.query_time += duration
+        if not self.top_queries_size:
+            return
+
+        entry = (duration, sql)
+        if len(self.top_queries) < self.top_queries_size:
+            heapq.heappush(self.top_queries, entry)
+        elif entry > self.top_queries[0]:
+            heapq.heapreplace(self.top_queries, entry)
+
+    def add_redis_commands(self, count, duration):
+        self.redis_commands += count
+        self.redis_time += duration
+
+    def add_cache_lookups(self, hits, misses):
+        self.cache_hits += hits
+        self.cache_misses += misses
+
+    def finish(self):
+        self.duration = time.time() - self.start
+
+    def get_top_queries(self):
+        return sorted(self.top_queries, reverse=True)
+
+
+class Aggregate(object):
+    """Metrics aggregated over several records of the same view or job."""
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.count = 0
+        self.time = 0
+        self.max_time = 0
+        for counter in COUNTERS:
+            setattr(self, counter, 0)
+
+    def add(self, record):
+        self.count += 1
+        self.time += record.duration
+        self.max_time = max(self.max_time, record.duration)
+        for counter in COUNTERS:
+            setattr(self, counter,
+                    getattr(self, counter) + getattr(record, counter))
+
+    def to_dict(self):
+        data = {
+            'kind': self.kind,
+            'name': self.name,
+            'count': self.count,
+            'time': self.time,
+            'max_time': self.max_time,
+        }
+        data.update((counter, getattr(self, counter)) for counter in COUNTERS)
+        lookups = self.cache_hits + self.cache_misses
+        data['cache_hit_ratio'] = (
+            float(self.cache_hits) / lookups if lookups else None
+        )
+        return data
+
+
+class Collector(object):
+    """Aggregates records in-process and flushes them to `sink` at most
+    every `flush_interval` seconds.
+    """
+
+    def __init__(self, sink, flush_interval):
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self.lock = threading.Lock()
+        self.aggregates = {}
+        self.last_flush = time.time()
+
+    def add(self, record):
+        key = (record.kind, record.name)
+        with self.lock:
+            if key not in self.aggregates:
+                self.aggregates[key] = Aggregate(record.kind, record.name)
+            self.aggregates[key].add(record)
+
+        if time.time() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            aggregates = self.aggregates
+            self.aggregates = {}
+            self.last_flush = time.time()
+
+        if not aggregates:
+            return
+
+        try:
+            self.sink.send([aggregate.to_dict()
+                            for aggregate in aggregates.itervalues()])
+        except Exception:
+            logger.exception('Failed to send metrics')
+
+
+def get_collector():
+    global _collector
+
+    if _collector is None:
+        config = get_config()
+        sink_class = config['SINK']
+        if isinstance(sink_class, basestring):
+            sink_class = import_string(sink_class)
+        _collector = Collector(sink_class(**config['OPTIONS']),
+                               config['FLUSH_INTERVAL'])
+        atexit.register(_collector.flush)
+
+    return _collector
+
+
+def get_current_record():
+    return getattr(_local, 'record', None)
+
+
+@contextmanager
+def record(kind, name):
+    """Records the metrics of the code run within the context, which are
+    then aggregated under `kind` and `name`.
+
+    The yielded `Record` can be renamed before the context exits. Nothing
+    is recorded, and `None` is yielded, if metrics are disabled.
+    """
+    config = get_config()
+    if config['SINK'] is None:
+        yield None
+        return
+
+    previous = get_current_record()
+    current = Record(kind, name, top_queries=config['SLOW_TOP_QUERIES'])
+    _local.record = current
+    try:
+        yield current
+    finally:
+        _local.record = previous
+        current.finish()
+        get_collector().add(current)
+        if current.duration >= config['SLOW_THRESHOLD']:
+            log_slow_record(current)
+
+
+def log_slow_record(record):
+    lines = [
+        u'%s %s took %.3fs: %d queries (%.3fs), %d Redis commands (%.3fs)' %
+        (record.kind, record.name, record.duration, record.queries,
+         record.query_time, record.redis_commands, record.redis_time),
+    ]
+    lines.extend(u'\t%.3fs\t%s' % query
+                 for query in record.get_top_queries())
+    slow_logger.warning(u'\n'.join(lines))
+
+
+def _timed(add_metric):
+    """Decorates a method so that its duration is added to the current
+    record, if any, by means of `add_metric(record, duration, self,
+    result, *args, **kwargs)`.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def _wrapper(self, *args, **kwargs):
+            current = get_current_record()
+            if current is None:
+                return func(self, *args, **kwargs)
+
+            start = time.time()
+            result = func(self, *args, **kwargs)
+            add_metric(current, time.time() - start, self, result,
+                       *args, **kwargs)
+            return result
+
+        return _wrapper
+
+    return decorator
+
+
+def _add_query(record, duration, cursor, result, sql, *args, **kwargs):
+    record.add_query(sql, duration)
+
+
+def _add_redis_command(record, duration, client, result, *args, **kwargs):
+    record.add_redis_commands(1, duration)
+
+
+def _patch_pipeline_execute(execute):
+    @wraps(execute)
+    def _wrapper(self, *args, **kwargs):
+        current = get_current_record()
+        if current is None:
+            return execute(self, *args, **kwargs)
+
+        count = len(self.command_stack)
+        start = time.time()
+        result = execute(self, *args, **kwargs)
+        current.add_redis_commands(count, time.time() - start)
+        return result
+
+    return _wrapper
+
+
+def _patch_cache_get(get):
+    @wraps(get)
+    def _wrapper(self, key, default=None, version=None, client=None):
+        value = get(self, key, default=_MISSING, version=version,
+                    client=client)
+        current = get_current_record()
+        if current is not None:
+            hit = value is not _MISSING
+            current.add_cache_lookups(int(hit), int(not hit))
+        return default if value is _MISSING else value
+
+    return _wrapper
+
+
+def _patch_cache_get_many(get_many):
+    @wraps(get_many)
+    def _wrapper(self, keys, *args, **kwargs):
+        keys = list(keys)
+        values = get_many(self, keys, *args, **kwargs)
+        current = get_current_record()
+        if current is not None:
+            current.add_cache_lookups(len(values), len(keys) - len(values))
+        return values
+
+    return _wrapper
+
+
+def install():
+    """Hooks into the DB, Redis and cache clients so that their usage is
+    added to the current record. This only needs to be done once per
+    process.
+    """
+    global _installed
+
+    with _install_lock:
+        if _installed:
+            return
+
+        from django.db.backends.utils import CursorWrapper
+        from django_redis.client import DefaultClient
+        from redis.client import BasePipeline, StrictRedis
+
+        CursorWrapper.execute = _timed(_add_query)(CursorWrapper.execute)
+        CursorWrapper.executemany = _timed(_add_query)(
+            CursorWrapper.executemany
+        )
+        StrictRedis.execute_command = _timed(_add_redis_command)(
+            StrictRedis.execute_command
+        )
+        BasePipeline.execute = _patch_pipeline_execute(BasePipeline.execute)
+        DefaultClient.get = _patch_cache_get(DefaultClient.get)
+        DefaultClient.get_many = _patch_cache_get_many(DefaultClient.get_many)
+
+        _installed = True
+
+
+def get_metric_name(name):
+    """Returns `name` with characters not allowed by StatsD replaced."""
+    return re.sub(r'[^\w\-]+', '_', name)
+
+
+class MetricsSink(object):
+    """Base class for destinations of aggregated metrics."""
+
+    def send(self, aggregates):
+        """Sends aggregated metrics.
+
+        :param aggregates: list of dictionaries of aggregated metrics, as
+            returned by `Aggregate.to_dict()`.
+        """
+        raise NotImplementedError
+
+
+class StatsdSink(MetricsSink):
+    """Sends metrics to a StatsD daemon over UDP.
+
+    Totals are sent as counters, and maximum times as gauges. Times are in
+    milliseconds.
+    """
+
+    #: Maximum size of the datagrams sent
+    MAX_PACKET_SIZE = 512
+
+    def __init__(self, host='127.0.0.1', port=8125, prefix='zing'):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def get_lines(self, aggregate):
+        base = '%s.%s.%s' % (self.prefix, aggregate['kind'],
+                             get_metric_name(aggregate['name']))
+        yield '%s.count:%d|c' % (base, aggregate['count'])
+        for name in ('time', 'query_time', 'redis_time'):
+            yield '%s.%s:%d|c' % (base, name, aggregate[name] * 1000)
+        for name in ('queries', 'redis_commands', 'cache_hits',
+                     'cache_misses'):
+            yield '%s.%s:%d|c' % (base, name, aggregate[name])
+        yield '%s.max_time:%d|g' % (base, aggregate['max_time'] * 1000)
+
+    def send(self, aggregates):
+        packet = []
+        size = 0
+        for aggregate in aggregates:
+            for line in self.get_lines(aggregate):
+                if packet and size + len(line) + 1 > self.MAX_PACKET_SIZE:
+                    self.socket.sendto('\n'.join(packet), self.address)
+                    packet, size = [], 0
+                packet.append(line)
+                size += len(line) + 1
+
+        if packet:
+            self.socket.sendto('\n'.join(packet), self.address)
+
+
+class FileSink(MetricsSink):
+    """Appends metrics to a rotating file, as one JSON object per line."""
+
+    def __init__(self, filename=None, max_bytes=10 * 1024 * 1024,
+                 backup_count=5):
+        if filename is None:
+            filename = os.path.join(settings.ZING_LOG_DIRECTORY,
+                                    'metrics.log')
+        self.handler = RotatingFileHandler(filename, maxBytes=max_bytes,
+                                           backupCount=backup_count)
+
+    def send(self, aggregates):
+        timestamp = int(time.time())
+        for aggregate in aggregates:
+            data = dict(aggregate, timestamp=timestamp)
+            self.handler.emit(logging.makeLogRecord({
+                'msg': json.dumps(data, sort_keys=True),
+            }))
+
+
+class RedisStreamSink(MetricsSink):
+    """Adds metrics to a Redis stream, which is capped to approximately
+    `max_length` entries. Requires Redis 5.0 or later.
+    """
+
+    def __init__(self, key='zing:metrics', max_length=100000,
+                 cache='redis'):
+        self.key = key
+        self.max_length = max_length
+        self.cache = cache
+
+    def send(self, aggregates):
+        from django_redis import get_redis_connection
+
+        connection = get_redis_connection(self.cache)
+        timestamp = int(time.time())
+        with connection.pipeline(transaction=False) as pipe:
+            for aggregate in aggregates:
+                fields = []
+                for key, value in sorted(aggregate.iteritems()):
+                    fields.extend([key, json.dumps(value)])
+                pipe.execute_command(
+                    'XADD', self.key, 'MAXLEN', '~', self.max_length, '*',
+                    'timestamp', timestamp, *fields
+                )
+            pipe.execute()
+
+
+class MetricsWorker(Worker):
+    """RQ worker recording the metrics of the jobs it performs.
+
+    `pootle.core.worker.Worker`, the default worker class of the
+    `rqworker` command, extends it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(MetricsWorker, self).__init__(*args, **kwargs)
+        if is_enabled():
+            install()
+
+    def perform_job(self, *args, **kwargs):
+        job = args[0] if args else kwargs['job']
+        with record('job', job.func_name):
+            result = super(MetricsWorker, self).perform_job(*args, **kwargs)
+
+        # Jobs are performed in a forked work horse which exits right
+        # after, so the collected metrics are sent straight away
+        if is_enabled():
+            get_collector().flush()
+        return result
@@ -8,6 +8,10 @@
 # AUTHORS file for copyright and authorship information.
 
 import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
 from datetime import datetime
 
 from redis import WatchError
@@ -33,16 +37,143 @@ KEY_DIRTY_TREEITEMS = 'pootle:dirty:treeitems'
 KEY_REFRESH_STATS = 'pootle:refresh:stats'
 KEY_STATS_LAST_JOB_PREFIX = "pootle:stats:lastjob:"
 KEY_STATS_JOB_PARAMS_PREFIX = "pootle:stats:job.params:"
+KEY_CONTENT_REVISIONS = 'pootle:content:revisions'
+KEY_CONTENT_METADATA_REVISION = 'pootle:content:metadata'
+KEY_STATS_JOBS_PROCESSED_PREFIX = 'pootle:stats:jobs.processed:'
+
+#: Seconds the per-minute counters of processed jobs are kept for
+STATS_JOBS_PROCESSED_TTL = 24 * 60 * 60
 
 
 logger = logging.getLogger('stats')
 cache = get_cache('stats')
 
+_content_revisions_batch = threading.local()
+
 
 class NoCachedStats(Exception):
     pass
 
 
+def get_content_paths(pootle_path):
+    """Returns the paths whose content depends on `pootle_path`: its own,
+    its parents', and the paths aggregating them across languages.
+    """
+    language_code, project_code = split_pootle_path(pootle_path)[:2]
+    paths = set(get_all_pootle_paths(pootle_path))
+    paths.add(u'/projects/')
+
+    if language_code is not None:
+        paths.add(u'/%s/' % language_code)
+
+    if language_code is not None and project_code is not None:
+        tp_path = u'/%s/%s/' % (language_code, project_code)
+        project_path = u'/projects/%s/' % project_code
+        paths.update([
+            project_path + path[len(tp_path):]
+            for path in paths if path.startswith(tp_path)
+        ])
+
+    return sorted(paths)
+
+
+def bump_content_revisions(pootle_paths):
+    """Assigns new content revisions to `pootle_paths`.
+
+    Content revisions are opaque tokens which change whenever the stats
+    (or dirtiness) of a path change, and are meant to be used as
+    validators of the responses built from them.
+
+    Within a `content_revisions_batch()` block the paths are only
+    collected, and bumped together when the block exits.
+    """
+    if not pootle_paths:
+        return
+
+    batch = getattr(_content_revisions_batch, 'paths', None)
+    if batch is not None:
+        batch.update(pootle_paths)
+        return
+
+    revision = uuid.uuid4().hex
+    get_connection().hmset(KEY_CONTENT_REVISIONS, {
+        path: revision for path in pootle_paths
+    })
+
+
+@contextmanager
+def content_revisions_batch():
+    """Defers the content revision bumps made within the block, writing
+    them with a single command when it exits.
+    """
+    if getattr(_content_revisions_batch, 'paths', None) is not None:
+        yield
+        return
+
+    _content_revisions_batch.paths = set()
+    try:
+        yield
+    finally:
+        pootle_paths = _content_revisions_batch.paths
+        _content_revisions_batch.paths = None
+        bump_content_revisions(pootle_paths)
+
+
+def delete_content_revisions(pootle_paths):
+    """Forgets the content revisions of `pootle_paths`, which no longer
+    exist or became obsolete.
+    """
+    if pootle_paths:
+        get_connection().hdel(KEY_CONTENT_REVISIONS, *pootle_paths)
+
+
+def bump_content_metadata_revision():
+    """Changes the revision of the data other than stats which is shown
+    along with them (permissions, projects, due dates...).
+    """
+    get_connection().set(KEY_CONTENT_METADATA_REVISION, uuid.uuid4().hex)
+
+
+def get_content_revision(pootle_path):
+    """Returns a string identifying the current content of `pootle_path`,
+    or `None` if its stats were never calculated.
+
+    The content revision also accounts for changes to metadata and for
+    ongoing stats refreshes. It is retrieved with a single round-trip.
+    """
+    pipe = get_connection().pipeline(transaction=False)
+    pipe.hget(KEY_CONTENT_REVISIONS, pootle_path)
+    pipe.get(KEY_CONTENT_METADATA_REVISION)
+    pipe.get(KEY_REFRESH_STATS)
+    revision, metadata_revision, refreshing = pipe.execute()
+    if revision is None:
+        return None
+
+    return u'%s-%s-%s' % (revision, metadata_revision or '',
+                          refreshing or '')
+
+
+def count_processed_job(connection):
+    """Increments the counter of stats jobs processed in the current
+    minute.
+    """
+    key = KEY_STATS_JOBS_PROCESSED_PREFIX + str(int(time.time()) // 60)
+    pipe = connection.pipeline(transaction=False)
+    pipe.incr(key)
+    pipe.expire(key, STATS_JOBS_PROCESSED_TTL)
+    pipe.execute()
+
+
+def get_processed_job_count(connection, minutes):
+    """Returns the number of stats jobs processed over the last `minutes`
+    minutes, including the current one.
+    """
+    current = int(time.time()) // 60
+    keys = [KEY_STATS_JOBS_PROCESSED_PREFIX + str(minute)
+            for minute in range(current - minutes + 1, current + 1)]
+    return sum(int(count) for count in connection.mget(keys) if count)
+
+
 class CachedMethods(object):
     """Cached method names."""
 
@@ -394,6 +525,7 @@ class CachedTreeItem(TreeItem):
             logger.debug("%s deleted from %s cache", keys, self.cache_key)
 
         self._dirty_cache = set()
+        delete_content_revisions([self.cache_key])
 
     # # # # # # #  Update stats in Redis Queue Worker process # # # # # # # #
 
@@ -426,6 +558,7 @@ class CachedTreeItem(TreeItem):
         r_con = get_connection()
         for p in self.all_pootle_paths():
             r_con.zincrby(KEY_DIRTY_TREEITEMS, p)
+        bump_content_revisions(get_content_paths(self.cache_key))
 
     def unregister_all_dirty(self, decrement=1):
         """Unregister current TreeItem and all parent paths as dirty
@@ -440,6 +573,7 @@ class CachedTreeItem(TreeItem):
             else:
                 logger.debug('UNREGISTER %s (-%s)', p, decrement)
             r_con.zincrby(KEY_DIRTY_TREEITEMS, p, 0 - decrement)
+        bump_content_revisions(get_content_paths(self.cache_key))
 
     def unregister_dirty(self, decrement=1):
         """Unregister current TreeItem as dirty
@@ -454,6 +588,7 @@ class CachedTreeItem(TreeItem):
             logger.debug('UNREGISTER %s (-%s)', self.cache_key, decrement)
         r_con.zincrby(KEY_DIRTY_TREEITEMS, self.cache_key,
                       0 - decrement)
+        bump_content_revisions(get_content_paths(self.cache_key))
 
     def get_dirty_score(self):
         r_con = get_connection()
@@ -504,6 +639,7 @@ class CachedTreeItem(TreeItem):
         else:
             logger.warning('Cache for %s object cannot be updated.', self)
             self.unregister_all_dirty(decrement)
+            delete_content_revisions([self.cache_key])
 
 
 class JobWrapper(object):
@@ -641,6 +777,7 @@ def update_cache_job(instance):
     connection.close_if_unusable_or_obsolete()
 
     job_wrapper.clear_job_params()
+    count_processed_job(job.connection)
 
 
 def create_update_cache_job_wrapper(instance, keys, decrement=1):
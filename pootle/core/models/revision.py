@@ -6,11 +6,16 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import threading
+from contextlib import contextmanager
+
 from ..cache import get_cache
 
 
 cache = get_cache('redis')
 
+_local = threading.local()
+
 
 class NoRevision(Exception):
     pass
@@ -66,10 +71,81 @@ class Revision(object):
     def incr(cls):
         """Increments the revision number.
 
+        Within a `Revision.block()` context, the revision number is drawn
+        from the block instead.
+
         :return: the new revision number after incrementing it, or the
             initial number if there's no revision stored yet.
         """
+        block = getattr(_local, 'block', None)
+        if block is not None:
+            return block.next()
+
         try:
             return cache.incr(cls.CACHE_KEY)
         except ValueError:
             raise NoRevision()
+
+    @classmethod
+    def reserve(cls, count):
+        """Reserves a contiguous block of `count` revision numbers.
+
+        :return: a `(first, last)` tuple with the first and last revision
+            numbers of the block, both included.
+        """
+        if count < 1:
+            raise ValueError('count must be a positive integer')
+
+        try:
+            last = cache.incr(cls.CACHE_KEY, count)
+        except ValueError:
+            raise NoRevision()
+
+        return last - count + 1, last
+
+    @classmethod
+    @contextmanager
+    def block(cls, size, max_size=None):
+        """Context manager making `Revision.incr()` calls draw revision
+        numbers from blocks of `size` numbers reserved at once.
+
+        Blocks are reserved on the first draw and whenever the current one
+        is exhausted, so numbers are handed out in increasing order and
+        no number is reserved before it is needed. Numbers left unused
+        when leaving the context are discarded.
+
+        If `max_size` is given, every block reserved after the first one
+        doubles in size up to `max_size`, so that few numbers are wasted
+        when the number of draws is only known to be at most `max_size`.
+
+        Blocks are local to the current thread, and should only span
+        short-lived bulk operations, e.g. a single store update.
+        """
+        previous = getattr(_local, 'block', None)
+        _local.block = RevisionBlock(size, max_size)
+        try:
+            yield _local.block
+        finally:
+            _local.block = previous
+
+
+class RevisionBlock(object):
+    """Hands out revision numbers from blocks reserved via
+    `Revision.reserve()`.
+    """
+
+    def __init__(self, size, max_size=None):
+        self.size = max(size, 1)
+        self.max_size = max(max_size or self.size, self.size)
+        self.current = self.last = None
+
+    def next(self):
+        if self.current is None:
+            self.current, self.last = Revision.reserve(self.size)
+        elif self.current >= self.last:
+            self.size = min(self.size * 2, self.max_size)
+            self.current, self.last = Revision.reserve(self.size)
+        else:
+            self.current += 1
+
+        return self.current
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+from operator import attrgetter
+
+
+def make_value_accessor(values_attr, field):
+    """Returns a property reading `field` from the values dictionary held
+    in the `values_attr` slot, defaulting falsy values to an empty string.
+    """
+    get_values = attrgetter(values_attr)
+
+    def _get(self):
+        try:
+            return get_values(self)[field] or ""
+        except KeyError:
+            raise AttributeError(field)
+
+    _get.__name__ = str(field)
+    return property(_get)
+
+
+class ValuesProxyType(type):
+    """Builds slotted classes wrapping `qs.values()` dictionaries.
+
+    Classes get an empty `__slots__` unless they declare their own, and a
+    property for each of their `proxied_fields` which isn't already an
+    attribute of the class, so that declared fields are resolved without
+    falling back to `__getattr__`.
+    """
+
+    def __new__(mcs, name, bases, attrs):
+        attrs.setdefault('__slots__', ())
+        cls = super(ValuesProxyType, mcs).__new__(mcs, name, bases, attrs)
+        for field in attrs.get('proxied_fields', ()):
+            if not hasattr(cls, field):
+                setattr(cls, field,
+                        make_value_accessor(cls.values_attr, field))
+        return cls
+
+
+class ValuesProxy(object):
+    """Wraps a dictionary of values, which is useful for wrapping results
+    from qs.values calls.
+
+    Subclasses declare a slot named `values_attr` to hold the dictionary,
+    and the keys they expect in `proxied_fields`. Other keys can still be
+    read as attributes, albeit more slowly.
+    """
+
+    __metaclass__ = ValuesProxyType
+
+    #: Name of the slot holding the wrapped dictionary
+    values_attr = 'values'
+    proxied_fields = ()
+
+    def __getattr__(self, k):
+        if k == self.values_attr:
+            raise AttributeError(k)
+        try:
+            return getattr(self, self.values_attr)[k] or ""
+        except KeyError:
+            return self.__getattribute__(k)
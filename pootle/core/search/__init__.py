@@ -8,7 +8,8 @@
 
 from .base import SearchBackend
 from .broker import SearchBroker
-from .backends import ElasticSearchBackend
 
 
-__all__ = ('SearchBackend', 'SearchBroker', 'ElasticSearchBackend')
+# Backends, such as `backends.ElasticSearchBackend`, aren't imported here
+# as they pull in heavy dependencies: the broker imports them on first use
+__all__ = ('SearchBackend', 'SearchBroker')
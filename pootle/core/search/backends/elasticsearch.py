@@ -15,6 +15,7 @@ import Levenshtein
 
 try:
     from elasticsearch import Elasticsearch
+    from elasticsearch.helpers import bulk
     from elasticsearch.exceptions import ElasticsearchException
 except ImportError:
     Elasticsearch = None
@@ -170,3 +171,21 @@ class ElasticSearchBackend(SearchBackend):
             body=obj,
             id=obj['id']
         )
+
+    def update_many(self, items):
+        actions = [
+            {
+                '_index': self._index_name,
+                '_type': language,
+                '_id': obj['id'],
+                '_source': obj,
+            }
+            for language, obj in items
+        ]
+        if not actions:
+            return
+
+        try:
+            bulk(self._es, actions)
+        except ElasticsearchException as e:
+            self._log_error(e)
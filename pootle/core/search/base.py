@@ -26,3 +26,11 @@ class SearchBackend(object):
     def update(self, language, obj):
         """Add a unit to the backend"""
         pass
+
+    def update_many(self, items):
+        """Add several units to the backend.
+
+        :param items: iterable of `(language, obj)` tuples.
+        """
+        for language, obj in items:
+            self.update(language, obj)
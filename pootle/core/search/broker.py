@@ -74,3 +74,9 @@ class SearchBroker(SearchBackend):
             return
 
         self._server.update(language, obj)
+
+    def update_many(self, items):
+        if not self._server:
+            return
+
+        self._server.update_many(items)
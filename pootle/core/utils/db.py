@@ -9,6 +9,7 @@
 from contextlib import contextmanager
 
 from django.db import connection
+from django.db.models import Case, Value, When
 
 
 @contextmanager
@@ -18,6 +19,46 @@ def useable_connection():
     connection.close_if_unusable_or_obsolete()
 
 
+def bulk_update(objs, fields, batch_size=None):
+    """Saves `fields` of several model instances using one UPDATE statement
+    per batch of objects.
+
+    Fields with `auto_now` set are updated as `save()` would do.
+
+    :param objs: list of instances of the same model.
+    :param fields: list of names of the fields to save.
+    :param batch_size: maximum number of objects updated per statement.
+        Defaults to the largest batch the database backend can handle.
+    """
+    if not objs:
+        return
+
+    model = objs[0].__class__
+    opts = model._meta
+    fields = [opts.get_field(name) for name in fields]
+
+    max_batch_size = max(
+        connection.ops.bulk_batch_size(['pk', 'pk'] + fields, objs), 1
+    )
+    if batch_size is None or batch_size > max_batch_size:
+        batch_size = max_batch_size
+
+    for i in xrange(0, len(objs), batch_size):
+        batch = objs[i:i + batch_size]
+        values = {}
+        for field in fields:
+            values[field.attname] = Case(
+                *[When(pk=obj.pk,
+                       then=Value(field.pre_save(obj, False),
+                                  output_field=field))
+                  for obj in batch],
+                output_field=field
+            )
+        model._base_manager.filter(
+            pk__in=[obj.pk for obj in batch],
+        ).update(**values)
+
+
 def set_mysql_collation_for_column(apps, cursor, model, column, collation, schema):
     """Set the collation for a mysql column if it is not set already
     """
@@ -41,10 +41,68 @@ def parse_multistring(db_string):
     return ms
 
 
+class LazyMultiString(multistring):
+    """A multistring built from its in-DB representation, which is only
+    parsed once its `strings` or `plural` attributes are accessed.
+
+    Until then it behaves as the unicode string of its first form, which is
+    all most code paths need.
+    """
+
+    def __new__(cls, db_string):
+        if not isinstance(db_string, unicode):
+            db_string = db_string.decode('utf-8')
+
+        if SEPARATOR in db_string:
+            string = db_string.split(SEPARATOR, 1)[0]
+        else:
+            string = db_string
+
+        ms = unicode.__new__(cls, string)
+        ms.db_string = db_string
+        return ms
+
+    def __init__(self, *args, **kwargs):
+        # `multistring.__init__()` would access `strings`, and parse it
+        pass
+
+    def __getattr__(self, name):
+        if name not in ('strings', 'plural'):
+            raise AttributeError(name)
+
+        self.parse()
+        return self.__dict__[name]
+
+    @property
+    def is_parsed(self):
+        """Whether the plural forms were parsed or set."""
+        return 'strings' in self.__dict__ or 'plural' in self.__dict__
+
+    def parse(self):
+        if SEPARATOR not in self.db_string:
+            strings = [self]
+            plural = False
+        else:
+            forms = self.db_string.split(SEPARATOR)
+            if forms[-1] == PLURAL_PLACEHOLDER:
+                forms = forms[:-1]
+                plural = True
+            else:
+                plural = len(forms) > 1
+            strings = [self] + [multistring(form) for form in forms[1:]]
+
+        # Keep any value set before parsing
+        self.__dict__.setdefault('strings', strings)
+        self.__dict__.setdefault('plural', plural)
+
+
 def unparse_multistring(values):
     """Converts a `values` multistring object or a list of strings back to the
     in-DB multistring representation.
     """
+    if isinstance(values, LazyMultiString) and not values.is_parsed:
+        return values.db_string
+
     if not (isinstance(values, multistring) or isinstance(values, list)):
         return values
 
@@ -6,9 +6,17 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+from collections import Counter
+from itertools import islice
+
 from redis.connection import ConnectionError
+from rq.compat import as_text
+from rq.job import Job
+from rq.utils import utcnow, utcparse
+
+from django.conf import settings
 
-from django_rq.queues import get_queue
+from django_rq.queues import get_failed_queue, get_queue
 from django_rq.workers import Worker
 
 
@@ -35,3 +43,106 @@ def rq_workers_are_running():
         if len(queue.connection.smembers(Worker.redis_workers_keys)):
             return True
     return False
+
+
+def _get_oldest_job_age(queue, now):
+    job_id = queue.connection.lindex(queue.key, 0)
+    if job_id is None:
+        return None
+
+    enqueued_at = queue.connection.hget(Job.key_for(as_text(job_id)),
+                                        'enqueued_at')
+    if not enqueued_at:
+        return None
+
+    return (now - utcparse(as_text(enqueued_at))).total_seconds()
+
+
+def _get_failed_jobs_by_function(failed_queue):
+    job_ids = failed_queue.get_job_ids()
+    pipe = failed_queue.connection.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.hget(Job.key_for(job_id), 'description')
+
+    counts = Counter()
+    for description in pipe.execute():
+        # Descriptions look like `module.func(args...)`
+        func_name = as_text(description or '').split('(', 1)[0]
+        counts[func_name or None] += 1
+
+    return dict(counts)
+
+
+def _get_last_jobs_status(connection, batch_size=1000):
+    from pootle.core.mixins.treeitem import KEY_STATS_LAST_JOB_PREFIX
+
+    status = {
+        'count': 0,
+        'with_dependents': 0,
+        'dependents': 0,
+    }
+    keys = connection.scan_iter(match=KEY_STATS_LAST_JOB_PREFIX + '*',
+                                count=batch_size)
+    while True:
+        batch = list(islice(keys, batch_size))
+        if not batch:
+            break
+
+        pipe = connection.pipeline(transaction=False)
+        for job_id in connection.mget(batch):
+            if job_id is not None:
+                pipe.scard(Job.dependents_key_for(as_text(job_id)))
+        dependents = [count for count in pipe.execute() if count]
+
+        status['count'] += len(batch)
+        status['with_dependents'] += len(dependents)
+        status['dependents'] += sum(dependents)
+
+    return status
+
+
+def get_stats_queue_status(minutes=5, top=10):
+    """Gathers the status of RQ queues and of the stats machinery.
+
+    :param minutes: number of minutes to calculate the job processing rate
+        over.
+    :param top: number of tree items with the highest dirty counts to list.
+    :returns: a JSON-serializable dictionary.
+    """
+    from pootle.core.mixins.treeitem import (KEY_DIRTY_TREEITEMS,
+                                             get_processed_job_count)
+
+    now = utcnow()
+    queues = []
+    for name in sorted(settings.RQ_QUEUES):
+        queue = get_queue(name)
+        queues.append({
+            'name': name,
+            'count': queue.count,
+            'oldest_job_age': _get_oldest_job_age(queue, now),
+        })
+
+    failed_queue = get_failed_queue()
+    connection = failed_queue.connection
+    dirty = connection.zrevrangebyscore(KEY_DIRTY_TREEITEMS, '+inf', '(0',
+                                        start=0, num=top, withscores=True)
+    processed = get_processed_job_count(connection, minutes)
+
+    return {
+        'queues': queues,
+        'failed_jobs': {
+            'count': failed_queue.count,
+            'by_function': _get_failed_jobs_by_function(failed_queue),
+        },
+        'dirty_treeitems': {
+            'count': connection.zcount(KEY_DIRTY_TREEITEMS, '(0', '+inf'),
+            'top': [{'pootle_path': as_text(path), 'count': int(score)}
+                    for path, score in dirty],
+        },
+        'last_jobs': _get_last_jobs_status(connection),
+        'processed_jobs': {
+            'minutes': minutes,
+            'count': processed,
+            'per_second': float(processed) / (minutes * 60),
+        },
+    }
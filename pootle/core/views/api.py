@@ -9,7 +9,11 @@
 
 import json
 import operator
+from hashlib import md5
+from uuid import uuid4
 
+from django.core import signing
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.db.models import ProtectedError, Q
 from django.forms.models import modelform_factory
@@ -18,6 +22,7 @@ from django.shortcuts import get_object_or_404
 from django.utils.functional import cached_property
 from django.views.generic import View
 
+from pootle.core.cache import make_collection_generation_key
 from pootle.core.http import (JsonResponse, JsonResponseBadRequest,
                               JsonResponseForbidden, JsonResponseNotFound)
 
@@ -26,6 +31,10 @@ class JSONDecodeError(ValueError):
     pass
 
 
+class InvalidCursorError(ValueError):
+    pass
+
+
 class APIView(View):
     """View to implement internal RESTful APIs.
 
@@ -70,6 +79,18 @@ class APIView(View):
     # Field names in which searching will be allowed
     search_fields = None
 
+    # Set to a unique field name to paginate by means of opaque cursors
+    # instead of page numbers (keyset pagination). Prefix it with `-` for
+    # descending order, e.g. `-id`
+    cursor_field = None
+
+    # HTTP GET parameter to use for accessing cursor-based pages
+    cursor_param_name = 'cursor'
+
+    # Set to a number of seconds to cache collection counts. Counts are
+    # invalidated whenever an object of `model` is saved or deleted
+    count_cache_timeout = None
+
     @property
     def allowed_methods(self):
         methods = [m for m in self.http_method_names if hasattr(self, m)]
@@ -154,6 +175,11 @@ class APIView(View):
                 'msg': 'Invalid JSON data',
             })
 
+        if isinstance(exc, InvalidCursorError):
+            return JsonResponseBadRequest({
+                'msg': 'Invalid cursor',
+            })
+
         raise
 
     def dispatch(self, request, *args, **kwargs):
@@ -254,32 +280,116 @@ class APIView(View):
         """Convert a queryset to values for further serialization.
 
         An array of objects in `models` and the total object count in
-        `count` is returned.
+        `count` is returned. When cursor-based pagination is enabled, the
+        cursor to the next page is returned in `next`, or `None` if this is
+        the last page.
         """
         search_keyword = self.request.GET.get(self.search_param_name, None)
         if search_keyword is not None:
             filter_by = self.get_search_filter(search_keyword)
             queryset = queryset.filter(filter_by)
 
-        values = queryset.values(*self.serialize_fields)
+        return_values = {}
 
         # Process pagination options if they are enabled
-        if isinstance(self.page_size, int):
+        if (isinstance(self.page_size, int) and
+                self.cursor_field is not None):
+            models, next_cursor = self.get_cursor_page(queryset)
+            return_values['next'] = next_cursor
+        else:
+            values = queryset.values(*self.serialize_fields)
+
+            if isinstance(self.page_size, int):
+                try:
+                    page_param = self.request.GET.get(self.page_param_name, 1)
+                    page_number = int(page_param)
+                    offset = (page_number - 1) * self.page_size
+                except ValueError:
+                    offset = 0
+
+                values = values[offset:offset+self.page_size]
+
+            models = list(values)
+
+        return_values.update({
+            'models': models,
+            'count': self.get_count(queryset, search_keyword),
+        })
+
+        return return_values
+
+    def get_cursor_page(self, queryset):
+        """Retrieves the page of `queryset` values following the cursor
+        provided in the request.
+
+        Rows are located by means of a comparison on `self.cursor_field`
+        rather than an offset, so that retrieving any page costs the same.
+
+        :return: a tuple of the list of values and the cursor to the next
+            page, which is `None` when there are no more pages.
+        """
+        field_name = self.cursor_field.lstrip('-')
+        descending = self.cursor_field.startswith('-')
+
+        fields = list(self.serialize_fields)
+        values = queryset.order_by(self.cursor_field).values(
+            *(fields + [field_name])
+        )
+
+        cursor = self.request.GET.get(self.cursor_param_name, None)
+        if cursor:
             try:
-                page_param = self.request.GET.get(self.page_param_name, 1)
-                page_number = int(page_param)
-                offset = (page_number - 1) * self.page_size
-            except ValueError:
-                offset = 0
+                last_value = signing.loads(cursor, salt=self.cursor_salt)
+            except signing.BadSignature:
+                raise InvalidCursorError
+            lookup = '%s__%s' % (field_name, 'lt' if descending else 'gt')
+            values = values.filter(**{lookup: last_value})
+
+        # Fetch an extra row to find out whether there is a next page
+        models = list(values[:self.page_size + 1])
+        next_cursor = None
+        if len(models) > self.page_size:
+            models = models[:self.page_size]
+            next_cursor = signing.dumps(models[-1][field_name],
+                                        salt=self.cursor_salt)
+
+        if field_name not in fields:
+            for model in models:
+                del model[field_name]
+
+        return models, next_cursor
 
-            values = values[offset:offset+self.page_size]
+    @property
+    def cursor_salt(self):
+        return '%s.%s.cursor' % (self.__class__.__module__,
+                                 self.__class__.__name__)
 
-        return_values = {
-            'models': list(values),
-            'count': queryset.count(),
-        }
+    def get_count(self, queryset, search_keyword=None):
+        """Returns the number of objects in `queryset`.
 
-        return return_values
+        If `self.count_cache_timeout` is set, counts are cached per search
+        keyword, under keys scoped to the current generation of `model`.
+        """
+        if self.count_cache_timeout is None:
+            return queryset.count()
+
+        generation_key = make_collection_generation_key(self.model)
+        generation = cache.get(generation_key)
+        if generation is None:
+            generation = uuid4().hex
+            cache.set(generation_key, generation, None)
+
+        keyword = (search_keyword or u'').lower().encode('utf-8')
+        count_key = 'api-count:%s.%s:%s:%s' % (
+            self.__class__.__module__, self.__class__.__name__,
+            generation, md5(keyword).hexdigest(),
+        )
+        count = cache.get(count_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(count_key, count, self.count_cache_timeout)
+
+        return count
 
     def get_search_filter(self, keyword):
         search_fields = getattr(self, 'search_fields', None)
@@ -12,7 +12,6 @@ from django.http import Http404
 from django.urls import reverse
 from django.utils.decorators import method_decorator
 from django.utils.functional import cached_property
-from django.views.decorators.cache import never_cache
 from django.views.generic import DetailView, View
 
 from pootle.core.forms import PathForm
@@ -20,7 +19,8 @@ from pootle.core.url_helpers import get_path_parts, split_pootle_path
 from pootle_app.models.permissions import check_permission
 from pootle_misc.util import ajax_required
 
-from .decorators import requires_permission, set_permissions
+from .decorators import (never_cache_unless_validated, requires_permission,
+                         set_permissions)
 from .mixins import PootleJSONMixin
 
 
@@ -97,7 +97,7 @@ class PootleDetailView(DetailView):
 
 class PootleJSON(PootleJSONMixin, PootleDetailView):
 
-    @never_cache
+    @never_cache_unless_validated
     @method_decorator(ajax_required)
     @set_permissions
     @requires_permission("view")
@@ -129,7 +129,7 @@ class BasePathDispatcherView(View):
     projects_view_class = None
     project_view_class = None
 
-    @never_cache
+    @never_cache_unless_validated
     def dispatch(self, request, *args, **kwargs):
         form = self.get_form()
         if not form.is_valid():
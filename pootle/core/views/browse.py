@@ -7,19 +7,31 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import hashlib
+from datetime import date
+
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.http import Http404
+from django.middleware.csrf import get_token
+from django.utils import translation
+from django.utils.encoding import iri_to_uri
 from django.utils.functional import cached_property
 
+from pootle import __version__
+from pootle.core.constants import CACHE_TIMEOUT
+from pootle.core.mixins.treeitem import get_content_revision
 from pootle.core.url_helpers import split_pootle_path
 from pootle.core.utils.json import remove_empty_from_dict
 from pootle.core.utils.stats import (TOP_CONTRIBUTORS_CHUNK_SIZE,
                                      get_top_scorers_data)
 from pootle.models import DueDate
 from pootle_app.models.permissions import check_user_permission
+from pootle_project.models import Project
 
 from ..http import JsonResponse
 from .base import PootleDetailView
+from .mixins import ConditionalGetMixin
 
 
 STATS_REFRESH_ATTEMPTS_COUNT = 2
@@ -35,6 +47,36 @@ class BrowseDataViewMixin(object):
     def stats(self):
         return self.object.get_stats()
 
+    @cached_property
+    def content_revision(self):
+        return get_content_revision(self.get_object().pootle_path)
+
+    def get_etag(self):
+        """Returns an entity tag built out of the content revision of the
+        current path, which changes along with its stats.
+
+        Browsing data is filtered by the user's permissions and localized,
+        hence the user and the UI language are accounted for too.
+        """
+        if self.content_revision is None:
+            return None
+
+        return u'%s-%s-%s' % (self.content_revision, self.request.user.pk,
+                              translation.get_language())
+
+    def get_permissions_fingerprint(self):
+        """Returns a string shared by all users who get the same browsing
+        data for the current path.
+        """
+        user = self.request.user
+        if user.is_superuser:
+            return 'superuser'
+
+        has_admin_access = check_user_permission(user, 'administrate',
+                                                 self.permission_context)
+        return '%s:%s' % ('admin' if has_admin_access else 'view',
+                          Project.get_access_profile(user))
+
     def get_item_data(self, path_obj, stats):
         """Shapes `path_obj` to be an item usable in the browsing table row.
 
@@ -59,6 +101,29 @@ class BrowseDataViewMixin(object):
         })
 
     def get_browsing_data(self):
+        """Returns the browsing data of the current path.
+
+        Data is cached per permissions fingerprint and UI language until
+        the content revision of the path changes, i.e. until its stats are
+        refreshed.
+        """
+        if self.content_revision is None:
+            return self.build_browsing_data()
+
+        key = iri_to_uri(u'browse:%s:%s:%s' % (
+            self.get_object().pootle_path,
+            self.get_permissions_fingerprint(),
+            translation.get_language(),
+        ))
+        revision, browsing_data = cache.get(key, (None, None))
+        if revision != self.content_revision:
+            browsing_data = self.build_browsing_data()
+            cache.set(key, (self.content_revision, browsing_data),
+                      CACHE_TIMEOUT)
+
+        return browsing_data
+
+    def build_browsing_data(self):
         browsing_data = remove_empty_from_dict({
             key: value
             for key, value in self.stats.iteritems()
@@ -84,13 +149,26 @@ class BrowseDataViewMixin(object):
         return browsing_data
 
 
-class PootleBrowseView(BrowseDataViewMixin, PootleDetailView):
+class PootleBrowseView(BrowseDataViewMixin, ConditionalGetMixin,
+                       PootleDetailView):
     template_name = 'browser/index.html'
 
     @property
     def path(self):
         return self.request.path
 
+    def get_etag(self):
+        etag = super(PootleBrowseView, self).get_etag()
+        if etag is None:
+            return None
+
+        # Pages embed the CSRF token and the top scorers of the last days,
+        # and reference versioned static files
+        get_token(self.request)
+        csrf_hash = hashlib.sha1(self.request.META['CSRF_COOKIE']).hexdigest()
+        return u'%s-%s-%s-%s' % (etag, csrf_hash[:8], date.today(),
+                                 __version__)
+
     def get_context_data(self, *args, **kwargs):
         filters = {}
         can_translate = False
@@ -184,6 +262,9 @@ class BaseBrowseDataJSON(BrowseDataViewMixin):
     def path(self):
         return self.kwargs['path']
 
+    def get_etag(self):
+        return BrowseDataViewMixin.get_etag(self)
+
     def get_context_data(self, *args, **kwargs):
         return self.get_browsing_data()
 
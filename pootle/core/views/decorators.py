@@ -9,6 +9,7 @@
 import functools
 
 from django.core.exceptions import PermissionDenied
+from django.utils.cache import add_never_cache_headers
 
 from pootle.i18n.gettext import ugettext as _
 from pootle_app.models.permissions import get_matching_permissions
@@ -49,6 +50,20 @@ def set_permissions(f):
     return method_wrapper
 
 
+def never_cache_unless_validated(f):
+    """Like `never_cache`, but leaves alone responses carrying an `ETag`,
+    as clients can revalidate them instead.
+    """
+
+    @functools.wraps(f)
+    def method_wrapper(self, request, *args, **kwargs):
+        response = f(self, request, *args, **kwargs)
+        if not response.has_header('ETag'):
+            add_never_cache_headers(response)
+        return response
+    return method_wrapper
+
+
 def requires_permission(permission):
 
     def class_wrapper(f):
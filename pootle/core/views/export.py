@@ -7,12 +7,16 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import os
 from itertools import groupby
 
+from django.db.models import Q
 from django.forms import ValidationError
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 
 from pootle.core.helpers import get_filter_name
+from pootle.core.url_helpers import split_pootle_path
+from pootle_store.exporters import EXPORTERS
 from pootle_store.forms import UnitExportForm
 from pootle_store.unit.search import DBSearchBackend
 
@@ -22,6 +26,9 @@ from .base import PootleDetailView
 # Limit export view results to this amount of units
 UNITS_LIMIT = 500
 
+# Number of units fetched at once by streamed exports
+EXPORT_BATCH_SIZE = 500
+
 
 class PootleExportView(PootleDetailView):
     template_name = 'editor/export_view.html'
@@ -30,10 +37,7 @@ class PootleExportView(PootleDetailView):
     def path(self):
         return self.request.path.replace("export-view/", "")
 
-    def get_context_data(self, *args, **kwargs):
-        ctx = {}
-        filter_name, filter_extra = get_filter_name(self.request.GET)
-
+    def get_search_backend(self):
         form_data = self.request.GET.copy()
         form_data["path"] = self.path
 
@@ -43,9 +47,78 @@ class PootleExportView(PootleDetailView):
             raise Http404(
                 ValidationError(search_form.errors).messages)
 
-        total, start_, end_, units_qs = DBSearchBackend(
-            self.request.user, **search_form.cleaned_data
-        ).search()
+        return DBSearchBackend(self.request.user, **search_form.cleaned_data)
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format')
+        if export_format is None:
+            return super(PootleExportView, self).get(request, *args, **kwargs)
+
+        if export_format not in EXPORTERS:
+            raise Http404('Unsupported export format: %s' % export_format)
+
+        self.object = self.get_object()
+        return self.stream_export(EXPORTERS[export_format])
+
+    def get_export_filename(self, exporter):
+        language_code, project_code, dir_path, filename = \
+            split_pootle_path(self.path)
+        parts = filter(None, [
+            language_code,
+            project_code,
+            dir_path.strip('/').replace('/', '-'),
+            os.path.splitext(filename)[0],
+        ])
+        return u'%s.%s' % ('-'.join(parts) or 'export', exporter.extension)
+
+    def iter_export_units(self, units_qs):
+        """Yields the units of `units_qs` sorted by store, fetching them in
+        batches of `EXPORT_BATCH_SIZE` which start after the last unit of
+        the previous batch.
+        """
+        # Exporters group units by store: ignore any requested sorting
+        units_qs = (
+            units_qs.order_by('store__pootle_path', 'index', 'pk')
+                    .select_related('store')
+        )
+        batch = list(units_qs[:EXPORT_BATCH_SIZE])
+        while batch:
+            for unit in batch:
+                yield unit
+
+            if len(batch) < EXPORT_BATCH_SIZE:
+                break
+
+            last = batch[-1]
+            path = last.store.pootle_path
+            batch = list(units_qs.filter(
+                Q(store__pootle_path__gt=path) |
+                Q(store__pootle_path=path, index__gt=last.index) |
+                Q(store__pootle_path=path, index=last.index, pk__gt=last.pk)
+            )[:EXPORT_BATCH_SIZE])
+
+    def stream_export(self, exporter_class):
+        """Streams all units matching the search as a file, without holding
+        them in memory.
+        """
+        exporter = exporter_class(language=self.language,
+                                  source_language=self.source_language)
+        units_qs = self.get_search_backend().results
+
+        response = StreamingHttpResponse(
+            exporter.iter_content(self.iter_export_units(units_qs)),
+            content_type=exporter.content_type,
+        )
+        response['Content-Disposition'] = (
+            'attachment; filename="%s"' % self.get_export_filename(exporter)
+        )
+        return response
+
+    def get_context_data(self, *args, **kwargs):
+        ctx = {}
+        filter_name, filter_extra = get_filter_name(self.request.GET)
+
+        total, start_, end_, units_qs = self.get_search_backend().search()
 
         units_qs = units_qs.select_related('store')
 
@@ -10,6 +10,8 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.http import Http404
+from django.utils.cache import (get_conditional_response, patch_cache_control,
+                                quote_etag)
 from django.utils.decorators import method_decorator
 
 from pootle.i18n.gettext import ugettext as _
@@ -108,3 +110,36 @@ class PootleJSONMixin(object):
         response_kwargs.setdefault('content_type', self.content_type)
         return self.response_class(self.get_response_data(context),
                                    **response_kwargs)
+
+
+class ConditionalGetMixin(object):
+    """Answers GET requests with `304 Not Modified` when the client's copy
+    is still current, without building the response.
+
+    Views provide the current version of their response via `get_etag()`.
+    Responses are then revalidated by clients on every request, and kept
+    private for authenticated users.
+    """
+
+    def get_etag(self):
+        """Returns the entity tag of the response, or `None` if it can't be
+        determined cheaply.
+        """
+        return None
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        if etag is None:
+            return super(ConditionalGetMixin, self).get(request, *args,
+                                                        **kwargs)
+
+        etag = quote_etag(etag)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super(ConditionalGetMixin, self).get(request, *args,
+                                                            **kwargs)
+
+        response['ETag'] = etag
+        patch_cache_control(response, no_cache=True,
+                            private=request.user.is_authenticated)
+        return response
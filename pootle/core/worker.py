@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import importlib
+import logging
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import DatabaseError
+
+from pootle.core.log import flush_action_log
+from pootle.core.metrics import MetricsWorker
+
+
+logger = logging.getLogger('rq.worker')
+
+
+class Worker(MetricsWorker):
+    """RQ worker which loads modules and warms up in-process caches once,
+    before forking work horses, so that jobs don't pay for them every time.
+
+    This is the default worker class of the `rqworker` command.
+    """
+
+    #: Modules which are loaded lazily but may be needed by jobs
+    preload_modules = (
+        'pootle_misc.checks',
+        'pootle.core.checks.checker',
+    )
+
+    def __init__(self, *args, **kwargs):
+        super(Worker, self).__init__(*args, **kwargs)
+        self.preload()
+
+    def perform_job(self, *args, **kwargs):
+        try:
+            return super(Worker, self).perform_job(*args, **kwargs)
+        finally:
+            # Work horses exit right after the job without shutting down
+            # logging, which would lose the buffered action log records
+            flush_action_log()
+
+    def preload(self):
+        for module in self.preload_modules:
+            importlib.import_module(module)
+
+        try:
+            self.warm_up()
+        except (DatabaseError, ObjectDoesNotExist):
+            logger.warning('Could not warm up caches', exc_info=True)
+
+    def warm_up(self):
+        from django.contrib.auth import get_user_model
+
+        from pootle_app.models import Directory
+        from pootle_store.models import get_tm_broker
+
+        Directory.objects.root
+        Directory.objects.projects
+        get_user_model().objects.get_system_user()
+        # Loads the TM search backend, if configured
+        get_tm_broker()
@@ -6,7 +6,7 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
-from django.utils.cache import add_never_cache_headers
+from django.utils.cache import add_never_cache_headers, cc_delim_re
 from django.utils.deprecation import MiddlewareMixin
 
 
@@ -15,6 +15,9 @@ class CacheAnonymousOnly(MiddlewareMixin):
 
     def process_response(self, request, response):
         if hasattr(request, 'user') and request.user.is_authenticated:
-            add_never_cache_headers(response)
+            # Views marking responses as private handle caching themselves
+            cache_control = response.get('Cache-Control', '')
+            if 'private' not in cc_delim_re.split(cache_control):
+                add_never_cache_headers(response)
 
         return response
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+from django.core.exceptions import MiddlewareNotUsed
+
+from pootle.core import metrics
+
+
+class MetricsMiddleware(object):
+    """Records the metrics of every request under the name of the view
+    handling it.
+
+    Disabled unless the `ZING_METRICS` setting configures a sink.
+    """
+
+    def __init__(self, get_response):
+        if not metrics.is_enabled():
+            raise MiddlewareNotUsed
+        metrics.install()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with metrics.record('view', 'unresolved') as record:
+            response = self.get_response(request)
+            match = getattr(request, 'resolver_match', None)
+            if match is not None:
+                record.name = match.view_name or match._func_path
+
+        return response
@@ -14,6 +14,7 @@ from django.db import models
 from django.utils import timezone
 from django.utils.functional import cached_property
 
+from pootle.core.mixins.treeitem import CachedMethods
 from pootle.core.url_helpers import split_pootle_path
 from pootle.core.utils.list import flatten
 from pootle_project.models import Project
@@ -123,9 +124,18 @@ class DueDate(models.Model):
         if user is not None:
             due_dates = due_dates.accessible_by(user)
 
+        due_dates = list(due_dates)
         if not due_dates:
             return TaskResultSet([])
 
+        # Retrieve stats for all due dates at once
+        stats = Stats.get_many(
+            [due_date.pootle_path for due_date in due_dates],
+            names=[CachedMethods.WORDCOUNT_STATS, CachedMethods.CHECKS],
+        )
+        for due_date in due_dates:
+            due_date.stats = stats[due_date.pootle_path]
+
         now = now or timezone.now()
         due_tasks = list(flatten([
             due_date.get_pending_tasks(now) for due_date in due_dates
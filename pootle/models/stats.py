@@ -10,6 +10,7 @@ import logging
 
 from django.utils.encoding import iri_to_uri
 
+from django_redis import get_redis_connection
 from django_rq.queues import get_connection
 
 from pootle.core.cache import get_cache
@@ -20,6 +21,28 @@ logger = logging.getLogger('stats')
 cache = get_cache('stats')
 
 
+def make_cache_key(path, name):
+    return iri_to_uri('%s:%s' % (path, name))
+
+
+def get_many_values(keys):
+    """Retrieves the values of several stats cache `keys` in a single
+    round-trip.
+
+    :return: list of values in the same order as `keys`, with `None` for
+        missing values.
+    """
+    if not keys:
+        return []
+
+    conn = get_redis_connection('stats')
+    results = conn.mget([str(cache.make_key(key)) for key in keys])
+    return [
+        value if value is None else cache.client.decode(value)
+        for value in results
+    ]
+
+
 class Stats(object):
     """Retrieves stats directly from the cache.
 
@@ -28,10 +51,43 @@ class Stats(object):
     class. It also doesn't account for children stats.
     """
 
-    def __init__(self, path, *args, **kwargs):
+    def __init__(self, path, values=None, *args, **kwargs):
+        """
+        :param values: optional dictionary of preloaded stats values, keyed
+            by cached method name. When provided, the cache is not queried.
+        """
         self.path = path
+        self.values = values
         self.r_con = get_connection()
 
+    @classmethod
+    def get_many(cls, paths, names=None):
+        """Retrieves stats for several paths with a single cache read.
+
+        :param paths: list of paths to retrieve stats for.
+        :param names: list of cached method names to preload. Defaults to
+            all the values exposed by `Stats`.
+        :return: dictionary mapping each path to its `Stats` instance.
+        """
+        if names is None:
+            names = [
+                CachedMethods.WORDCOUNT_STATS, CachedMethods.CHECKS,
+                CachedMethods.SUGGESTIONS, CachedMethods.LAST_ACTION,
+                CachedMethods.LAST_UPDATED,
+            ]
+
+        keys = [(path, name) for path in paths for name in names]
+        results = get_many_values(
+            [make_cache_key(path, name) for path, name in keys]
+        )
+
+        values = {path: {} for path in paths}
+        for (path, name), value in zip(keys, results):
+            if value is not None:
+                values[path][name] = value
+
+        return {path: cls(path, values=values[path]) for path in paths}
+
     @property
     def total(self):
         return self.get_wordcount()['total']
@@ -69,12 +125,15 @@ class Stats(object):
         return self.get_value(CachedMethods.LAST_UPDATED)
 
     def make_cache_key(self, name):
-        return iri_to_uri('%s:%s' % (self.path, name))
+        return make_cache_key(self.path, name)
 
     def get_value(self, name, default=None):
         """get stat value from cache"""
         key = self.make_cache_key(name)
-        result = cache.get(key)
+        if self.values is not None:
+            result = self.values.get(name)
+        else:
+            result = cache.get(key)
         if result is None:
             logger.debug(u'Cache miss %s for %s', name, key)
             return default
@@ -59,7 +59,8 @@ const Search = React.createClass({
     const { items } = this.props;
     let loadMoreBtn;
 
-    if (items.count > 0 && items.length < items.count) {
+    if (items.count > 0 && items.length < items.count &&
+        items.hasMorePages) {
       loadMoreBtn = (
         <button
           className="btn"
@@ -6,6 +6,7 @@
  * AUTHORS file for copyright and authorship information.
  */
 
+import $ from 'jquery';
 import _ from 'underscore';
 
 
@@ -14,6 +15,9 @@ const AdminAPIMixin = {
   initialize() {
     this.count = 0;
     this.page = 0;
+    this.cursor = null;
+    this.isCursorPaginated = false;
+    this.hasMorePages = true;
     this.keywords = '';
 
     this.on('add', this.incrCount);
@@ -22,6 +26,12 @@ const AdminAPIMixin = {
 
   parse(response) {
     this.count = response.count;
+    // Cursor-paginated responses always include `next`, which is empty
+    // for the last page
+    if (_.has(response, 'next')) {
+      this.isCursorPaginated = true;
+      this.nextCursor = response.next || null;
+    }
 
     return response.models;
   },
@@ -40,8 +50,20 @@ const AdminAPIMixin = {
   },
 
   fetchNextPage(opts) {
+    if (!this.hasMorePages) {
+      // The cached `count` may be stale: don't fetch pages past the last
+      return $.Deferred().resolve().promise();
+    }
+
     const newPage = this.page + 1;
-    const pageData = newPage === 1 ? {} : { p: newPage };
+    let pageData = {};
+    if (this.isCursorPaginated) {
+      if (this.cursor !== null) {
+        pageData = { cursor: this.cursor };
+      }
+    } else if (newPage !== 1) {
+      pageData = { p: newPage };
+    }
     const keywordsData = this.keywords === '' ? {} : { q: this.keywords };
     const reqData = _.extend({}, pageData, keywordsData);
 
@@ -50,6 +72,10 @@ const AdminAPIMixin = {
 
     return this.fetch(fetchOpts).done(() => {
       this.page = newPage;
+      if (this.isCursorPaginated) {
+        this.cursor = this.nextCursor;
+        this.hasMorePages = this.cursor !== null;
+      }
     });
   },
 
@@ -65,6 +91,8 @@ const AdminAPIMixin = {
   setSearch(keywords) {
     this.keywords = keywords;
     this.page = 0;
+    this.cursor = null;
+    this.hasMorePages = true;
   },
 
 };
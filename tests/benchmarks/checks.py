@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from pootle.core.checks.checker import QualityCheckUpdater
+
+from .generators import make_db_store
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='quality-checks')
+def test_bench_quality_check_updater(measure, bench_tp, store_size):
+    make_db_store(bench_tp, store_size)
+
+    measure(
+        lambda: QualityCheckUpdater(translation_project=bench_tp).update()
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='store-checks-stats')
+def test_bench_store_get_checks(measure, bench_tp, store_size):
+    store = make_db_store(bench_tp, store_size)
+    QualityCheckUpdater(translation_project=bench_tp).update()
+
+    measure(store._get_checks)
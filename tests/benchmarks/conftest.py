@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import inspect
+import threading
+from contextlib import contextmanager
+from functools import wraps
+
+import pytest
+
+
+#: Store sizes benchmarked by default. Pass `--bench-sizes` to override
+DEFAULT_SIZES = '1000,10000'
+
+#: Methods of `fakeredis.FakeStrictRedis` which don't issue commands
+NON_COMMAND_METHODS = (
+    'from_url', 'lock', 'pipeline', 'pubsub', 'register_script',
+    'transaction',
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--bench-sizes',
+        dest='bench_sizes',
+        default=DEFAULT_SIZES,
+        help='Comma-separated numbers of units of the generated stores '
+             '(default: %s).' % DEFAULT_SIZES,
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if 'store_size' in metafunc.fixturenames:
+        sizes = [
+            int(size)
+            for size in metafunc.config.getoption('bench_sizes').split(',')
+        ]
+        metafunc.parametrize('store_size', sizes,
+                             ids=['%dunits' % size for size in sizes])
+
+
+class CallCounter(object):
+    """Counts calls to the wrapped functions, ignoring nested calls among
+    them.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.local = threading.local()
+
+    def wrap(self, func):
+        @wraps(func)
+        def _wrapper(*args, **kwargs):
+            depth = getattr(self.local, 'depth', 0)
+            if depth == 0:
+                self.count += 1
+            self.local.depth = depth + 1
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.local.depth = depth
+
+        return _wrapper
+
+
+@contextmanager
+def count_redis_commands():
+    """Counts the commands sent to Redis within the context, both by real
+    and fake Redis clients. Commands in pipelines are counted individually.
+    """
+    import fakeredis
+    from redis import StrictRedis
+    from redis.client import BasePipeline
+
+    counter = CallCounter()
+    patched = [
+        (StrictRedis, 'execute_command'),
+        (BasePipeline, 'execute_command'),
+    ]
+    patched.extend(
+        (fakeredis.FakeStrictRedis, name)
+        for name, value in vars(fakeredis.FakeStrictRedis).items()
+        if (not name.startswith('_') and name not in NON_COMMAND_METHODS and
+            inspect.isfunction(value))
+    )
+
+    originals = [(cls, name, vars(cls)[name]) for cls, name in patched]
+    for cls, name, original in originals:
+        setattr(cls, name, counter.wrap(original))
+    try:
+        yield counter
+    finally:
+        for cls, name, original in originals:
+            setattr(cls, name, original)
+
+
+@contextmanager
+def count_queries():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        yield context
+
+
+@pytest.fixture
+def measure(benchmark):
+    """Benchmarks a function, recording the number of DB queries and Redis
+    commands it performs in the benchmark's `extra_info`.
+
+    Counts are taken from an extra run which also serves as warmup, so
+    that counting doesn't distort timings.
+    """
+
+    def _measure(func, setup=None, rounds=5):
+        args, kwargs = setup() if setup is not None else ((), {})
+        with count_queries() as queries, count_redis_commands() as redis:
+            func(*args, **kwargs)
+        benchmark.extra_info.update({
+            'queries': len(queries),
+            'redis_commands': redis.count,
+        })
+
+        return benchmark.pedantic(func, setup=setup, rounds=rounds)
+
+    return _measure
+
+
+@pytest.fixture
+def bench_tp(tp0):
+    """Translation project to generate benchmark data in."""
+    return tp0
+
+
+@pytest.fixture
+def bench_tp_disk(project0_disk):
+    """Translation project with on-disk files to generate benchmark data
+    in.
+    """
+    from tests.factories import LanguageDBFactory, TranslationProjectFactory
+
+    return TranslationProjectFactory(project=project0_disk,
+                                     language=LanguageDBFactory())
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+"""Synthetic data generators for benchmarks.
+
+All the data is derived from a seed, so that benchmarks are reproducible
+across runs and machines.
+"""
+
+import random
+
+from translate.storage import po
+
+
+#: Number of units inserted per query
+BATCH_SIZE = 1000
+
+WORDS = (
+    u'file', u'open', u'save', u'project', u'language', u'translation',
+    u'error', u'warning', u'the', u'a', u'of', u'to', u'and', u'is', u'not',
+    u'could', u'be', u'found', u'please', u'try', u'again', u'later',
+    u'%s', u'%d', u'<b>', u'</b>', u'&amp;', u'user', u'settings', u'new',
+)
+
+PUNCTUATION = (u'', u'.', u'!', u'?', u':', u'...')
+
+
+def make_string(rng, min_words=1, max_words=12):
+    """Returns a sentence made up of random words."""
+    words = [rng.choice(WORDS)
+             for i in range(rng.randint(min_words, max_words))]
+    return u'%s%s' % (u' '.join(words).capitalize(), rng.choice(PUNCTUATION))
+
+
+def make_translation(source):
+    return u'[%s]' % source.upper()
+
+
+def make_strings(size, seed=0):
+    """Returns a list of `size` random strings."""
+    rng = random.Random(seed)
+    return [make_string(rng) for i in xrange(size)]
+
+
+def make_file_store(size, seed=0, translated=0.5, changed=0.0,
+                    inserted=0.0):
+    """Creates an in-memory PO file with `size` units.
+
+    :param translated: ratio of translated units.
+    :param changed: ratio of units whose translation differs from the one
+        produced by the same arguments and `changed=0`. This allows
+        creating files which update other generated files.
+    :param inserted: ratio of additional untranslated units interleaved
+        with the ones produced by the same arguments and `inserted=0`.
+    """
+    rng = random.Random(seed)
+    change_rng = random.Random(seed + 1)
+    insert_rng = random.Random(seed + 2)
+    store = po.pofile()
+    store.settargetlanguage('language0')
+
+    for i in xrange(size):
+        if insert_rng.random() < inserted:
+            store.addsourceunit(
+                u'%s (inserted %d)' % (make_string(insert_rng), i),
+            )
+        source = u'%s (%d)' % (make_string(rng), i)
+        unit = store.addsourceunit(source)
+        unit.addlocation(u'generated.c:%d' % i)
+        if rng.random() < translated:
+            target = make_translation(source)
+            if change_rng.random() < changed:
+                target = u'%s *' % target
+            unit.target = target
+
+    return store
+
+
+def make_db_store(translation_project, size, parent=None, name=None,
+                  seed=0, translated=0.5):
+    """Creates a DB store with `size` units, with the same contents as
+    `make_file_store()` would produce for the same arguments.
+
+    Units are inserted in bulk, bypassing `Store.update()`, so that large
+    stores can be created in a reasonable time.
+    """
+    from pootle.core.models import Revision
+    from pootle_store.constants import PARSED, UNIT_INDEX_GAP
+    from pootle_store.models import Unit
+
+    from tests.factories import StoreDBFactory
+
+    parent = parent or translation_project.directory
+    if name is None:
+        name = 'store%d.po' % translation_project.stores.count()
+    store = StoreDBFactory(translation_project=translation_project,
+                           parent=parent, name=name,
+                           pootle_path=parent.pootle_path + name)
+
+    revision = Revision.incr()
+    file_store = make_file_store(size, seed=seed, translated=translated)
+    units = []
+    for index, file_unit in enumerate(file_store.units[1:], start=1):
+        unit = Unit(store=store, index=index * UNIT_INDEX_GAP)
+        unit.update(file_unit)
+        unit.prepare_save(revision=revision)
+        units.append(unit)
+        if len(units) >= BATCH_SIZE:
+            Unit.objects.bulk_create(units)
+            units = []
+    Unit.objects.bulk_create(units)
+
+    store.state = PARSED
+    store.save()
+    return store
+
+
+def make_tree(translation_project, width, depth, stores_per_dir=1,
+              units_per_store=10, seed=0):
+    """Creates a tree of directories and stores under the directory of
+    `translation_project`.
+
+    :param width: number of child directories of every directory.
+    :param depth: number of levels of directories below the root one.
+    :return: the list of created stores.
+    """
+    from tests.factories import DirectoryFactory
+
+    stores = []
+    parents = [translation_project.directory]
+    for level in range(depth + 1):
+        children = []
+        for parent in parents:
+            for i in range(stores_per_dir):
+                stores.append(make_db_store(
+                    translation_project, units_per_store, parent=parent,
+                    name='level%d-store%d.po' % (level, i),
+                    seed=seed + len(stores),
+                ))
+            if level < depth:
+                children.extend(
+                    DirectoryFactory(name='dir%d-%d' % (level, i),
+                                     parent=parent)
+                    for i in range(width)
+                )
+        parents = children
+
+    return stores
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from pootle.core.utils.multistring import SEPARATOR
+from pootle_store.diff import DBStore
+from pootle_store.models import Unit
+from pootle_store.unit.results import ViewRowResults
+
+from .generators import make_db_store, make_strings
+
+
+@pytest.mark.benchmark(group='multistring')
+def test_bench_multistring_from_db(measure, store_size):
+    """Loads DB values, one in ten of which has plural forms, and reads
+    their first form.
+    """
+    strings = make_strings(store_size)
+    db_strings = [
+        SEPARATOR.join([string, string]) if i % 10 == 0 else string
+        for i, string in enumerate(strings)
+    ]
+    field = Unit._meta.get_field('source_f')
+
+    def _load():
+        return [len(field.from_db_value(db_string, None, None, None))
+                for db_string in db_strings]
+
+    measure(_load)
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='multistring-db-store')
+def test_bench_db_store_units(measure, bench_tp, store_size):
+    store = make_db_store(bench_tp, store_size)
+
+    def _load():
+        db_store = DBStore(store)
+        return [(unit.source, unit.target)
+                for unit in map(db_store.get_unit, db_store.units)]
+
+    measure(_load)
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='multistring-view-rows')
+def test_bench_view_row_results(measure, bench_tp, store_size):
+    store = make_db_store(bench_tp, store_size)
+
+    measure(lambda: ViewRowResults(store.unit_set.all()).data)
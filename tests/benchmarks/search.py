@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from pootle_store.unit.search import DBSearchBackend
+
+from .generators import make_db_store
+
+
+SEARCH_KWARGS = {
+    'category': None,
+    'checks': [],
+    'month': None,
+    'search': None,
+    'sfields': [],
+    'soptions': [],
+    'user': None,
+}
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='unit-search')
+@pytest.mark.parametrize('search_kwargs', [
+    {'filter': 'untranslated'},
+    {'search': u'file', 'sfields': ['source', 'target']},
+    {'search': u'file', 'sfields': ['source'], 'soptions': ['exact']},
+], ids=['filter', 'text', 'exact'])
+def test_bench_db_search_backend(measure, admin, bench_tp, store_size,
+                                 search_kwargs):
+    store = make_db_store(bench_tp, store_size)
+    kwargs = dict(SEARCH_KWARGS,
+                  language_code=bench_tp.language.code,
+                  project_code=bench_tp.project.code,
+                  dir_path='', filename=store.name,
+                  **search_kwargs)
+
+    def _search():
+        total, start, end, units = DBSearchBackend(admin, **kwargs).search()
+        return total, list(units)
+
+    total, units = measure(_search)
+
+    assert total and units
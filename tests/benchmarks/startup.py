@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+SETUP_SCRIPT = '''
+from pootle import syspath_override
+import django
+
+django.setup()
+'''
+
+
+@pytest.mark.benchmark(group='startup')
+def test_bench_startup(benchmark, tests_dir):
+    """Starts a Python process which sets up Django, as every management
+    command and RQ worker does.
+    """
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='pootle.settings',
+        ZING_SETTINGS=tests_dir('settings.py'),
+    )
+
+    def _startup():
+        subprocess.check_call([sys.executable, '-c', SETUP_SCRIPT], env=env,
+                              cwd=tests_dir('..'))
+
+    benchmark.pedantic(_startup, rounds=10, warmup_rounds=1)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from .generators import make_tree
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='tree-stats')
+@pytest.mark.parametrize('width, depth', [
+    (100, 1),
+    (1, 15),
+    (4, 3),
+], ids=['wide', 'deep', 'bushy'])
+def test_bench_tree_get_stats(measure, flush_stats, bench_tp, width, depth):
+    """Retrieves the cached stats of a translation project, including its
+    children's.
+    """
+    make_tree(bench_tp, width, depth)
+    for store in bench_tp.stores.live().iterator():
+        store.update_all_cache()
+
+    stats = measure(lambda: bench_tp.directory.get_stats())
+
+    assert stats['total']
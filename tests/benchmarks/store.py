@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+from itertools import cycle
+
+import pytest
+
+from pootle_store.diff import DBStore, FileStore, StoreDiff
+from pootle_store.syncer import PoStoreSyncer
+from pootle_store.updater import StoreUpdater
+
+from .generators import make_db_store, make_file_store
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='store-diff')
+def test_bench_store_diff(measure, bench_tp, store_size):
+    store = make_db_store(bench_tp, store_size)
+    source = make_file_store(store_size + store_size // 10, changed=0.1)
+    revision = store.get_max_unit_revision()
+
+    diff = measure(lambda: StoreDiff(store, source, revision).diff())
+
+    assert diff is not None
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='store-diff-compare')
+def test_bench_store_diff_compare_units(measure, bench_tp, store_size):
+    """Compares every DB unit with its file counterpart, as done by
+    `StoreDiff` when looking for updated units.
+    """
+    store = make_db_store(bench_tp, store_size)
+    db_store = DBStore(store)
+    file_store = FileStore(make_file_store(store_size, changed=0.1))
+    uids = [uid for uid in db_store.units if uid in file_store.units]
+
+    def _compare():
+        return [db_store.get_unit(uid) != file_store.get_unit(uid)
+                for uid in uids]
+
+    changed = measure(_compare)
+
+    assert any(changed)
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='store-update')
+def test_bench_store_update(measure, bench_tp, store_size):
+    """Updates a store with alternating versions of its file, so that every
+    round changes 10% of its translations.
+    """
+    store = make_db_store(bench_tp, store_size)
+    sources = cycle([
+        make_file_store(store_size, changed=0.1),
+        make_file_store(store_size),
+    ])
+
+    def _update(source):
+        StoreUpdater(store).update(
+            source, store_revision=store.get_max_unit_revision(),
+        )
+
+    measure(_update, setup=lambda: ((next(sources), ), {}))
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='store-update-inserts')
+def test_bench_store_update_inserts(measure, bench_tp, store_size):
+    """Updates a store with alternating versions of its file, so that every
+    round either inserts or removes units spread over the whole store.
+    """
+    store = make_db_store(bench_tp, store_size)
+    sources = cycle([
+        make_file_store(store_size, inserted=0.001),
+        make_file_store(store_size),
+    ])
+
+    def _update(source):
+        StoreUpdater(store).update(
+            source, store_revision=store.get_max_unit_revision(),
+        )
+
+    measure(_update, setup=lambda: ((next(sources), ), {}))
+
+
+@pytest.mark.django_db
+@pytest.mark.benchmark(group='store-sync')
+def test_bench_store_sync(measure, bench_tp_disk, store_size):
+    """Writes a store to disk, parsing its existing file first."""
+    store = make_db_store(bench_tp_disk, store_size)
+    store.sync()
+
+    def _sync():
+        PoStoreSyncer(store).sync(update_structure=True, conservative=False,
+                                  only_newer=False)
+
+    measure(_sync)
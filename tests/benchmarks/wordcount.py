@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from pootle.core.utils.wordcount import wordcount
+
+from .generators import make_strings
+
+
+@pytest.mark.benchmark(group='wordcount')
+def test_bench_wordcount(measure, store_size):
+    strings = make_strings(store_size)
+
+    counts = measure(lambda: [wordcount(string) for string in strings])
+
+    assert len(counts) == store_size
@@ -11,6 +11,7 @@ import pytest
 from django.core.exceptions import ImproperlyConfigured
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
 
 
 @pytest.mark.cmd
@@ -79,3 +80,43 @@ def test_generate_invoices_generate_report(settings, member, capfd, tmpdir):
 
     out, _ = capfd.readouterr()
     assert 'JSON report written to' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_generate_invoices_jobs(settings, member, member2, capfd, tmpdir,
+                                mailoutbox, jobs):
+    if jobs > 1 and connection.vendor != 'sqlite':
+        # Worker processes are forked and only see the test's uncommitted
+        # data on the in-memory sqlite DB
+        pytest.skip('Forked workers need the in-memory sqlite DB')
+
+    settings.ZING_INVOICES_RECIPIENTS = {
+        username: {
+            'name': username,
+            'paid_by': 'foo',
+            'wire_info': 'foo',
+            'email': '%s@example.org' % username,
+            'accounting_email': 'accounting@example.org',
+        }
+        for username in ('member', 'member2')
+    }
+    settings.ZING_INVOICES_DIRECTORY = tmpdir.strpath
+    call_command('generate_invoices', '--jobs=%d' % jobs, '--month=2000-01',
+                 '--send-emails', '--generate-report')
+
+    out, _ = capfd.readouterr()
+    assert 'Generated invoices for member.' in out
+    assert 'Generated invoices for member2.' in out
+    assert out.count('Email sent') == 2
+    assert len(mailoutbox) == 2
+    assert tmpdir.join('2000-01', 'Invoice - member - 2000-01.html').check()
+    assert tmpdir.join('2000-01', 'Invoice - member2 - 2000-01.html').check()
+
+
+@pytest.mark.cmd
+def test_generate_invoices_invalid_jobs():
+    with pytest.raises(CommandError) as e:
+        call_command('generate_invoices', '--jobs=0')
+    assert '--jobs' in str(e)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from pootle_statistics.models import DailyContribution
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_contributions(capfd):
+    """Rebuild all daily contributions."""
+    count = DailyContribution.objects.count()
+    DailyContribution.objects.all().delete()
+    call_command('refresh_contributions')
+    out, err = capfd.readouterr()
+    assert '%d rows written' % count in out
+    assert DailyContribution.objects.count() == count
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_contributions_user(capfd, member):
+    """Rebuild daily contributions for a given user."""
+    contributions = DailyContribution.objects.filter(user=member)
+    count = contributions.count()
+    contributions.delete()
+    call_command('refresh_contributions', '--user=member')
+    out, err = capfd.readouterr()
+    assert '%d rows written' % count in out
+    assert contributions.count() == count
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_contributions_date_range(capfd):
+    """Rebuild daily contributions for a date range."""
+    call_command('refresh_contributions', '--date-from=2000-01-01',
+                 '--date-to=2000-01-02')
+    out, err = capfd.readouterr()
+    assert '2000-01-01: 0 rows' in out
+    assert '2000-01-02: 0 rows' in out
+    assert '0 rows written' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_contributions_bad_date():
+    with pytest.raises(CommandError) as e:
+        call_command('refresh_contributions', '--date-to=2000-01-32')
+    assert 'YYYY-MM-DD' in str(e)
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.core.management import call_command
+
+from pootle_statistics.leaderboard import Leaderboard
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_leaderboard(capfd, flush_leaderboard):
+    assert not Leaderboard.is_ready()
+    call_command('refresh_leaderboard')
+    out, err = capfd.readouterr()
+    assert 'Leaderboard refreshed' in out
+    assert Leaderboard.is_ready()
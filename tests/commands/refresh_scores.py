@@ -9,6 +9,10 @@
 import pytest
 
 from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Sum
+
+from pootle_statistics.models import ScoreLog
 
 
 @pytest.mark.cmd
@@ -48,3 +52,66 @@ def test_refresh_scores_reset(capfd):
     call_command('refresh_scores', '--reset')
     out, err = capfd.readouterr()
     assert 'Scores for all users were reset to 0.' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_scores_recalculate_totals(capfd, member):
+    """User scores are set to the aggregate of their score deltas."""
+    member.score = -1
+    member.save()
+    call_command('refresh_scores', '--user=member', '--chunk-size=3')
+    out, err = capfd.readouterr()
+    member.refresh_from_db()
+    expected = ScoreLog.objects.filter(user=member).aggregate(
+        total=Sum('score_delta'))['total'] or 0
+    assert round(member.score, 3) == round(expected, 3)
+    assert 'score logs, ' in out
+    assert 'Score for user member set to' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_scores_recalculate_changed_rows(capfd, member):
+    """Out-of-date score deltas get fixed."""
+    scorelog = ScoreLog.objects.filter(user=member).first()
+    expected = scorelog.get_score_delta()
+    ScoreLog.objects.filter(id=scorelog.id).update(score_delta=expected + 10)
+    call_command('refresh_scores', '--user=member')
+    out, err = capfd.readouterr()
+    scorelog.refresh_from_db()
+    assert scorelog.score_delta == expected
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_scores_resume_from(capfd, member):
+    """Score logs up to the given ID are skipped."""
+    scorelog = ScoreLog.objects.filter(user=member).order_by('id').first()
+    wrong_delta = scorelog.get_score_delta() + 10
+    ScoreLog.objects.filter(id=scorelog.id).update(score_delta=wrong_delta)
+    call_command('refresh_scores', '--user=member',
+                 '--resume-from=%d' % scorelog.id)
+    out, err = capfd.readouterr()
+    scorelog.refresh_from_db()
+    assert scorelog.score_delta == wrong_delta
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_scores_date_range(capfd):
+    """Limit the recalculation to a date range."""
+    call_command('refresh_scores', '--date-from=2000-01-01',
+                 '--date-to=2000-01-31')
+    out, err = capfd.readouterr()
+    assert 'Recalculating 0 score logs...' in out
+    assert 'Score for user system set to' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_refresh_scores_bad_date():
+    """Invalid dates are reported."""
+    with pytest.raises(CommandError) as e:
+        call_command('refresh_scores', '--date-from=2000-13-01')
+    assert 'YYYY-MM-DD' in str(e)
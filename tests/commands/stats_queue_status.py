@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import json
+from datetime import timedelta
+
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from rq.job import Job
+from rq.utils import utcnow
+
+
+def noop():
+    pass
+
+
+@pytest.fixture
+def stats_queue(revision):
+    """Populates Redis with queued and failed jobs and stats data."""
+    from django_rq.queues import get_failed_queue, get_queue
+
+    from pootle.core.mixins.treeitem import (
+        KEY_DIRTY_TREEITEMS, KEY_STATS_LAST_JOB_PREFIX, count_processed_job)
+
+    queue = get_queue()
+    connection = queue.connection
+    for minutes in (10, 1):
+        job = Job.create(noop, connection=connection, origin=queue.name)
+        job.enqueued_at = utcnow() - timedelta(minutes=minutes)
+        job.save()
+        queue.push_job_id(job.id)
+
+    failed_queue = get_failed_queue()
+    for func in (noop, noop, len):
+        job = Job.create(func, args=([], ), connection=connection)
+        failed_queue.quarantine(job, exc_info='Traceback')
+
+    connection.zincrby(KEY_DIRTY_TREEITEMS, '/language0/', 3)
+    connection.zincrby(KEY_DIRTY_TREEITEMS, '/projects/', 1)
+    connection.zincrby(KEY_DIRTY_TREEITEMS, '/language1/', 0)
+
+    connection.set(KEY_STATS_LAST_JOB_PREFIX + 'language0', 'job0')
+    connection.set(KEY_STATS_LAST_JOB_PREFIX + 'projects', 'job1')
+    connection.sadd(Job.dependents_key_for('job0'), 'job2', 'job3')
+
+    for i in range(3):
+        count_processed_job(connection)
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_stats_queue_status_json(capfd, stats_queue):
+    call_command('stats_queue_status', '--json', '--top=1')
+    out, err = capfd.readouterr()
+    status = json.loads(out)
+
+    queue = status['queues'][0]
+    assert queue['name'] == 'default'
+    assert queue['count'] == 2
+    assert 600 <= queue['oldest_job_age'] < 700
+
+    assert status['failed_jobs'] == {
+        'count': 3,
+        'by_function': {
+            '%s.noop' % __name__: 2,
+            '__builtin__.len': 1,
+        },
+    }
+    assert status['dirty_treeitems'] == {
+        'count': 2,
+        'top': [{'pootle_path': '/language0/', 'count': 3}],
+    }
+    assert status['last_jobs'] == {
+        'count': 2,
+        'with_dependents': 1,
+        'dependents': 2,
+    }
+    assert status['processed_jobs'] == {
+        'minutes': 5,
+        'count': 3,
+        'per_second': 0.01,
+    }
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_stats_queue_status_empty(capfd, revision):
+    call_command('stats_queue_status')
+    out, err = capfd.readouterr()
+
+    assert '  default: 0 jobs, oldest waiting for -' in out
+    assert 'Failed jobs: 0' in out
+    assert 'Dirty tree items: 0' in out
+    assert 'Processed jobs over the last 5 minutes: 0 (0.00/s)' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_stats_queue_status_text(capfd, stats_queue):
+    call_command('stats_queue_status', '--minutes=1')
+    out, err = capfd.readouterr()
+
+    assert '  default: 2 jobs, oldest waiting for 6' in out
+    assert '  %s.noop: 2' % __name__ in out
+    assert '  /language0/: 3\n  /projects/: 1\n' in out
+    assert 'with deferred dependents (2 jobs)' in out
+    assert 'Processed jobs over the last 1 minutes: 3 (0.05/s)' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_stats_queue_status_max_job_age(capfd, stats_queue):
+    call_command('stats_queue_status', '--max-job-age=3600')
+
+    with pytest.raises(CommandError) as e:
+        call_command('stats_queue_status', '--max-job-age=60')
+    assert 'oldest queued job' in str(e.value)
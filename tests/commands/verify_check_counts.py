@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from pootle_store.models import StoreCheckCounts
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_verify_check_counts(capfd):
+    call_command('verify_check_counts')
+    out, err = capfd.readouterr()
+    assert 'Check counts are up to date.' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_verify_check_counts_drift(capfd, store0):
+    store0.check_counts.filter(name='c_format').update(active=0)
+
+    with pytest.raises(CommandError) as e:
+        call_command('verify_check_counts')
+    assert '1 check counts differ' in str(e)
+    out, err = capfd.readouterr()
+    assert '%s: c_format: expected' % store0.pootle_path in out
+    assert 'found -' in out
+
+    call_command('verify_check_counts', '--fix')
+    out, err = capfd.readouterr()
+    assert 'Rebuilt check counts of 1 stores.' in out
+    assert StoreCheckCounts.objects.get_drift() == []
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_verify_check_counts_project(capfd, store0):
+    store0.check_counts.all().delete()
+
+    call_command('verify_check_counts', '--project=project1')
+    out, err = capfd.readouterr()
+    assert 'Check counts are up to date.' in out
+
+    with pytest.raises(CommandError):
+        call_command('verify_check_counts', '--project=project0',
+                     '--language=language0')
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from pootle_store.models import Unit
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_verify_suggestion_counts(capfd):
+    call_command('verify_suggestion_counts')
+    out, err = capfd.readouterr()
+    assert 'Suggestion counts are up to date.' in out
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_verify_suggestion_counts_drift(capfd, store0):
+    unit = store0.units[0]
+    Unit.objects.filter(pk=unit.pk).update(
+        suggestion_count=unit.suggestion_count + 1,
+    )
+
+    with pytest.raises(CommandError) as e:
+        call_command('verify_suggestion_counts')
+    assert '1 suggestion counts differ' in str(e)
+    out, err = capfd.readouterr()
+    assert '%s: unit %d: expected %d, found %d' % (
+        store0.pootle_path, unit.pk,
+        unit.suggestion_count, unit.suggestion_count + 1,
+    ) in out
+
+    call_command('verify_suggestion_counts', '--fix')
+    out, err = capfd.readouterr()
+    assert 'Recalculated suggestion counts of 1 units.' in out
+    assert Unit.objects.get_suggestion_count_drift() == {}
+
+
+@pytest.mark.cmd
+@pytest.mark.django_db
+def test_verify_suggestion_counts_project(capfd, store0):
+    store0.unit_set.update(suggestion_count=0)
+
+    call_command('verify_suggestion_counts', '--project=project1')
+    out, err = capfd.readouterr()
+    assert 'Suggestion counts are up to date.' in out
+
+    with pytest.raises(CommandError):
+        call_command('verify_suggestion_counts', '--project=project0',
+                     '--language=language0')
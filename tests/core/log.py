@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import logging
+import threading
+
+import pytest
+
+from pootle.core.log import (UNIT_DELETED, BufferedHandler, action_log,
+                             action_log_many, flush_action_log)
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self, gate=None):
+        logging.Handler.__init__(self)
+        self.gate = gate
+        self.waiting = threading.Event()
+        self.messages = []
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.waiting.set()
+            self.gate.wait()
+        self.messages.append(self.format(record))
+
+
+@pytest.fixture
+def action_logger(request):
+    """Sends `action` log records to a `ListHandler` through a
+    `BufferedHandler`.
+    """
+    target = ListHandler()
+    handler = BufferedHandler(target=target)
+    logger = logging.getLogger('action')
+    logger.addHandler(handler)
+
+    def _remove_handler():
+        logger.removeHandler(handler)
+        handler.close()
+
+    request.addfinalizer(_remove_handler)
+    return handler
+
+
+def test_buffered_handler():
+    target = ListHandler()
+    handler = BufferedHandler(target=target, batch_size=3)
+    logger = logging.getLogger('test_buffered_handler')
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    for i in range(10):
+        logger.warning('message %d', i)
+    handler.flush()
+
+    assert target.messages == ['message %d' % i for i in range(10)]
+    assert handler.dropped == 0
+
+    handler.close()
+    logger.removeHandler(handler)
+
+
+def test_buffered_handler_full():
+    """Tests records are dropped when the queue is full."""
+    gate = threading.Event()
+    target = ListHandler(gate=gate)
+    handler = BufferedHandler(capacity=5, target=target, batch_size=1)
+    logger = logging.getLogger('test_buffered_handler_full')
+    logger.propagate = False
+    logger.addHandler(handler)
+
+    try:
+        # Hold the writer on the first record before filling the queue
+        logger.warning('message 0')
+        assert target.waiting.wait(5)
+        for i in range(1, 20):
+            logger.warning('message %d', i)
+    finally:
+        gate.set()
+
+    assert handler.dropped == 20 - 1 - 5
+
+    handler.flush()
+    dropped_messages = [
+        message for message in target.messages
+        if message.endswith('log records were dropped: the buffer was full')
+    ]
+    assert sum(int(message.split()[0])
+               for message in dropped_messages) == handler.dropped
+    assert [message for message in target.messages
+            if message not in dropped_messages] == [
+        'message %d' % i for i in range(6)
+    ]
+
+    handler.close()
+    logger.removeHandler(handler)
+
+
+def test_flush_action_log(action_logger):
+    action_log(user='system', action=UNIT_DELETED, lang='fr', unit=1,
+               translation='', path='/fr/project0/store0.po')
+    flush_action_log()
+
+    assert len(action_logger.target.messages) == 1
+
+
+def test_action_log_many(action_logger):
+    action_log(user='system', action=UNIT_DELETED, lang='fr', unit=1,
+               translation='', path='/fr/project0/store0.po')
+    action_log_many(
+        [{'unit': 2}, {'unit': 3, 'translation': u'Bar\nBaz'}],
+        user='system', action=UNIT_DELETED, lang='fr',
+        path='/fr/project0/store0.po',
+    )
+    action_logger.flush()
+
+    assert action_logger.target.messages == [
+        u'system\tUD\tfr\t1\t/fr/project0/store0.po\t',
+        u'system\tUD\tfr\t2\t/fr/project0/store0.po\t',
+        u'system\tUD\tfr\t3\t/fr/project0/store0.po\tBar\\\nBaz',
+    ]
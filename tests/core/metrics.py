@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import json
+import logging
+
+import pytest
+
+from django.core.cache import caches
+from django.urls import reverse
+
+from pootle.core import metrics
+
+
+class ListSink(metrics.MetricsSink):
+
+    def __init__(self):
+        self.sent = []
+
+    def send(self, aggregates):
+        self.sent.extend(aggregates)
+
+
+@pytest.fixture
+def metrics_sink(settings, monkeypatch):
+    """Enables metrics, collecting them in a `ListSink`."""
+    settings.ZING_METRICS = {
+        'SINK': ListSink,
+        'FLUSH_INTERVAL': 3600,
+    }
+    sink = ListSink()
+    monkeypatch.setattr(metrics, '_collector',
+                        metrics.Collector(sink, flush_interval=3600))
+    metrics.install()
+    return sink
+
+
+def test_metrics_record_disabled(settings):
+    settings.ZING_METRICS = {}
+
+    with metrics.record('job', 'foo') as record:
+        pass
+
+    assert record is None
+
+
+@pytest.mark.django_db
+def test_metrics_record_queries(metrics_sink, member):
+    from accounts.models import User
+
+    for i in range(2):
+        with metrics.record('job', 'foo'):
+            list(User.objects.filter(username=member.username))
+            list(User.objects.all())
+
+    metrics.get_collector().flush()
+
+    assert len(metrics_sink.sent) == 1
+    aggregate = metrics_sink.sent[0]
+    assert aggregate['kind'] == 'job'
+    assert aggregate['name'] == 'foo'
+    assert aggregate['count'] == 2
+    assert aggregate['queries'] == 4
+    assert aggregate['time'] >= aggregate['query_time'] > 0
+    assert aggregate['max_time'] <= aggregate['time']
+    assert aggregate['cache_hit_ratio'] is None
+
+
+def test_metrics_record_redis(metrics_sink):
+    cache = caches['redis']
+    cache.set('metrics-foo', 1)
+
+    with metrics.record('job', 'bar'):
+        cache.get('metrics-foo')
+        cache.get('metrics-bar')
+        cache.get_many(['metrics-foo', 'metrics-bar', 'metrics-baz'])
+        with cache.client.get_client().pipeline() as pipe:
+            pipe.get('metrics-foo')
+            pipe.get('metrics-bar')
+            pipe.execute()
+
+    metrics.get_collector().flush()
+
+    aggregate = metrics_sink.sent[0]
+    assert aggregate['redis_commands'] == 5
+    assert aggregate['cache_hits'] == 2
+    assert aggregate['cache_misses'] == 3
+    assert aggregate['cache_hit_ratio'] == 0.4
+
+
+def test_metrics_record_nested(metrics_sink):
+    with metrics.record('job', 'outer') as outer:
+        with metrics.record('job', 'inner') as inner:
+            assert metrics.get_current_record() is inner
+        assert metrics.get_current_record() is outer
+
+    assert metrics.get_current_record() is None
+    metrics.get_collector().flush()
+    assert (sorted(aggregate['name'] for aggregate in metrics_sink.sent) ==
+            ['inner', 'outer'])
+
+
+def test_metrics_collector_flush_interval():
+    sink = ListSink()
+    collector = metrics.Collector(sink, flush_interval=0)
+    record = metrics.Record('job', 'foo')
+    record.finish()
+
+    collector.add(record)
+
+    assert len(sink.sent) == 1
+    assert collector.aggregates == {}
+
+
+def test_metrics_record_top_queries():
+    record = metrics.Record('job', 'foo', top_queries=2)
+    for i, duration in enumerate([0.1, 0.5, 0.2, 0.4]):
+        record.add_query('SELECT %d' % i, duration)
+
+    assert record.queries == 4
+    assert record.get_top_queries() == [(0.5, 'SELECT 1'),
+                                        (0.4, 'SELECT 3')]
+
+
+@pytest.mark.django_db
+def test_metrics_slow_log(metrics_sink, settings, member):
+    from accounts.models import User
+    from tests.core.log import ListHandler
+
+    settings.ZING_METRICS = dict(settings.ZING_METRICS, SLOW_THRESHOLD=0,
+                                 SLOW_TOP_QUERIES=1)
+    handler = ListHandler()
+    logger = logging.getLogger('metrics.slow')
+    logger.addHandler(handler)
+    try:
+        with metrics.record('view', 'slow-view'):
+            User.objects.filter(username=member.username).count()
+    finally:
+        logger.removeHandler(handler)
+
+    assert len(handler.messages) == 1
+    lines = handler.messages[0].split('\n')
+    assert lines[0].startswith('view slow-view took ')
+    assert '1 queries' in lines[0]
+    assert len(lines) == 2
+    assert 'COUNT' in lines[1]
+
+
+@pytest.mark.django_db
+def test_metrics_middleware(metrics_sink, client):
+    for i in range(2):
+        client.get(reverse('pootle-home'))
+
+    metrics.get_collector().flush()
+
+    assert len(metrics_sink.sent) == 1
+    aggregate = metrics_sink.sent[0]
+    assert aggregate['kind'] == 'view'
+    assert aggregate['name'] == 'pootle-home'
+    assert aggregate['count'] == 2
+
+
+def test_metrics_file_sink(tmpdir):
+    filename = str(tmpdir.join('metrics.log'))
+    sink = metrics.FileSink(filename=filename)
+    record = metrics.Record('job', 'foo')
+    record.finish()
+    aggregate = metrics.Aggregate('job', 'foo')
+    aggregate.add(record)
+
+    sink.send([aggregate.to_dict()])
+
+    with open(filename) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 1
+    data = json.loads(lines[0])
+    assert data['name'] == 'foo'
+    assert data['count'] == 1
+    assert 'timestamp' in data
+
+
+def test_metrics_statsd_sink():
+    sink = metrics.StatsdSink(prefix='test')
+    aggregate = metrics.Aggregate('view', 'pootle-tp-browse')
+    record = metrics.Record('view', 'pootle-tp-browse')
+    record.duration = 0.25
+    record.queries = 3
+    aggregate.add(record)
+
+    lines = list(sink.get_lines(aggregate.to_dict()))
+
+    assert 'test.view.pootle-tp-browse.count:1|c' in lines
+    assert 'test.view.pootle-tp-browse.time:250|c' in lines
+    assert 'test.view.pootle-tp-browse.queries:3|c' in lines
+    assert 'test.view.pootle-tp-browse.max_time:250|g' in lines
+
+
+def test_metrics_name():
+    assert metrics.get_metric_name(u'pootle_store.views.get_units') == \
+        u'pootle_store_views_get_units'
+    assert metrics.get_metric_name(u'foo:bar baz') == u'foo_bar_baz'
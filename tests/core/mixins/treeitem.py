@@ -9,6 +9,12 @@
 
 import pytest
 
+from django_rq.queues import get_connection
+
+from pootle.core.mixins.treeitem import (KEY_CONTENT_REVISIONS,
+                                         bump_content_revisions,
+                                         content_revisions_batch,
+                                         get_content_revision)
 from pootle_app.models import Directory
 from pootle_project.models import Project
 from pootle_store.models import Store
@@ -56,3 +62,38 @@ def test_get_parent(po_directory, project0, language0, tp0, store0, subdir0):
 
     parent = language0.directory.get_parent()
     assert parent is None
+
+
+@pytest.mark.django_db
+def test_content_revisions_batch(monkeypatch):
+    bumped = []
+
+    def _hmset(self, name, mapping):
+        bumped.append(mapping)
+
+    monkeypatch.setattr('redis.StrictRedis.hmset', _hmset)
+
+    with content_revisions_batch():
+        bump_content_revisions([u'/language0/', u'/projects/'])
+        with content_revisions_batch():
+            bump_content_revisions([u'/language1/'])
+        bump_content_revisions([u'/language0/'])
+        assert bumped == []
+
+    assert len(bumped) == 1
+    assert sorted(bumped[0]) == [u'/language0/', u'/language1/',
+                                 u'/projects/']
+    assert len(set(bumped[0].values())) == 1
+
+
+@pytest.mark.django_db
+def test_content_revisions_obsolete(store0):
+    store0.update_all_cache()
+    assert get_content_revision(store0.pootle_path) is not None
+
+    store0.makeobsolete()
+
+    assert get_content_revision(store0.pootle_path) is None
+    assert get_content_revision(store0.parent.pootle_path) is not None
+    assert not get_connection().hexists(KEY_CONTENT_REVISIONS,
+                                        store0.pootle_path)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from pootle.core.proxy import ValuesProxy
+
+
+class RowProxy(ValuesProxy):
+
+    __slots__ = ('row', )
+
+    values_attr = 'row'
+    proxied_fields = ('name', 'count', 'computed')
+
+    def __init__(self, row):
+        self.row = row
+
+    @property
+    def computed(self):
+        return self.row['name'].upper()
+
+
+class CountedRowProxy(RowProxy):
+
+    proxied_fields = ('total', )
+
+
+def test_values_proxy_slots():
+    proxy = RowProxy({'name': 'foo'})
+
+    assert not hasattr(proxy, '__dict__')
+    with pytest.raises(AttributeError):
+        proxy.other = 'bar'
+    assert not hasattr(CountedRowProxy({}), '__dict__')
+
+
+def test_values_proxy_fields():
+    proxy = CountedRowProxy({
+        'name': 'foo', 'count': 0, 'total': None, 'extra': 'baz',
+    })
+
+    assert isinstance(vars(RowProxy)['name'], property)
+    assert isinstance(vars(CountedRowProxy)['total'], property)
+    assert 'name' not in vars(CountedRowProxy)
+
+    assert proxy.name == 'foo'
+    assert proxy.count == ''
+    assert proxy.total == ''
+    assert proxy.computed == 'FOO'
+    # Undeclared keys are still accessible
+    assert proxy.extra == 'baz'
+
+
+def test_values_proxy_missing_fields():
+    proxy = RowProxy({'name': 'foo'})
+
+    with pytest.raises(AttributeError):
+        proxy.count
+    with pytest.raises(AttributeError):
+        proxy.other
+    assert getattr(proxy, 'count', None) is None
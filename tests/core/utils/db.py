@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from pootle.core.utils.db import bulk_update
+from pootle_store.models import Unit
+
+
+@pytest.mark.django_db
+def test_bulk_update(store0, member, django_assert_num_queries):
+    units = list(store0.unit_set.order_by('pk')[:3])
+    previous_mtimes = [unit.mtime for unit in units]
+    for i, unit in enumerate(units):
+        unit.target_f = u'Translation %d' % i
+        unit.submitted_by = member if i % 2 else None
+
+    with django_assert_num_queries(2):
+        bulk_update(units, ['target_f', 'submitted_by', 'mtime'],
+                    batch_size=2)
+
+    for i, unit in enumerate(units):
+        db_unit = Unit.objects.get(pk=unit.pk)
+        assert db_unit.target == u'Translation %d' % i
+        assert db_unit.submitted_by_id == (member.pk if i % 2 else None)
+        assert db_unit.mtime > previous_mtimes[i]
@@ -6,12 +6,15 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import pickle
+
 import pytest
 
 from translate.misc.multistring import multistring
 
 from pootle.core.utils.multistring import (PLURAL_PLACEHOLDER, SEPARATOR,
-                                           parse_multistring, unparse_multistring)
+                                           LazyMultiString, parse_multistring,
+                                           unparse_multistring)
 
 
 @pytest.mark.parametrize('invalid_value', [None, [], (), 69, 69L])
@@ -58,3 +61,54 @@ def test_unparse_multistring(values_list, expected_ms, has_plural_placeholder):
         values_list.plural = True
     unparsed_ms = unparse_multistring(values_list)
     assert unparsed_ms == expected_ms
+
+
+@pytest.mark.parametrize('db_string', [
+    'foo bar',
+    u'fóo bär',
+    'foo%s' % SEPARATOR,
+    'foo%s%s' % (SEPARATOR, PLURAL_PLACEHOLDER),
+    'foo%sbar' % SEPARATOR,
+    'foo%sbar%sbaz' % (SEPARATOR, SEPARATOR),
+])
+def test_lazy_multistring(db_string):
+    parsed_ms = parse_multistring(db_string)
+    lazy_ms = LazyMultiString(db_string)
+
+    assert unicode(lazy_ms) == unicode(parsed_ms)
+    assert len(lazy_ms) == len(parsed_ms)
+    assert not lazy_ms.is_parsed
+
+    assert lazy_ms == parsed_ms
+    assert lazy_ms.strings == parsed_ms.strings
+    assert lazy_ms.plural == parsed_ms.plural
+    assert lazy_ms.is_parsed
+    assert unparse_multistring(lazy_ms) == unparse_multistring(parsed_ms)
+
+
+def test_lazy_multistring_unparse_unparsed():
+    db_string = 'foo%sbar' % SEPARATOR
+    lazy_ms = LazyMultiString(db_string)
+
+    assert unparse_multistring(lazy_ms) is lazy_ms.db_string
+    assert not lazy_ms.is_parsed
+
+
+def test_lazy_multistring_set_before_parse():
+    lazy_ms = LazyMultiString('foo')
+    lazy_ms.plural = True
+
+    assert lazy_ms.strings == [u'foo']
+    assert lazy_ms.plural
+    assert (unparse_multistring(lazy_ms) ==
+            'foo%s%s' % (SEPARATOR, PLURAL_PLACEHOLDER))
+
+
+@pytest.mark.parametrize('protocol', [0, pickle.HIGHEST_PROTOCOL])
+def test_lazy_multistring_pickle(protocol):
+    lazy_ms = LazyMultiString('foo%sbar' % SEPARATOR)
+
+    unpickled_ms = pickle.loads(pickle.dumps(lazy_ms, protocol))
+
+    assert unpickled_ms == lazy_ms
+    assert unpickled_ms.strings == [u'foo', u'bar']
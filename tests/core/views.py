@@ -12,11 +12,13 @@ import json
 import pytest
 
 from django import forms
+from django.core.cache.backends.locmem import LocMemCache
 
 from tests.factories import UserFactory
 from tests.utils import create_api_request
 
-from pootle.core.views import APIView
+from pootle.core import cache as core_cache
+from pootle.core.views import APIView, api
 from accounts.models import User
 
 
@@ -32,6 +34,15 @@ class WriteableUserAPIView(APIView):
     fields = ('username', 'email',)
 
 
+class CursorUserAPIView(APIView):
+    model = User
+    base_queryset = User.objects.order_by('-id')
+    page_size = 3
+    fields = ('username', 'full_name',)
+    cursor_field = '-id'
+    count_cache_timeout = 60
+
+
 class UserSettingsForm(forms.ModelForm):
 
     password = forms.CharField(required=False)
@@ -427,3 +438,110 @@ def test_apiview_delete_meta_user(rf, meta_users):
     response = view(request, id=user.id)
     assert response.status_code == 405
     assert 'Cannot remove meta user instances' in response.content
+
+
+def _get_all_pages(rf, view, url):
+    """Follows the cursors returned by `view` until the last page."""
+    pages = []
+    next_url = url
+    while next_url is not None:
+        response = view(create_api_request(rf, url=next_url))
+        assert response.status_code == 200
+
+        response_data = json.loads(response.content)
+        pages.append(response_data)
+        next_url = None
+        if response_data['next'] is not None:
+            separator = '&' if '?' in url else '?'
+            next_url = '%s%scursor=%s' % (url, separator,
+                                          response_data['next'])
+
+    return pages
+
+
+@pytest.fixture
+def count_cache(monkeypatch):
+    """Caches API collection counts in a local memory cache."""
+    cache = LocMemCache('api-counts', {})
+    monkeypatch.setattr(api, 'cache', cache)
+    monkeypatch.setattr(core_cache, 'default_cache', cache)
+    return cache
+
+
+@pytest.mark.django_db
+def test_apiview_cursor_pagination(rf, no_extra_users):
+    """Tests retrieving collections page by page using cursors."""
+    view = CursorUserAPIView.as_view()
+    UserFactory.create_batch(7)
+
+    total = User.objects.count()
+
+    pages = _get_all_pages(rf, view, '/')
+
+    assert [len(page['models']) for page in pages] == (
+        [3] * (total // 3) + [total % 3]
+    )
+    assert all(page['count'] == total for page in pages)
+    assert [model['username']
+            for page in pages
+            for model in page['models']] == list(
+        User.objects.order_by('-id').values_list('username', flat=True)
+    )
+    # The cursor field is not leaked when it is not serialized
+    assert 'id' not in pages[0]['models'][0]
+
+
+@pytest.mark.django_db
+def test_apiview_cursor_pagination_search(rf, no_extra_users):
+    view = CursorUserAPIView.as_view()
+    UserFactory.create_batch(4, full_name='Foo Bar')
+    UserFactory.create_batch(3, full_name='Baz')
+
+    pages = _get_all_pages(rf, view, '/?q=bar')
+
+    assert [len(page['models']) for page in pages] == [3, 1]
+    assert all(model['full_name'] == 'Foo Bar'
+               for page in pages
+               for model in page['models'])
+
+
+@pytest.mark.django_db
+def test_apiview_cursor_pagination_invalid(rf):
+    view = CursorUserAPIView.as_view()
+
+    request = create_api_request(rf, url='/?cursor=1')
+    response = view(request)
+
+    assert response.status_code == 400
+    assert json.loads(response.content) == {'msg': 'Invalid cursor'}
+
+
+@pytest.mark.django_db
+def test_apiview_count_cache(rf, count_cache, django_assert_num_queries,
+                             no_extra_users):
+    view = CursorUserAPIView.as_view()
+    UserFactory.create_batch(5)
+    total = User.objects.count()
+
+    def _get_count(url='/'):
+        response = view(create_api_request(rf, url=url))
+        return json.loads(response.content)['count']
+
+    assert _get_count() == total
+
+    # Only the page of values is retrieved once the count is cached
+    with django_assert_num_queries(1):
+        assert _get_count() == total
+
+    # Counts are cached per normalized search keyword
+    assert _get_count('/?q=zzz') == 0
+    with django_assert_num_queries(1):
+        assert _get_count('/?q=ZZZ') == 0
+
+    # Saving users invalidates their counts
+    UserFactory.create(username='zzz')
+    assert _get_count() == total + 1
+    assert _get_count('/?q=zzz') == 1
+
+    User.objects.get(username='zzz').delete()
+    assert _get_count() == total
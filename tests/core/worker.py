@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.db import DatabaseError
+
+from django_rq.queues import get_queue
+
+from pootle.core.worker import Worker
+
+
+def get_worker():
+    queue = get_queue()
+    return Worker([queue], connection=queue.connection)
+
+
+@pytest.mark.django_db
+def test_worker_preload(monkeypatch):
+    from pootle_app.models import Directory
+
+    imported = []
+    monkeypatch.setattr('pootle.core.worker.importlib.import_module',
+                        imported.append)
+    monkeypatch.delitem(vars(Directory.objects), 'root', raising=False)
+
+    get_worker()
+
+    assert imported == list(Worker.preload_modules)
+    assert 'root' in vars(Directory.objects)
+
+
+def test_worker_warm_up_failure(monkeypatch):
+
+    def _warm_up(self):
+        raise DatabaseError('no such table')
+
+    monkeypatch.setattr(Worker, 'warm_up', _warm_up)
+
+    assert get_worker() is not None
+
+
+def test_rqworker_default_worker_class():
+    from pootle_app.management.commands.rqworker import Command
+
+    parser = Command().create_parser('zing', 'rqworker')
+    options = parser.parse_args([])
+
+    assert options.worker_class == 'pootle.core.worker.Worker'
+
+
+def test_worker_perform_job_flushes_action_log(monkeypatch):
+
+    def _perform_job(self, *args, **kwargs):
+        raise RuntimeError
+
+    flushed = []
+    monkeypatch.setattr('pootle.core.metrics.MetricsWorker.perform_job',
+                        _perform_job)
+    monkeypatch.setattr('pootle.core.worker.flush_action_log',
+                        lambda: flushed.append(True))
+
+    with pytest.raises(RuntimeError):
+        get_worker().perform_job(None, None)
+
+    assert flushed == [True]
@@ -35,10 +35,14 @@ class PootleTestEnv(object):
         """
         data_file = self.data_file
         if os.path.isfile(data_file):
-            from pootle_store.models import Unit
+            from pootle_store.models import StoreCheckCounts, Unit
 
             self.setup_case_sensitive_schema()
             call_command('loaddata', data_file)
+            # Denormalized data is derived from the loaded data rather
+            # than stored in the dump
+            StoreCheckCounts.objects.rebuild()
+            Unit.objects.refresh_suggestion_counts()
             self.setup_redis(revision=Unit.max_revision())
         else:
             self.setup_site_db()
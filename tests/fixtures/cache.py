@@ -28,3 +28,11 @@ def refresh_stats(flush_stats):
     from pootle_store.models import Store
     for store in Store.objects.live().iterator():
         store.update_all_cache()
+
+
+@pytest.fixture
+def flush_leaderboard(request):
+    """Clears the top scorers leaderboard, before and after the test."""
+    from pootle_statistics.leaderboard import Leaderboard
+    Leaderboard.clear()
+    request.addfinalizer(Leaderboard.clear)
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+from contextlib import contextmanager
+
+import pytest
+
+
+@pytest.fixture
+def django_assert_num_queries():
+    """Provides a context manager asserting the number of DB queries
+    performed within it.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    @contextmanager
+    def _assert_num_queries(num):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+
+        performed = len(context)
+        if performed != num:
+            pytest.fail(
+                'Expected to perform %d queries but %d were done:\n%s' % (
+                    num, performed,
+                    '\n'.join(query['sql'] for query in context.captured_queries),
+                )
+            )
+
+    return _assert_num_queries
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import json
+import os
+import subprocess
+import sys
+
+
+#: Modules which must not be loaded when setting up Django, as they are
+#: costly to import and only needed by some requests and commands
+LAZY_MODULES = (
+    'elasticsearch',
+    'Levenshtein',
+    'pootle.core.search.backends',
+    'pootle_misc.checks',
+    'translate.filters.checks',
+)
+
+SETUP_SCRIPT = '''
+import json
+import sys
+
+from pootle import syspath_override
+import django
+
+django.setup()
+print(json.dumps(sorted(name for name, module in sys.modules.items()
+                        if module is not None)))
+'''
+
+
+def get_setup_modules(tests_dir):
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='pootle.settings',
+        ZING_SETTINGS=tests_dir('settings.py'),
+    )
+    output = subprocess.check_output([sys.executable, '-c', SETUP_SCRIPT],
+                                     env=env, cwd=tests_dir('..'))
+    return json.loads(output.splitlines()[-1])
+
+
+def test_startup_lazy_modules(tests_dir):
+    modules = get_setup_modules(tests_dir)
+
+    loaded = [lazy_module for lazy_module in LAZY_MODULES
+              if any(module == lazy_module or
+                     module.startswith(lazy_module + '.')
+                     for module in modules)]
+    assert loaded == []
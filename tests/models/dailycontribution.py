@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from tests.factories import SubmissionFactory
+
+from pootle_statistics.models import (DailyContribution, ScoreLog,
+                                      SubmissionFields, SubmissionTypes,
+                                      get_local_date)
+
+
+def _get_totals(queryset, fields):
+    return {
+        field: round(total, 4)
+        for field, total in queryset.aggregate(
+            **{field: Sum(field) for field in fields}
+        ).items()
+    }
+
+
+@pytest.mark.django_db
+def test_dailycontribution_add_scorelog(member, store0):
+    unit = store0.units.first()
+    now = timezone.now()
+
+    SubmissionFactory(
+        store=store0,
+        unit=unit,
+        field=SubmissionFields.TARGET,
+        type=SubmissionTypes.NORMAL,
+        old_value='',
+        new_value='New target',
+        similarity=0,
+        mt_similarity=0,
+        submitter=member,
+        translation_project=store0.translation_project,
+        creation_time=now,
+    )
+
+    scorelog = ScoreLog.objects.filter(user=member).latest('pk')
+    contribution = DailyContribution.objects.get(
+        user=member,
+        date=get_local_date(now),
+        translation_project=store0.translation_project,
+        action_code=scorelog.action_code,
+    )
+    assert contribution.score_delta == scorelog.score_delta
+    assert (contribution.translated_wordcount ==
+            scorelog.get_paid_wordcounts()[0])
+
+
+@pytest.mark.django_db
+def test_dailycontribution_rebuild(member):
+    fields = ('score_delta', 'translated_wordcount', 'reviewed_wordcount',
+              'suggested_wordcount')
+    contributions = DailyContribution.objects.filter(user=member)
+    expected = _get_totals(contributions, fields)
+    expected_count = contributions.count()
+    assert expected_count > 0
+
+    contributions.update(score_delta=0, reviewed_wordcount=0)
+    DailyContribution.objects.rebuild(users=[member.pk])
+
+    assert contributions.count() == expected_count
+    assert _get_totals(contributions, fields) == expected
+    assert expected['score_delta'] == round(
+        ScoreLog.objects.filter(user=member).aggregate(
+            total=Sum('score_delta'))['total'],
+        4,
+    )
+
+
+@pytest.mark.django_db
+def test_dailycontribution_rebuild_by_day(member):
+    contributions = DailyContribution.objects.filter(user=member)
+    dates = sorted(set(contributions.values_list('date', flat=True)))
+    contributions.delete()
+
+    rebuilt = list(DailyContribution.objects.rebuild_by_day(users=[member.pk]))
+
+    assert rebuilt[0][0] == dates[0]
+    assert rebuilt[-1][0] == dates[-1]
+    assert [date for date, rows in rebuilt if rows] == dates
+    assert sum(rows for date, rows in rebuilt) == contributions.count()
@@ -12,13 +12,17 @@ from django.core.exceptions import ValidationError
 
 from tests.factories import DueDateFactory, UserFactory
 
+from pootle.core.utils.list import flatten
 from pootle.core.utils.timezone import aware_datetime
-from pootle.models import DueDate
+from pootle.models import DueDate, stats
 from pootle.models.task import TaskResultSet
 from pootle_store.models import Store
 from pootle_translationproject.models import TranslationProject
 
 
+NOW = aware_datetime(2017, 1, 1, 1, 2, 3)
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize('pootle_path', [
     '/',
@@ -193,6 +197,49 @@ def test_duedate_get_pending_tasks():
     assert isinstance(tasks, TaskResultSet)
 
 
+@pytest.mark.django_db
+def test_duedate_tasks_budget(monkeypatch, django_assert_num_queries,
+                              refresh_stats):
+    """Tests stats for all due dates are retrieved at once."""
+    language = 'language0'
+    pootle_paths = [
+        store.pootle_path
+        for store in Store.objects.filter(
+            translation_project__language__code=language,
+        )
+    ]
+    for pootle_path in pootle_paths:
+        DueDateFactory.create(pootle_path=pootle_path)
+    assert len(pootle_paths) > 1
+
+    expected = [
+        task.data for task in TaskResultSet(list(flatten([
+            due_date.get_pending_tasks(NOW)
+            for due_date in DueDate.objects.for_language(language)
+        ]))).order_by_importance().tasks
+    ]
+
+    cache_calls = []
+
+    def _count_calls(obj, name):
+        original = getattr(obj, name)
+
+        def _function(*args, **kwargs):
+            cache_calls.append(name)
+            return original(*args, **kwargs)
+        monkeypatch.setattr(obj, name, _function)
+
+    _count_calls(stats, 'get_many_values')
+    _count_calls(stats.cache, 'get')
+
+    with django_assert_num_queries(1):
+        tasks = DueDate.tasks(language, now=NOW)
+
+    assert cache_calls == ['get_many_values']
+    assert tasks.total == len(expected) > 0
+    assert [task.data for task in tasks.tasks] == expected
+
+
 @pytest.mark.django_db
 @pytest.mark.parametrize('dummy_path', [
     '/language0/project0/',
@@ -679,3 +679,49 @@ def test_invoice_get_amounts(member):
     invoice.generate()
 
     assert invoice.amounts is not None
+
+
+FAKE_PHANTOMJS = '''#!%(python)s
+import sys
+
+with open(%(log)r, 'a') as log:
+    log.write('start\\n')
+
+for line in iter(sys.stdin.readline, ''):
+    infile, outfile = line.rstrip('\\n').split('\\t')
+    with open(outfile, 'w') as pdf:
+        pdf.write(open(infile).read())
+    sys.stdout.write('OK\\n')
+    sys.stdout.flush()
+'''
+
+
+@pytest.mark.django_db
+def test_invoice_generate_pdf_renderer(settings, member, member2, tmpdir,
+                                       invoice_directory):
+    """Tests a single PDF renderer process is used for several invoices."""
+    import os
+    import sys
+    from reports.generators import PDFRenderer
+
+    log = tmpdir.join('phantomjs.log')
+    phantomjs = tmpdir.join('phantomjs')
+    phantomjs.write(FAKE_PHANTOMJS % {
+        'python': sys.executable,
+        'log': log.strpath,
+    })
+    phantomjs.chmod(0o755)
+    settings.ZING_INVOICES_PHANTOMJS_BIN = phantomjs.strpath
+
+    month = timezone.datetime(2014, 04, 01)
+    with PDFRenderer() as renderer:
+        for user in (member, member2):
+            config = dict(FAKE_CONFIG, name=user.username)
+            invoice = Invoice(user, config, month=month)
+            invoice.generate(renderer=renderer)
+
+            media_types = [media_type for path, media_type in invoice.files]
+            assert media_types == ['text/html', 'application/pdf']
+            assert all(os.path.exists(path) for path, _ in invoice.files)
+
+    assert log.read() == 'start\n'
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import datetime
+
+import pytest
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from tests.factories import SubmissionFactory
+
+from pootle_statistics.leaderboard import Leaderboard
+from pootle_statistics.models import (DailyContribution, SubmissionFields,
+                                      SubmissionTypes, get_local_date)
+
+
+def _get_top_scorers(**kwargs):
+    return sorted(
+        (round(item['total_score'], 4), item['user'].username,
+         item['translated'], item['reviewed'], item['suggested'])
+        for item in get_user_model().top_scorers(limit=0, **kwargs)
+    )
+
+
+@pytest.fixture
+def leaderboard(flush_leaderboard):
+    DailyContribution.objects.refresh_leaderboard()
+    Leaderboard.set_ready()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('kwargs', [
+    {},
+    {'language': 'language0'},
+    {'project': 'project0'},
+    {'language': 'language0', 'project': 'project0'},
+    {'language': 'language0', 'project': 'project1'},
+    {'language': 'missing'},
+    {'days': 1000},
+])
+def test_leaderboard_top_scorers(flush_leaderboard, kwargs):
+    expected = _get_top_scorers(**kwargs)
+
+    DailyContribution.objects.refresh_leaderboard()
+    Leaderboard.set_ready()
+
+    assert _get_top_scorers(**kwargs) == expected
+
+
+@pytest.mark.django_db
+def test_leaderboard_top_scorers_limit(leaderboard):
+    User = get_user_model()
+    top_scorers = User.top_scorers(limit=0)
+    assert User.top_scorers(limit=2) == top_scorers[:2]
+    assert User.top_scorers(limit=2, offset=1) == top_scorers[1:3]
+    assert not any(item['user'].is_meta for item in top_scorers)
+
+
+def _submit(store, user, creation_time):
+    SubmissionFactory(
+        store=store,
+        unit=store.units.first(),
+        field=SubmissionFields.TARGET,
+        type=SubmissionTypes.NORMAL,
+        old_value='',
+        new_value='New target',
+        similarity=0,
+        mt_similarity=0,
+        submitter=user,
+        translation_project=store.translation_project,
+        creation_time=creation_time,
+    )
+
+
+@pytest.mark.django_db
+def test_leaderboard_add_score(monkeypatch, leaderboard, member, store0):
+    # Tests run within a transaction which is never committed
+    on_commit_callbacks = []
+    monkeypatch.setattr(transaction, 'on_commit', on_commit_callbacks.append)
+
+    yesterday = timezone.now() - datetime.timedelta(days=1)
+    _submit(store0, member, yesterday)
+
+    date = get_local_date(yesterday)
+    expected = DailyContribution.objects.filter(
+        user=member, date=date,
+    ).aggregate(total=Sum('score_delta'))['total']
+
+    def _get_top():
+        return dict(Leaderboard.get_top(
+            date, date + datetime.timedelta(days=1),
+            language_id=store0.translation_project.language_id,
+        ))
+
+    # Scores are only recorded once the transaction is committed
+    assert member.pk not in _get_top()
+
+    for callback in on_commit_callbacks:
+        callback()
+    assert round(_get_top()[member.pk], 4) == round(expected, 4)
+
+
+@pytest.mark.django_db
+def test_leaderboard_refresh_user(flush_leaderboard, member, store0):
+    yesterday = timezone.now() - datetime.timedelta(days=1)
+    _submit(store0, member, yesterday)
+
+    today = get_local_date(timezone.now())
+    start = today - datetime.timedelta(days=7)
+    expected = DailyContribution.objects.filter(
+        user=member, date__gte=start, date__lt=today,
+    ).aggregate(total=Sum('score_delta'))['total']
+
+    DailyContribution.objects.refresh_leaderboard(users=[member.pk])
+    top = dict(Leaderboard.get_top(start, today))
+    assert top.keys() == [member.pk]
+    assert round(top[member.pk], 4) == round(expected, 4)
+
+    # Refreshing again must not account scores twice. A different period is
+    # requested so the union of daily scores is not reused.
+    DailyContribution.objects.refresh_leaderboard(users=[member.pk])
+    top = dict(Leaderboard.get_top(start - datetime.timedelta(days=1), today))
+    assert round(top[member.pk], 4) == round(expected, 4)
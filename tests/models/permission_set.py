@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.contrib.auth.models import AnonymousUser, Permission
+
+from django_redis import get_redis_connection
+
+from pootle_app.models import Directory
+from pootle_app.models import permissions
+from pootle_app.models.permissions import (PermissionSet,
+                                           check_user_permission,
+                                           get_matching_permissions,
+                                           get_permissions_index_key)
+
+
+def _clear_permissions_index(conn):
+    keys = list(conn.scan_iter(match=get_permissions_index_key('*')))
+    if keys:
+        conn.delete(*keys)
+
+
+@pytest.fixture
+def permissions_index(request, monkeypatch):
+    """Stores permissions indexes in the `redis` cache."""
+    conn = get_redis_connection('redis')
+    monkeypatch.setattr(permissions, 'get_permissions_connection',
+                        lambda: conn)
+    _clear_permissions_index(conn)
+    request.addfinalizer(lambda: _clear_permissions_index(conn))
+    return conn
+
+
+def _get_all_permissions(users, directories):
+    return [
+        get_matching_permissions(user, directory)
+        for user in users
+        for directory in directories
+    ]
+
+
+@pytest.mark.django_db
+def test_permissions_index_matches_db(monkeypatch, permissions_index,
+                                      member, admin):
+    users = [member, admin, AnonymousUser()]
+    directories = list(Directory.objects.live()[:50])
+    expected = _get_all_permissions(users, directories)
+
+    # Resolve without the index
+    monkeypatch.setattr(permissions, 'get_permissions_connection',
+                        lambda: None)
+    assert _get_all_permissions(users, directories) == expected
+
+
+@pytest.mark.django_db
+def test_permissions_index_no_queries(permissions_index,
+                                      django_assert_num_queries,
+                                      member, tp0):
+    directory = tp0.directory
+    check_user_permission(member, 'translate', directory)
+    assert permissions_index.exists(get_permissions_index_key(member.username))
+
+    with django_assert_num_queries(0):
+        for i in xrange(10):
+            check_user_permission(member, 'translate', directory)
+            get_matching_permissions(member, directory)
+
+
+@pytest.mark.django_db
+def test_permissions_index_invalidation(permissions_index, no_perms_user,
+                                        administrate, translate, tp0):
+    directory = tp0.directory
+    assert not check_user_permission(no_perms_user, 'administrate', directory)
+
+    ps = PermissionSet.objects.create(user=no_perms_user,
+                                      directory=tp0.language.directory)
+    assert get_matching_permissions(no_perms_user, directory) == {}
+
+    ps.positive_permissions.add(administrate)
+    assert check_user_permission(no_perms_user, 'administrate', directory)
+    assert check_user_permission(no_perms_user, 'translate', directory)
+
+    ps.positive_permissions.remove(administrate)
+    assert not check_user_permission(no_perms_user, 'administrate', directory)
+
+    # Project-level permissions override language-level ones
+    translate.permission_sets_positive.add(ps)
+    project_ps = PermissionSet.objects.create(
+        user=no_perms_user, directory=tp0.project.directory,
+    )
+    project_ps.positive_permissions = [administrate]
+    assert get_matching_permissions(no_perms_user, directory) == {
+        'administrate': True,
+    }
+
+    project_ps.delete()
+    assert get_matching_permissions(no_perms_user, directory) == {
+        'translate': True,
+    }
+
+    # Clearing the permission sets of a permission
+    translate.permission_sets_positive.clear()
+    assert get_matching_permissions(no_perms_user, directory) == {}
+
+
+@pytest.mark.django_db
+def test_permission_masks(permissions_index):
+    """Tests permission masks only use the bits of known permissions."""
+    all_bits = (1 << len(permissions.PERMISSION_BITS)) - 1
+    assert permissions.get_permission_bits(
+        *permissions.PERMISSION_BITS.keys()
+    ) == all_bits
+
+    index = permissions.build_permissions_index('default')
+    assert index
+    assert all(0 < mask <= all_bits for mask in index.values())
+
+    new_permission = Permission.objects.create(
+        codename='new_permission', name='New permission',
+        content_type=permissions.get_permission_contenttype(),
+    )
+    PermissionSet.objects.filter(
+        user__username='default',
+    )[0].positive_permissions.add(new_permission)
+    assert permissions.build_permissions_index('default') == index
@@ -15,7 +15,8 @@ from tests.factories import UserFactory
 from tests.fixtures.models.permission_set import _require_permission_set
 from tests.utils import items_equal
 
-from pootle_project.models import Project, RESERVED_PROJECT_CODES
+from pootle_project.models import (Project, RESERVED_PROJECT_CODES,
+                                   VisibleProject)
 
 
 @pytest.mark.django_db
@@ -297,3 +298,45 @@ def test_root_hide_permissions(po_directory, nobody, default, admin, hide,
     assert items_equal(Project.accessible_by_user(nobody), ALL_PROJECTS)
     assert items_equal(Project.accessible_by_user(foo_user), ALL_PROJECTS)
     assert items_equal(Project.accessible_by_user(bar_user), ALL_PROJECTS)
+
+
+def _for_user_codes(user):
+    return Project.objects.for_user(user).values_list('code', flat=True)
+
+
+@pytest.mark.django_db
+def test_access_profiles(po_directory, nobody, default, view, no_projects,
+                         no_permission_sets, project_foo, project_bar, root):
+    """Tests users with the same permissions share their visible projects."""
+    foo_user = UserFactory.create(username='foo')
+    bar_user = UserFactory.create(username='bar')
+    baz_user = UserFactory.create(username='baz')
+
+    _require_permission_set(default, project_bar.directory, [view])
+    _require_permission_set(foo_user, project_foo.directory, [view])
+
+    profile = Project.get_access_profile(bar_user)
+    assert Project.get_access_profile(baz_user) == profile
+    assert Project.get_access_profile(foo_user) != profile
+    assert Project.get_access_profile(nobody) != profile
+
+    assert (Project.get_accessible_bitmap(bar_user) ==
+            (profile, 1 << project_bar.id))
+    assert items_equal(
+        VisibleProject.objects.filter(profile=profile)
+                              .values_list('project__code', flat=True),
+        [project_bar.code],
+    )
+    assert items_equal(_for_user_codes(baz_user), [project_bar.code])
+    assert Project.is_id_accessible_by(project_bar.id, baz_user)
+    assert not Project.is_id_accessible_by(project_foo.id, baz_user)
+
+    # Visible projects are updated when access changes
+    _require_permission_set(default, project_foo.directory, [view])
+    assert items_equal(_for_user_codes(baz_user),
+                       [project_foo.code, project_bar.code])
+    assert VisibleProject.objects.filter(profile=profile).count() == 2
+
+    project_bar.delete()
+    assert items_equal(_for_user_codes(baz_user), [project_foo.code])
+    assert VisibleProject.objects.filter(profile=profile).count() == 1
@@ -7,6 +7,8 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import threading
+
 import pytest
 
 from pootle.core.models import Revision
@@ -61,3 +63,75 @@ def test_revision_incr(store0):
     assert db_unit.revision != previous_revision
     assert Revision.get() != previous_revision
     assert db_unit.revision == Revision.get()
+
+
+@pytest.mark.django_db
+def test_revision_reserve(revision):
+    """Tests a block of consecutive revisions is reserved at once."""
+    previous_revision = Revision.get()
+
+    assert Revision.reserve(10) == (previous_revision + 1,
+                                    previous_revision + 10)
+    assert Revision.get() == previous_revision + 10
+    assert Revision.incr() == previous_revision + 11
+
+    with pytest.raises(ValueError):
+        Revision.reserve(0)
+
+
+@pytest.mark.django_db
+def test_revision_reserve_concurrent(revision):
+    """Tests concurrent reservations never overlap."""
+    previous_revision = Revision.get()
+    ranges = []
+
+    def reserve():
+        for i in range(20):
+            ranges.append(Revision.reserve(i % 7 + 1))
+
+    threads = [threading.Thread(target=reserve) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reserved = [
+        revision
+        for first, last in ranges
+        for revision in range(first, last + 1)
+    ]
+    assert len(reserved) == len(set(reserved))
+    assert sorted(reserved) == range(previous_revision + 1,
+                                     Revision.get() + 1)
+
+
+@pytest.mark.django_db
+def test_revision_block(revision):
+    """Tests revisions are drawn from blocks within `Revision.block()`."""
+    previous_revision = Revision.get()
+
+    with Revision.block(5):
+        # Nothing is reserved until needed
+        assert Revision.get() == previous_revision
+
+        revisions = [Revision.incr() for i in range(7)]
+        assert Revision.get() == previous_revision + 10
+
+    assert revisions == range(previous_revision + 1, previous_revision + 8)
+    assert Revision.incr() == previous_revision + 11
+
+
+@pytest.mark.django_db
+def test_revision_block_growing(revision):
+    """Tests blocks grow up to their maximum size as they are used up."""
+    previous_revision = Revision.get()
+
+    with Revision.block(1, max_size=4):
+        Revision.incr()
+        assert Revision.get() == previous_revision + 1
+
+        revisions = [Revision.incr() for i in range(7)]
+        # Blocks of 2 and 4 numbers, then another one of 4
+        assert Revision.get() == previous_revision + 11
+
+    assert revisions == range(previous_revision + 2, previous_revision + 9)
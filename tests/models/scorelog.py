@@ -11,7 +11,10 @@ import pytest
 
 from datetime import datetime
 
+from django.utils import timezone
+
 from tests.factories import ScoreLogFactory, SubmissionFactory
+from tests.utils import create_scorelogs
 
 from pootle_statistics.models import (ScoreLog, SubmissionTypes, SubmissionFields,
                                       SIMILARITY_THRESHOLD)
@@ -62,3 +65,32 @@ def test_is_similarity_taken_from_mt(similarity, mt_similarity):
         assert score_log.is_similarity_taken_from_mt()
     else:
         assert not score_log.is_similarity_taken_from_mt()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [100, 10000])
+def test_scorelog_prefetch_initial_similarities(django_assert_num_queries,
+                                                member, store0, count):
+    create_scorelogs(member, store0, count, timezone.now())
+    scorelogs = list(
+        ScoreLog.objects.filter(user=member).select_related(
+            'submission__suggestion', 'submission__unit',
+        ).order_by('pk')
+    )
+
+    with django_assert_num_queries(2):
+        ScoreLog.objects.prefetch_initial_similarities(scorelogs)
+        score_deltas = [scorelog.get_score_delta() for scorelog in scorelogs]
+        wordcounts = [scorelog.get_paid_wordcounts() for scorelog in scorelogs]
+
+    if count > 100:
+        return
+
+    # Results must match those calculated without prefetching
+    scorelogs = ScoreLog.objects.filter(user=member).select_related(
+        'submission__suggestion', 'submission__unit',
+    ).order_by('pk')
+    assert [scorelog.get_score_delta() for scorelog in scorelogs] == \
+        score_deltas
+    assert [scorelog.get_paid_wordcounts() for scorelog in scorelogs] == \
+        wordcounts
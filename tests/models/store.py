@@ -22,8 +22,9 @@ from django.core.exceptions import ValidationError
 
 from pootle.core.models import Revision
 from pootle.core.url_helpers import to_tp_relative_path
-from pootle_store.constants import OBSOLETE, PARSED, TRANSLATED
-from pootle_store.diff import StoreDiff
+from pootle_store.constants import (OBSOLETE, PARSED, TRANSLATED,
+                                    UNIT_INDEX_GAP)
+from pootle_store.diff import StoreDiff, get_insert_indexes
 from pootle_store.models import Store
 from pootle_store.syncer import PoStoreSyncer
 
@@ -567,6 +568,78 @@ def test_store_diff_delete_obsoleted_target_unit(diffable_stores):
     assert not differ.diff()
 
 
+@pytest.mark.parametrize('insert_at, next_index, count, expected', [
+    (0, None, 2, ([UNIT_INDEX_GAP, 2 * UNIT_INDEX_GAP], 0)),
+    (3000, None, 1, ([3000 + UNIT_INDEX_GAP], 0)),
+    (1000, 2000, 1, ([1500], 0)),
+    (1000, 2000, 3, ([1250, 1500, 1750], 0)),
+    (1000, 1002, 1, ([1001], 0)),
+    (1000, 1002, 2, ([1000 + UNIT_INDEX_GAP, 1000 + 2 * UNIT_INDEX_GAP],
+                     3 * UNIT_INDEX_GAP - 2)),
+    (1, 2, 1, ([1 + UNIT_INDEX_GAP], 2 * UNIT_INDEX_GAP - 1)),
+])
+def test_get_insert_indexes(insert_at, next_index, count, expected):
+    assert get_insert_indexes(insert_at, next_index, count) == expected
+
+
+def _insert_source_unit(source_store, position, source):
+    new_unit = source_store.addsourceunit(source)
+    new_unit.target = "%s target" % source
+    source_store.units.insert(position, source_store.units.pop())
+
+
+@pytest.mark.django_db
+def test_store_diff_insert_unit_in_gap(diffable_stores):
+    # the store updated from a file has gapped indexes
+    complex_po_, target_store = diffable_stores
+    source_store = target_store.deserialize(target_store.serialize())
+    target_units = list(target_store.units)
+    # the first unit in the file is the header
+    _insert_source_unit(source_store, 3, "Inserted unit")
+
+    differ = StoreDiff(
+        target_store,
+        source_store,
+        target_store.get_max_unit_revision())
+    result = differ.diff()
+    assert result["index"] == []
+    assert len(result["add"]) == 1
+    new_unit_index = result["add"][0][1]
+    assert target_units[1].index < new_unit_index < target_units[2].index
+
+    target_store.update(source_store)
+    assert (
+        [unit.unitid for unit in target_store.units]
+        == [unit.getid() for unit in source_store.units[1:]])
+
+
+@pytest.mark.django_db
+def test_store_diff_insert_unit_gap_exhausted(diffable_stores):
+    # the store updated from a file has gapped indexes
+    complex_po_, target_store = diffable_stores
+    target_units = list(target_store.units)
+    # leave no room between the second and third units
+    target_store.unit_set.filter(pk=target_units[2].pk).update(
+        index=target_units[1].index + 1,
+    )
+    source_store = target_store.deserialize(target_store.serialize())
+    _insert_source_unit(source_store, 3, "Inserted unit")
+
+    differ = StoreDiff(
+        target_store,
+        source_store,
+        target_store.get_max_unit_revision())
+    result = differ.diff()
+    assert result["index"] == [
+        (target_units[1].index + 1, 2 * UNIT_INDEX_GAP - 1),
+    ]
+
+    target_store.update(source_store)
+    assert (
+        [unit.unitid for unit in target_store.units]
+        == [unit.getid() for unit in source_store.units[1:]])
+
+
 @pytest.mark.django_db
 def test_store_diff_obsoleted_target_unit(diffable_stores):
     target_store, source_store = diffable_stores
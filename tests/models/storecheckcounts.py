@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from translate.filters.decorators import Category
+
+from pootle.core.checks.checker import QualityCheckUpdater
+from pootle_store.constants import TRANSLATED
+from pootle_store.models import QualityCheck, StoreCheckCounts
+
+
+def _get_counts(store):
+    return {
+        name: (active, false_positive)
+        for name, active, false_positive in store.check_counts.values_list(
+            'name', 'active', 'false_positive')
+        if active or false_positive
+    }
+
+
+def _translate(unit, target):
+    unit.target = target
+    unit.save()
+
+
+@pytest.mark.django_db
+def test_storecheckcounts_initial():
+    assert StoreCheckCounts.objects.count()
+    assert StoreCheckCounts.objects.get_drift() == []
+
+
+@pytest.mark.django_db
+def test_storecheckcounts_update_qualitychecks(store0):
+    unit = store0.units.filter(source_f__contains='%s').first()
+
+    _translate(unit, 'Target without placeholder')
+    assert unit.qualitycheck_set.filter(name='c_format').exists()
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+    _translate(unit, unit.source)
+    assert not unit.qualitycheck_set.filter(name='c_format').exists()
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+    # Removing the translation drops all checks
+    _translate(unit, '')
+    assert not unit.qualitycheck_set.exists()
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+
+@pytest.mark.django_db
+def test_storecheckcounts_toggle_qualitycheck(store0, member):
+    check = QualityCheck.objects.filter(
+        unit__store=store0, unit__state=TRANSLATED, false_positive=False,
+    ).first()
+    unit = check.unit
+    active, false_positive = _get_counts(store0)[check.name]
+
+    unit.toggle_qualitycheck(check.id, True, member)
+    assert _get_counts(store0)[check.name] == (active - 1,
+                                               false_positive + 1)
+
+    unit.toggle_qualitycheck(check.id, False, member)
+    assert _get_counts(store0)[check.name] == (active, false_positive)
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+
+@pytest.mark.django_db
+def test_storecheckcounts_unit_state(store0):
+    unit = QualityCheck.objects.filter(
+        unit__store=store0, unit__state=TRANSLATED,
+    ).first().unit
+    counts = _get_counts(store0)
+
+    unit.makeobsolete()
+    unit.save()
+    assert _get_counts(store0) != counts
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+    unit.resurrect()
+    unit.save()
+    assert _get_counts(store0) == counts
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+    unit.delete()
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+
+@pytest.mark.django_db
+def test_storecheckcounts_store_makeobsolete(store0):
+    store0.makeobsolete()
+    assert _get_counts(store0) == {}
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) == []
+
+
+@pytest.mark.django_db
+def test_storecheckcounts_quality_check_updater(tp0):
+    stores = tp0.stores.all()
+    QualityCheck.objects.filter(unit__store__in=stores).delete()
+    assert StoreCheckCounts.objects.get_drift(stores=stores) != []
+
+    QualityCheckUpdater(translation_project=tp0).update()
+    assert StoreCheckCounts.objects.get_drift(stores=stores) == []
+
+
+@pytest.mark.django_db
+def test_storecheckcounts_rebuild(store0):
+    counts = _get_counts(store0)
+    store0.check_counts.update(active=0)
+    assert StoreCheckCounts.objects.get_drift(stores=[store0.pk]) != []
+
+    StoreCheckCounts.objects.rebuild(stores=[store0.pk])
+    assert _get_counts(store0) == counts
+    assert StoreCheckCounts.objects.get_drift() == []
+
+
+@pytest.mark.django_db
+def test_store_get_checks(store0):
+    """Check stats match the ones computed from quality checks."""
+    checks = QualityCheck.objects.filter(
+        unit__store=store0, unit__state__gt=0, false_positive=False,
+    )
+    expected = {}
+    for name in checks.values_list('name', flat=True):
+        expected[name] = expected.get(name, 0) + 1
+    critical_units = checks.filter(category=Category.CRITICAL) \
+                           .values('unit').distinct().count()
+
+    assert store0._get_checks() == {
+        'unit_critical_error_count': critical_units,
+        'checks': expected,
+    }
@@ -8,6 +8,9 @@
 
 import pytest
 
+from pootle_store.constants import OBSOLETE
+from pootle_store.models import Suggestion, Unit
+
 
 @pytest.mark.django_db
 def test_hash(store0):
@@ -22,3 +25,70 @@ def test_hash(store0):
 
     suggestion.target = "gras++"
     assert first_hash != second_hash != suggestion.target_hash
+
+
+@pytest.mark.django_db
+def test_suggestion_count(store0, member, system):
+    """Tests that units keep count of their pending suggestions."""
+    unit = store0.units[0]
+    tp = store0.translation_project
+    stale_unit = Unit.objects.get(pk=unit.pk)
+    initial_count = unit.suggestion_count
+
+    suggestion, created_ = unit.add_suggestion("gras", user=member)
+    unit.add_suggestion("gras", user=member)
+    other, created_ = unit.add_suggestion("gras++", user=member)
+    assert unit.suggestion_count == initial_count + 2
+
+    # Saving a unit loaded earlier must not overwrite the count
+    stale_unit.save()
+    assert (Unit.objects.get(pk=unit.pk).suggestion_count ==
+            initial_count + 2)
+
+    unit.reject_suggestion(other, tp, system)
+    unit.reject_suggestion(other, tp, system)
+    assert unit.suggestion_count == initial_count + 1
+
+    unit.accept_suggestion(suggestion, tp, system)
+    assert unit.suggestion_count == initial_count
+    assert (Unit.objects.get(pk=unit.pk).suggestion_count ==
+            unit.suggestion_count == unit.get_suggestions().count())
+    assert Unit.objects.get_suggestion_count_drift() == {}
+
+
+@pytest.mark.django_db
+def test_store_suggestion_count(store0, member):
+    """Tests that store suggestion stats only count live units."""
+    unit = store0.units[0]
+    unit.add_suggestion("gras", user=member)
+
+    expected = Suggestion.objects.pending().filter(
+        unit__store=store0, unit__state__gt=OBSOLETE,
+    ).count()
+    assert store0._get_suggestion_count() == expected
+
+    unit.makeobsolete()
+    unit.save()
+    assert (store0._get_suggestion_count() ==
+            expected - unit.suggestion_count)
+
+
+@pytest.mark.django_db
+def test_refresh_suggestion_counts(store0):
+    """Tests that drifted suggestion counts are detected and repaired."""
+    unit0, unit1 = store0.units[:2]
+    Unit.objects.filter(pk=unit0.pk).update(suggestion_count=5)
+    Unit.objects.filter(pk=unit1.pk).update(suggestion_count=0)
+
+    drift = Unit.objects.get_suggestion_count_drift()
+    assert drift == {
+        unit0.pk: (5, unit0.suggestion_count),
+        unit1.pk: (0, unit1.suggestion_count),
+    }
+    assert Unit.objects.get_suggestion_count_drift(
+        units=[unit1.pk]) == {unit1.pk: (0, unit1.suggestion_count)}
+
+    assert Unit.objects.refresh_suggestion_counts() == 2
+    assert Unit.objects.get_suggestion_count_drift() == {}
+    assert (Unit.objects.get(pk=unit1.pk).suggestion_count ==
+            unit1.get_suggestions().count())
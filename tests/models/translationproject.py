@@ -69,3 +69,58 @@ def test_tp_checker(po_directory, tp_checker_tests, settings):
                                        checks.StandardChecker)
         ]
     assert [x.__class__ for x in tp.checker.checkers] == checkerclasses
+
+
+@pytest.mark.django_db
+def test_tp_scan_files_index(project0_disk, tp0, monkeypatch, request):
+    """Tests directories unchanged since the last scan are not listed."""
+    from django_redis import get_redis_connection
+
+    from pootle_app import project_tree
+
+    index_key = project_tree.get_scan_index_key(tp0)
+    request.addfinalizer(
+        lambda: get_redis_connection('redis').delete(index_key)
+    )
+
+    for store in tp0.stores.live():
+        store.sync()
+    tp0.scan_files(force=True)
+
+    # Make directories look old enough to be indexed
+    real_dirs = []
+    for dirpath, dirnames, filenames in os.walk(tp0.abs_real_path):
+        real_dirs.append(dirpath)
+        os.utime(dirpath, (0, 0))
+
+    listed_dirs = []
+    split_files_and_dirs = project_tree.split_files_and_dirs
+
+    def _split_files_and_dirs(real_dir):
+        listed_dirs.append(real_dir)
+        return split_files_and_dirs(real_dir)
+
+    monkeypatch.setattr(project_tree, 'split_files_and_dirs',
+                        _split_files_and_dirs)
+
+    all_files, new_files = tp0.scan_files()
+    assert len(listed_dirs) == len(real_dirs)
+    assert new_files == []
+
+    del listed_dirs[:]
+    files, new_files = tp0.scan_files()
+    assert listed_dirs == []
+    assert sorted(store.pk for store in files) == \
+        sorted(store.pk for store in all_files)
+    assert new_files == []
+
+    # Adding a file lists its directory only
+    subdir = tp0.stores.get(name='store4.po').file.path
+    subdir = os.path.dirname(subdir)
+    with open(os.path.join(subdir, 'new_store.po'), 'w') as f:
+        f.write(tp0.stores.get(name='store4.po').serialize())
+
+    files, new_files = tp0.scan_files()
+    assert listed_dirs == [subdir]
+    assert [store.name for store in new_files] == ['new_store.po']
+    assert len(files) == len(all_files) + 1
@@ -105,14 +105,13 @@ def test_update_plural_target(af_tutorial_po):
     assert db_unit.target.strings == [u'samaka', u'samak']
     assert db_unit.target.strings == store_unit.target.strings
 
-    po_file = factory.getobject(af_tutorial_po.file.path)
-    assert (
-        db_unit.target.strings
-        == po_file.units[db_unit.index].target.strings)
+    po_unit = factory.getobject(af_tutorial_po.file.path).findid(
+        db_unit.getid())
+    assert db_unit.target.strings == po_unit.target.strings
 
     assert db_unit.target == u'samaka'
     assert db_unit.target == store_unit.target
-    assert db_unit.target == po_file.units[db_unit.index].target
+    assert db_unit.target == po_unit.target
 
 
 @pytest.mark.django_db
@@ -20,11 +20,13 @@ from tests.fixtures.models.store import (_create_submission_and_suggestion,
 
 import accounts
 
+from pootle.core.models import Revision
 from pootle_app.models.directory import Directory
 from pootle_app.models.permissions import PermissionSet, check_user_permission
 from pootle_language.models import Language
 from pootle_project.models import Project
 from pootle_store.constants import FUZZY, TRANSLATED
+from pootle_store.models import StoreCheckCounts, Unit
 from pootle_translationproject.models import TranslationProject
 
 
@@ -162,6 +164,10 @@ def _test_user_purging(store, member, evil_member, purge):
     # State is be back to how it was before evil user updated.
     _test_before_evil_user_updated(store, member)
 
+    # Check and suggestion counts account for the reverted units
+    assert StoreCheckCounts.objects.get_drift(stores=[store.pk]) == []
+    assert Unit.objects.get_suggestion_count_drift() == {}
+
 
 @pytest.mark.django_db
 def test_merge_user(en_tutorial_po, member, member2):
@@ -192,6 +198,38 @@ def test_purge_user(en_tutorial_po_member_updated,
                        lambda m: accounts.utils.UserPurger(m).purge())
 
 
+@pytest.mark.django_db
+def test_purge_user_revision_reservation(monkeypatch,
+                                         en_tutorial_po_member_updated,
+                                         member, evil_member):
+    """Test purging a user reserves revisions for each chunk of reverted
+    units right before saving them.
+    """
+    _make_evil_member_updates(en_tutorial_po_member_updated, evil_member)
+
+    reservations = []
+    reserve = Revision.reserve
+
+    def _reserve(count):
+        reservations.append(count)
+        return reserve(count)
+
+    saved_chunks = []
+    save_units = accounts.utils.UserPurger.save_units
+
+    def _save_units(self, units):
+        if units:
+            saved_chunks.append(len(units))
+        return save_units(self, units)
+
+    monkeypatch.setattr(Revision, 'reserve', staticmethod(_reserve))
+    monkeypatch.setattr(accounts.utils.UserPurger, 'save_units', _save_units)
+    accounts.utils.UserPurger(evil_member).purge()
+
+    assert saved_chunks
+    assert reservations == saved_chunks
+
+
 @pytest.mark.django_db
 def test_delete_purge_user(en_tutorial_po_member_updated,
                            member, evil_member):
@@ -30,6 +30,9 @@ ZING_MT_BACKENDS = [
 
 
 MIDDLEWARE = [
+    #: Records request metrics, including those of any other middleware
+    #: (only enabled if `ZING_METRICS` is set)
+    'pootle.middleware.metrics.MetricsMiddleware',
     #: Must be as high as possible (see above)
     'django.middleware.cache.UpdateCacheMiddleware',
     #: Avoids caching for authenticated users
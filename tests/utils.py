@@ -116,3 +116,55 @@ def as_dir(name):
 def url_name(url):
     """Returns `url` as a string usable for snapshot stacks."""
     return url.replace('/', '_')
+
+
+def create_scorelogs(user, store, count, creation_time):
+    """Creates `count` score logs for `user` in bulk, cycling through all
+    action codes and the units and suggestions of `store`.
+    """
+    from pootle_statistics.models import (ScoreLog, Submission,
+                                          SubmissionFields, SubmissionTypes,
+                                          TranslationActionCodes)
+    from pootle_store.models import Suggestion
+
+    action_codes = sorted(TranslationActionCodes.NAMES_MAP.keys())
+    units = list(store.units)
+    suggestions = list(Suggestion.objects.filter(unit__store=store)) or [None]
+
+    submissions = Submission.objects.bulk_create([
+        Submission(
+            creation_time=creation_time,
+            translation_project=store.translation_project,
+            submitter=user,
+            suggestion=suggestions[i % len(suggestions)],
+            unit=units[i % len(units)],
+            store=store,
+            field=SubmissionFields.TARGET,
+            type=SubmissionTypes.NORMAL,
+            old_value='' if i % 2 else 'Old target',
+            new_value='New target',
+            similarity=(i % 10) / 10.0,
+            mt_similarity=0,
+        )
+        for i in xrange(count)
+    ], batch_size=500)
+    if submissions[0].pk is None:
+        # Backends not returning primary keys from bulk inserts
+        submissions = Submission.objects.filter(
+            submitter=user, creation_time=creation_time,
+        ).select_related('unit').order_by('-pk')[:count]
+
+    ScoreLog.objects.bulk_create([
+        ScoreLog(
+            creation_time=creation_time,
+            user=user,
+            rate=user.rate,
+            review_rate=user.review_rate,
+            wordcount=submission.unit.source_wordcount,
+            similarity=submission.similarity,
+            score_delta=0,
+            action_code=action_codes[i % len(action_codes)],
+            submission=submission,
+        )
+        for i, submission in enumerate(submissions)
+    ], batch_size=500)
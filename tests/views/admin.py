@@ -7,6 +7,8 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+import json
+
 import pytest
 
 from django.urls import reverse_lazy, reverse
@@ -65,3 +67,19 @@ def test_admin_view_projects(client, request_users, english):
                 'source_language': english.id}}}
     for k, v in expected.items():
         assert response.context_data[k] == v
+
+
+@pytest.mark.django_db
+def test_admin_stats_queue_status(client, default, revision):
+    url = reverse('pootle-xhr-admin-stats-queue')
+
+    client.login(username=default.username, password='')
+    response = client.get(url)
+    assert response.status_code == 403
+
+    client.login(username='admin', password='admin')
+    response = client.get(url, {'minutes': 10})
+    assert response.status_code == 200
+    status = json.loads(response.content)
+    assert status['queues'][0]['count'] == 0
+    assert status['processed_jobs']['minutes'] == 10
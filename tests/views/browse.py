@@ -54,3 +54,71 @@ def test_browse(client, request_users, test_name, request,
 
         with snapshot_stack.push('context') as snapshot:
             snapshot.assert_matches(response.context)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url, kwargs', [
+    ('/language0/project0/', {}),
+    ('/xhr/stats/?path=/language0/project0/',
+     {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}),
+])
+def test_browse_not_modified(client, member, refresh_stats, store0,
+                             url, kwargs):
+    """Tests browsing responses are revalidated by means of ETags."""
+    client.force_login(member)
+    response = client.get(url, **kwargs)
+    assert response.status_code == 200
+    etag = response['ETag']
+    assert 'private' in response['Cache-Control']
+    assert 'no-store' not in response['Cache-Control']
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag, **kwargs)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+
+    # Updating stats changes the ETag
+    unit = store0.units.filter(target_f='').first()
+    unit.target = 'Translation'
+    unit.save()
+    store0.update_all_cache()
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag, **kwargs)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_browse_data_cache(client, settings, monkeypatch, member, member2,
+                           refresh_stats, store0):
+    """Tests browsing data is shared by users with the same permissions
+    until stats are refreshed.
+    """
+    from pootle.core.views.browse import BrowseDataViewMixin
+
+    settings.CACHES = dict(settings.CACHES, default={
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    })
+    builds = []
+    build_browsing_data = BrowseDataViewMixin.build_browsing_data
+
+    def _build_browsing_data(self):
+        builds.append(self.request.user.username)
+        return build_browsing_data(self)
+
+    monkeypatch.setattr(BrowseDataViewMixin, 'build_browsing_data',
+                        _build_browsing_data)
+
+    url = '/xhr/stats/?path=/language0/project0/'
+    responses = []
+    for user in [member, member2, member]:
+        client.force_login(user)
+        responses.append(
+            client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        )
+
+    assert builds == ['member']
+    assert len(set(response.content for response in responses)) == 1
+
+    store0.update_all_cache()
+    client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+    assert builds == ['member', 'member']
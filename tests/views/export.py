@@ -6,10 +6,20 @@
 # or later license. See the LICENSE file for a copy of the license and the
 # AUTHORS file for copyright and authorship information.
 
+from __future__ import absolute_import
+
+import csv
+import io
+from functools import partial
+
 import pytest
 
+from translate.storage import po, xliff
+
 from tests.utils import as_dir, url_name
 
+from pootle_store.unit.search import DBSearchBackend
+
 
 @pytest.mark.django_db
 @pytest.mark.parametrize('url', [
@@ -49,3 +59,106 @@ def test_export(client, request_users, test_name, monkeypatch, snapshot_stack,
 
         with snapshot_stack.push('context') as snapshot:
             snapshot.assert_matches(response.context)
+
+
+def _parse_sources(store_class, content):
+    output = store_class.parsestring(content)
+    return [unicode(unit.source) for unit in output.units
+            if not unit.isheader()]
+
+
+def _parse_csv_sources(content):
+    return [row['source'].decode('utf-8')
+            for row in csv.DictReader(io.BytesIO(content))]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('export_format, parse_sources', [
+    ('po', partial(_parse_sources, po.pofile)),
+    ('csv', _parse_csv_sources),
+    ('xliff', partial(_parse_sources, xliff.xlifffile)),
+])
+def test_export_stream(client, admin, monkeypatch, export_format,
+                       parse_sources):
+    """Tests all units matching the export are streamed as a file."""
+    monkeypatch.setattr('pootle_store.exporters.CHUNK_SIZE', 2)
+    monkeypatch.setattr('pootle.core.views.export.EXPORT_BATCH_SIZE', 3)
+    client.force_login(admin)
+
+    url = '/language0/project0/export-view/'
+    response = client.get(url, {'format': export_format})
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response['Content-Disposition'].startswith(
+        'attachment; filename="language0-project0.'
+    )
+
+    expected = DBSearchBackend(
+        admin, language_code='language0', project_code='project0',
+        dir_path='', filename='',
+    ).units_qs
+    sources = parse_sources(b''.join(response.streaming_content))
+    assert len(sources) == expected.count() > 2
+    assert sources == [unicode(unit.source) for unit in expected]
+
+
+@pytest.mark.django_db
+def test_export_stream_filters(client, admin):
+    """Tests streamed exports honour the search filters."""
+    client.force_login(admin)
+    response = client.get('/language0/project0/export-view/', {
+        'format': 'po',
+        'filter': 'untranslated',
+    })
+
+    output = po.pofile.parsestring(b''.join(response.streaming_content))
+    units = [unit for unit in output.units if not unit.isheader()]
+    assert units
+    assert all(not unit.istranslated() for unit in units)
+
+
+@pytest.mark.django_db
+def test_export_stream_sorted(client, admin, monkeypatch):
+    """Tests streamed exports keep units grouped by store regardless of the
+    requested sorting.
+    """
+    monkeypatch.setattr('pootle.core.views.export.EXPORT_BATCH_SIZE', 3)
+    client.force_login(admin)
+    response = client.get('/language0/project0/export-view/', {
+        'format': 'xliff',
+        'filter': 'all',
+        'sort': 'newest',
+    })
+
+    output = xliff.xlifffile.parsestring(
+        b''.join(response.streaming_content)
+    )
+    filenames = output.getfilenames()
+    assert len(filenames) > 1
+    assert filenames == sorted(set(filenames))
+
+    expected = DBSearchBackend(
+        admin, language_code='language0', project_code='project0',
+        dir_path='', filename='',
+    ).units_qs.order_by('store__pootle_path', 'index')
+    assert ([unicode(unit.source) for unit in output.units] ==
+            [unicode(unit.source) for unit in expected])
+
+
+@pytest.mark.django_db
+def test_export_stream_permissions(client, member):
+    """Tests streamed exports require the same permissions as the export
+    view.
+    """
+    client.force_login(member)
+    response = client.get('/projects/export-view/', {'format': 'po'})
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_export_stream_bad_format(client, admin):
+    client.force_login(admin)
+    response = client.get('/language0/project0/export-view/',
+                          {'format': 'foo'})
+    assert response.status_code == 404
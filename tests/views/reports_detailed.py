@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) Zing contributors.
+#
+# This file is a part of the Zing project. It is distributed under the GPL3
+# or later license. See the LICENSE file for a copy of the license and the
+# AUTHORS file for copyright and authorship information.
+
+import pytest
+
+from django.utils import timezone
+
+from tests.utils import create_scorelogs
+
+from pootle_misc.util import get_date_interval
+from pootle_statistics.models import ScoreLog
+from reports.views import get_detailed_report_context
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('count', [100, 10000])
+def test_detailed_report_context_queries(django_assert_num_queries, member,
+                                         store0, count):
+    now = timezone.now()
+    create_scorelogs(member, store0, count, now)
+    month = now.strftime('%Y-%m')
+
+    with django_assert_num_queries(3):
+        ctx = get_detailed_report_context(user=member, month=month)
+
+    start, end = get_date_interval(month)
+    expected = [
+        scorelog.pk
+        for scorelog in ScoreLog.objects.filter(user=member,
+                                                creation_time__gte=start,
+                                                creation_time__lte=end)
+        if (scorelog.get_paid_wordcounts() != (None, None) or
+            scorelog.get_suggested_wordcount() is not None)
+    ]
+    scores = [item['score'].pk for item in ctx['items'] if 'score' in item]
+    assert expected
+    assert sorted(scores) == sorted(expected)
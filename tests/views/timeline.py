@@ -349,3 +349,23 @@ def test_timeline_view_unit_with_creation(client, request_users,
         client,
         request_users,
         unit)
+
+
+@pytest.mark.django_db
+def test_timeline_view_not_modified(client, admin, refresh_stats, store0):
+    unit = store0.units.first()
+    url = reverse("pootle-xhr-units-timeline", kwargs=dict(uid=unit.id))
+    client.force_login(admin)
+
+    response = client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+    etag = response['ETag']
+    response = client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+                          HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    unit.target = 'Changed'
+    unit.save()
+    response = client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+                          HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
@@ -9,6 +9,8 @@
 
 from __future__ import absolute_import
 
+import json
+
 import pytest
 
 from django.http import Http404
@@ -263,3 +265,26 @@ def test_submit_unit_plural(client, unit_plural, request_users):
 
     else:
         assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_get_context_units(client, admin, complex_po):
+    """Tests context units are found regardless of gaps between indexes."""
+    client.force_login(admin)
+    units = list(complex_po.units)
+    # Make the gaps between indexes uneven
+    for i, unit in enumerate(units):
+        Unit.objects.filter(pk=unit.pk).update(index=unit.index + i * i)
+
+    unit = units[len(units) // 2]
+    response = client.get(
+        '/xhr/units/%d/context/' % unit.id,
+        HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+    assert response.status_code == 200
+
+    result = json.loads(response.content)
+    position = units.index(unit)
+    assert ([ctx_unit['id'] for ctx_unit in result['before']] ==
+            [ctx_unit.id for ctx_unit in units[max(position - 5, 0):position]])
+    assert ([ctx_unit['id'] for ctx_unit in result['after']] ==
+            [ctx_unit.id for ctx_unit in units[position + 1:position + 6]])